@@ -0,0 +1,105 @@
+"""
+Benchmark del parseo de anthropic.com/research: ruta antigua vs. ruta rápida.
+
+Uso:
+    python bench/bench_research_parse.py [snapshot.html ...] [--repeat N]
+
+Sin argumentos usa los snapshots de bench/snapshots/. Imprime JSON con tiempo
+(mediana) y pico de memoria de cada ruta, y comprueba que ambas extraen
+exactamente los mismos dicts.
+"""
+import os
+import re
+import sys
+import glob
+import json
+import time
+import argparse
+import statistics
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from bs4 import BeautifulSoup  # noqa: E402
+from research import parse_research_html  # noqa: E402
+
+
+def legacy_parse(content, limit: int = 5):
+    """Copia de la extracción original (html.parser + find_all_next sobre todo el documento)."""
+    soup = BeautifulSoup(content, 'html.parser')
+    h2_publications = soup.find('h2', string=lambda x: x and 'Publications' in x)
+    if not h2_publications:
+        return None
+    papers = []
+    all_links_after = h2_publications.find_all_next('a', href=lambda x: x and x.startswith('/research/'))
+    for item in all_links_after[:limit]:
+        href = item.get('href', '')
+        if not href or href == '/research/':
+            continue
+        link = f"https://www.anthropic.com{href}"
+        full_text = item.get_text(strip=True)
+        date_match = re.search(r'^(\w{3,}\s+\d{1,2},?\s+\d{4})', full_text)
+        date_str = date_match.group(1) if date_match else ""
+        spans = item.find_all('span')
+        if len(spans) >= 2:
+            category = spans[0].get_text(strip=True)
+            title = spans[1].get_text(strip=True)
+        else:
+            continue
+        if not title or len(title) < 5:
+            continue
+        papers.append({
+            'title': title,
+            'description': f"Category: {category}" if category else "",
+            'url': link,
+            'date': date_str,
+            'category': category,
+            'source': 'anthropic.com/research'
+        })
+    return papers
+
+
+def measure(fn, content, repeat: int) -> dict:
+    """Mediana de tiempo y pico de memoria (tracemalloc) de `fn(content)`."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(content)
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'median_ms': round(statistics.median(timings) * 1000, 3), 'peak_kib': round(peak / 1024, 1)}
+
+
+def main():
+    here = os.path.dirname(os.path.abspath(__file__))
+    arg_parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    arg_parser.add_argument('snapshots', nargs='*')
+    arg_parser.add_argument('--repeat', type=int, default=20)
+    args = arg_parser.parse_args()
+
+    paths = args.snapshots or sorted(glob.glob(os.path.join(here, 'snapshots', '*.html')))
+    results = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            content = f.read()
+        old, new = legacy_parse(content), parse_research_html(content)
+        if old != new:
+            raise SystemExit(f"❌ Las rutas extraen resultados distintos en {path}")
+        legacy = measure(legacy_parse, content, args.repeat)
+        fast = measure(parse_research_html, content, args.repeat)
+        results.append({
+            'snapshot': os.path.basename(path),
+            'bytes': len(content),
+            'papers': len(new or []),
+            'legacy': legacy,
+            'fast': fast,
+            'speedup': round(legacy['median_ms'] / fast['median_ms'], 2) if fast['median_ms'] else None,
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark de arranque del CLI: coste de imports y tiempo de proceso por subcomando.
+
+Uso:
+    python bench/bench_startup.py [--ref REV] [--repeat N]
+
+Para cada subcomando lanza `python -X importtime src/scraper.py <cmd> --help`
+(se importa todo lo que importa el módulo, sin ejecutar el comando) e imprime
+JSON con el tiempo de imports (descontado el arranque del intérprete), el
+wall-clock mediano y qué dependencias pesadas se cargaron. Con `--ref` mide
+también otra revisión (extraída con `git archive`) para comparar; una
+revisión sin subcomandos se omite y un subcomando que falla (p. ej. porque
+aún no existía) se reporta como error en lugar de medirse.
+"""
+import os
+import sys
+import json
+import time
+import tarfile
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COMMANDS = ('run', 'render', 'index', 'search', 'rollup', 'backfill', 'watch')
+HEAVY = ('requests', 'github', 'bs4', 'dateutil', 'lxml')
+
+
+def import_times(stderr: str) -> dict:
+    """Tiempo acumulado (µs) de cada módulo en la salida de -X importtime.
+
+    Los de primer nivel van con la clave sin sangría; los anidados, con un
+    espacio delante (solo se usan para saber qué se cargó).
+    """
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        nested = name.startswith('  ')
+        times[(' ' if nested else '') + name.strip()] = int(cumulative)
+    return times
+
+
+def measure(argv, cwd: str, repeat: int) -> dict:
+    walls, imports, loaded = [], [], set()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, '-X', 'importtime'] + argv, cwd=cwd,
+                              capture_output=True, text=True)
+        walls.append(time.perf_counter() - start)
+        if proc.returncode != 0:
+            errors = [line for line in proc.stderr.splitlines() if not line.startswith('import time:')]
+            raise RuntimeError(f"{' '.join(argv)} terminó con código {proc.returncode}: " + '\n'.join(errors[-5:]))
+        times = import_times(proc.stderr)
+        imports.append(sum(t for name, t in times.items() if not name.startswith(' ')))
+        loaded = {name.strip().split('.')[0] for name in times} & set(HEAVY)
+    return {'wall_ms': round(statistics.median(walls) * 1000, 1),
+            'imports_us': int(statistics.median(imports)), 'heavy': sorted(loaded)}
+
+
+def has_cli(tree: str) -> bool:
+    """True si scraper.py tiene subcomandos.
+
+    Las revisiones anteriores ignoran argv: `--help` lanzaría el scrape completo.
+    """
+    with open(os.path.join(tree, 'src', 'scraper.py'), 'r', encoding='utf-8') as f:
+        return 'add_subparsers' in f.read()
+
+
+def bench_tree(tree: str, repeat: int) -> dict:
+    baseline = measure(['-c', 'pass'], tree, repeat)
+    results = {}
+    for command in COMMANDS:
+        try:
+            stats = measure(['src/scraper.py', command, '--help'], tree, repeat)
+        except RuntimeError as e:
+            # Subcomando que no existe en esa revisión (o que falla al importar)
+            print(f"⚠️ {e}", file=sys.stderr)
+            results[command] = {'error': str(e).splitlines()[-1]}
+            continue
+        stats['imports_ms'] = round((stats.pop('imports_us') - baseline['imports_us']) / 1000, 1)
+        results[command] = stats
+    return results
+
+
+def export_revision(rev: str, directory: str) -> str:
+    """Extrae `src/` de una revisión de git en `directory`."""
+    archive = subprocess.run(['git', 'archive', '--format=tar', rev, 'src'], cwd=ROOT,
+                             capture_output=True, check=True).stdout
+    path = os.path.join(directory, 'archive.tar')
+    with open(path, 'wb') as f:
+        f.write(archive)
+    with tarfile.open(path) as tar:
+        tar.extractall(directory)
+    return directory
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark de arranque del CLI')
+    arg_parser.add_argument('--ref', help='Revisión de git con la que comparar (p. ej. HEAD~1)')
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    report = {'current': bench_tree(ROOT, args.repeat)}
+    if args.ref:
+        with tempfile.TemporaryDirectory() as directory:
+            tree = export_revision(args.ref, directory)
+            if has_cli(tree):
+                report[args.ref] = bench_tree(tree, args.repeat)
+            else:
+                print(f"⚠️ {args.ref} no tiene subcomandos de CLI: no se mide", file=sys.stderr)
+                report[args.ref] = {'skipped': 'sin subcomandos de CLI'}
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+"""
+Generadores de fixtures deterministas para los benchmarks.
+Reproducen la estructura de las respuestas reales (HTML de /research, datos de
+una organización de GitHub) y del histórico de daily/.
+"""
+import os
+import json
+import random
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Optional
+
+CATEGORIES = ['Interpretability', 'Alignment', 'Societal Impacts', 'Policy', 'Economic Research']
+WORDS = ('model language safety scaling agents reasoning circuits features evaluation '
+         'constitutional training interpretability welfare economic index honesty').split()
+
+
+def _title(rng: random.Random) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(3, 8))).capitalize()
+
+
+def _noise(rng: random.Random, blocks: int) -> str:
+    """Marcado de relleno (nav, tarjetas destacadas, svg, scripts) como en la web real."""
+    parts = []
+    for i in range(blocks):
+        parts.append(
+            f'<div class="card_{i % 7}"><svg viewBox="0 0 24 24"><path d="M{i} 0L{i + 3} 12Z"/></svg>'
+            f'<p class="body-3">{_title(rng)} {_title(rng)}</p>'
+            f'<a href="/news/{i}">{_title(rng)}</a></div>'
+        )
+    return '\n'.join(parts)
+
+
+def research_page(papers: int = 60, seed: int = 0, noise_blocks: int = 400) -> str:
+    """HTML de anthropic.com/research con `papers` publicaciones (más recientes primero)."""
+    rng = random.Random(seed)
+    day = date(2026, 3, 1)
+    featured = ''.join(
+        f'<a href="/research/featured-{i}"><h3>{_title(rng)}</h3></a>' for i in range(6)
+    )
+    items = []
+    for i in range(papers):
+        day -= timedelta(days=rng.randint(1, 9))
+        slug = f"paper-{seed}-{i}"
+        items.append(
+            f'<li><a href="/research/{slug}" class="PublicationList_listItem">'
+            f'<div class="PublicationList_meta"><time>{day.strftime("%b %d, %Y").replace(" 0", " ")}</time>'
+            f'<span class="caption">{rng.choice(CATEGORIES)}</span></div>'
+            f'<span class="title">{_title(rng)}</span></a></li>'
+        )
+    script = '<script>self.__next_f.push([1,"' + ('x' * 20000) + '"])</script>'
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Research</title>'
+        f'{script}</head><body><nav>{_noise(rng, 40)}</nav><main>'
+        f'<section class="featured"><h2>Featured</h2>{featured}</section>'
+        f'<section>{_noise(rng, noise_blocks // 2)}</section>'
+        f'<section class="publications"><h2>Publications</h2><ul>{"".join(items)}</ul></section>'
+        f'</main><footer>{_noise(rng, noise_blocks // 2)}</footer>{script}</body></html>'
+    )
+
+
+def paper_page(slug: str, seed: int = 0) -> str:
+    """HTML de la página de un paper con los metadatos que lee `parse_paper_details`."""
+    rng = random.Random(f"{seed}-{slug}")
+    authors = ', '.join(f"{rng.choice(['Ada', 'Alan', 'Grace', 'Claude'])} {rng.choice(['Smith', 'Lee', 'Garcia'])}"
+                        for _ in range(rng.randint(1, 4)))
+    published = date(2026, 3, 1) - timedelta(days=rng.randint(0, 300))
+    abstract = ' '.join(_title(rng) for _ in range(6)) + '.'
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+        f'<title>{slug}</title><meta name="description" content="{abstract}">'
+        f'<meta name="author" content="{authors}">'
+        f'<meta property="article:published_time" content="{published.isoformat()}T00:00:00Z">'
+        f'</head><body><nav>{_noise(rng, 20)}</nav><main><article>'
+        f'<time datetime="{published.isoformat()}">{published:%b %d, %Y}</time>'
+        f'<p>{abstract}</p><p>{_title(rng) * 10}</p></article></main></body></html>'
+    )
+
+
+def _iso(value: datetime) -> str:
+    return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def github_org(repos: int = 30, active_ratio: float = 0.3, seed: int = 0,
+               now: Optional[datetime] = None, org: str = 'anthropics') -> Dict:
+    """Organización sintética: repos ordenados por `updated_at` con commits y releases.
+
+    El resultado es JSON serializable (``save_dataset``/``load_dataset``), de
+    modo que también puede sustituirse por un volcado grabado de una org real.
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    active = int(repos * active_ratio)
+    items = []
+    for i in range(repos):
+        # Los activos se actualizaron en las últimas horas; el resto hace semanas
+        if i < active:
+            updated = now - timedelta(minutes=30 + i * (2000 // max(active, 1)))
+        else:
+            updated = now - timedelta(days=3 + i)
+        commits = []
+        for c in range(rng.randint(3, 12) if i < active else 2):
+            when = updated - timedelta(hours=c * 5)
+            sha = f"{seed:02x}{i:06x}{c:04x}".ljust(40, 'a')
+            commits.append({
+                'sha': sha,
+                'message': f"{rng.choice(['feat', 'fix', 'docs', 'chore'])}: {_title(rng)}\n\n{_title(rng)}",
+                'author': rng.choice(['alice', 'bob', 'carol', 'dave']),
+                'date': _iso(when),
+            })
+        releases = []
+        if i % 4 == 0:
+            for r in range(3):
+                releases.append({
+                    'id': i * 10 + r,
+                    'tag': f"v{i}.{3 - r}.0",
+                    'name': f"Release {i}.{3 - r}",
+                    'body': _title(rng) * 20,
+                    'created_at': _iso(updated - timedelta(days=r * 2)),
+                })
+        items.append({
+            'name': f"repo-{i}",
+            'description': _title(rng) if i % 5 else None,
+            'stars': rng.randint(0, 40000),
+            'language': rng.choice(['Python', 'TypeScript', 'Go', None]),
+            'updated_at': _iso(updated),
+            'pushed_at': _iso(updated),
+            'commits': commits,
+            'releases': releases,
+        })
+    return {'org': org, 'repos': items}
+
+
+def changelog(versions: int = 300, seed: int = 0, now: Optional[datetime] = None,
+              repo: str = 'claude-code') -> Dict:
+    """CHANGELOG.md sintético (versiones más nuevas arriba) y los commits que lo tocaron."""
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    sections = ["# Changelog", ""]
+    for n in range(versions, 0, -1):
+        sections.append(f"## 1.{n // 100}.{n % 100}")
+        sections.append("")
+        for _ in range(rng.randint(2, 8)):
+            sections.append(f"- {_title(rng)}")
+        sections.append("")
+    commits = [{
+        'sha': f"c{seed:02x}{k:06x}".ljust(40, 'c'),
+        'message': f"chore: Update CHANGELOG.md for 1.{(versions - k) // 100}.{(versions - k) % 100}",
+        'author': 'release-bot',
+        'date': _iso(now - timedelta(days=k)),
+    } for k in range(5)]
+    return {'repo': repo, 'text': '\n'.join(sections), 'commits': commits}
+
+
+def save_dataset(dataset: Dict, path: str) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(dataset, f)
+
+
+def load_dataset(path: str) -> Dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def history_tree(root: str, days: int, end: date = date(2026, 6, 30), research_every: int = 5) -> None:
+    """Crea un histórico de `days` días en `root` (daily/ + README con sección Histórico)."""
+    rng = random.Random(days)
+    os.makedirs(os.path.join(root, 'daily', 'research'), exist_ok=True)
+    os.makedirs(os.path.join(root, 'daily', 'github'), exist_ok=True)
+    for n in range(days):
+        day = (end - timedelta(days=n)).isoformat()
+        if n % research_every == 0:
+            with open(os.path.join(root, 'daily', 'research', f"{day}.md"), 'w', encoding='utf-8') as f:
+                f.write(f"# Research - {day}\n\n" + ''.join(
+                    f"### [{_title(rng)}](https://www.anthropic.com/research/paper-{n}-{k})\n\n"
+                    for k in range(5)))
+        with open(os.path.join(root, 'daily', 'github', f"{day}.md"), 'w', encoding='utf-8') as f:
+            f.write(f"# GitHub - {day}\n\n" + _noise(rng, 3))
+        with open(os.path.join(root, 'daily', f"{day}.md"), 'w', encoding='utf-8') as f:
+            f.write(f"# Resumen General - {day}\n")
+    with open(os.path.join(root, 'README.md'), 'w', encoding='utf-8') as f:
+        f.write("# Anthropic Daily Resume\n\n## 📅 Histórico\n\n"
+                "| Fecha | Research | GitHub | Resumen |\n|-------|----------|--------|---------|\n\n"
+                "## 🔗 Sources\n\n- x\n")
+
+
+if __name__ == '__main__':
+    out = os.path.join(os.path.dirname(__file__), 'snapshots', 'research.html')
+    with open(out, 'w', encoding='utf-8') as f:
+        f.write(research_page())
+    print(out)
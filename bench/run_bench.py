@@ -0,0 +1,194 @@
+"""
+Suite de benchmarks offline de la ejecución diaria.
+
+Reproduce research y la API de GitHub con bench/stub_server.py y mide por
+separado scrape_research, get_github_updates (REST y GraphQL), los
+generate_*_markdown, has_new_papers y update_index, además de main() de
+principio a fin, a varias escalas. El resultado es JSON para comparar commits:
+
+    python bench/run_bench.py --scales 30,300,3000 --history 10000 --output bench.json
+"""
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+import contextlib
+from datetime import datetime, timezone
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, HERE)
+
+import scraper  # noqa: E402
+from fixtures import research_page, github_org, changelog, load_dataset, history_tree  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+
+def timed(fn, repeat: int = 1) -> dict:
+    """Ejecuta `fn` silenciando su salida; devuelve mediana/mín en ms y el último resultado."""
+    timings, result = [], None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = fn()
+            timings.append(time.perf_counter() - start)
+    return {
+        'median_ms': round(statistics.median(timings) * 1000, 3),
+        'min_ms': round(min(timings) * 1000, 3),
+        'runs': repeat,
+    }, result
+
+
+@contextlib.contextmanager
+def workdir(path: str):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def bench_scale(scale: int, args) -> dict:
+    """Fuentes y renderers contra una organización de `scale` repos."""
+    dataset = load_dataset(args.dataset) if args.dataset else github_org(scale, active_ratio=args.active_ratio)
+    results = {'repos': len(dataset['repos'])}
+    with StubServer(dataset, research_page(), args.latency_ms) as stub:
+        client = scraper.AnthropicScraper(
+            'bench-token', max_workers=args.workers,
+            research_url=f"{stub.url}/research", github_api_url=stub.url,
+            github_graphql_url=f"{stub.url}/graphql",
+        )
+
+        stub.reset_counters()
+        results['scrape_research'], research = timed(client.scrape_research, args.repeat)
+
+        for backend in ('rest', 'graphql'):
+            stub.reset_counters()
+            stats, github = timed(lambda: client.get_github_updates(backend=backend), args.repeat)
+            stats['api_calls_per_run'] = sum(stub.calls.values()) / args.repeat
+            stats['bytes_per_run'] = stub.bytes_sent // args.repeat
+            stats['active_repos'] = len(github)
+            results[f'get_github_updates_{backend}'] = stats
+
+        date_str = '2026-06-30'
+        results['generate_research_markdown'], _ = timed(
+            lambda: scraper.generate_research_markdown(date_str, research), args.repeat)
+        results['generate_github_markdown'], _ = timed(
+            lambda: scraper.generate_github_markdown(date_str, github), args.repeat)
+        results['generate_docs_markdown'], _ = timed(
+            lambda: scraper.generate_docs_markdown(date_str, []), args.repeat)
+        results['generate_summary_markdown'], _ = timed(
+            lambda: scraper.generate_summary_markdown(date_str, research, [], github), args.repeat)
+    return results
+
+
+def bench_history(days: int, args) -> dict:
+    """has_new_papers y update_index sobre un histórico de `days` días."""
+    tmp = tempfile.mkdtemp(prefix='bench-history-')
+    try:
+        history_tree(tmp, days)
+        papers = [{'url': f'https://www.anthropic.com/research/paper-0-{k}'} for k in range(5)]
+        results = {'days': days}
+        with workdir(tmp):
+            # Primera llamada: incluye la siembra del estado desde el histórico
+            results['has_new_papers_cold'], _ = timed(lambda: scraper.has_new_papers(papers, '2026-07-01'))
+            results['has_new_papers'], _ = timed(
+                lambda: scraper.has_new_papers(papers, '2026-07-01'), args.repeat)
+            results['update_index'], _ = timed(scraper.update_index, args.repeat)
+        return results
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def bench_end_to_end(scale: int, args) -> dict:
+    """main() completo contra el stub en un directorio temporal con histórico."""
+    tmp = tempfile.mkdtemp(prefix='bench-e2e-')
+    dataset = github_org(scale, active_ratio=args.active_ratio)
+    dataset['changelog'] = changelog()
+    env_keys = ('GITHUB_TOKEN', 'RESEARCH_URL', 'GITHUB_API_URL', 'GITHUB_GRAPHQL_URL', 'GITHUB_RAW_URL',
+                'HTTP_CACHE_DIR')
+    saved = {k: os.environ.get(k) for k in env_keys}
+    try:
+        history_tree(tmp, args.e2e_history)
+        with StubServer(dataset, research_page(), args.latency_ms) as stub, workdir(tmp):
+            os.environ.update({
+                'GITHUB_TOKEN': 'bench-token',
+                'RESEARCH_URL': f"{stub.url}/research",
+                'GITHUB_API_URL': stub.url,
+                'GITHUB_GRAPHQL_URL': f"{stub.url}/graphql",
+                'GITHUB_RAW_URL': f"{stub.url}/raw",
+                'HTTP_CACHE_DIR': '',
+            })
+            stats, _ = timed(scraper.main, args.repeat)
+            stats['api_calls_per_run'] = sum(stub.calls.values()) / args.repeat
+        return stats
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmarks offline de la ejecución diaria')
+    arg_parser.add_argument('--scales', default='30,300', help='Número de repos por escala (coma)')
+    arg_parser.add_argument('--history', default='100,1000', help='Días de histórico (coma)')
+    arg_parser.add_argument('--e2e-history', type=int, default=60, help='Días de histórico en end-to-end')
+    arg_parser.add_argument('--active-ratio', type=float, default=0.3)
+    arg_parser.add_argument('--latency-ms', type=float, default=20, help='Latencia simulada por petición')
+    arg_parser.add_argument('--workers', type=int, default=8)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--dataset', help='JSON grabado de una organización (sustituye al sintético)')
+    arg_parser.add_argument('--output', help='Fichero JSON de salida (por defecto stdout)')
+    args = arg_parser.parse_args()
+
+    scales = [int(s) for s in args.scales.split(',') if s]
+    histories = [int(h) for h in args.history.split(',') if h]
+
+    report = {
+        'meta': {
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'args': vars(args),
+        },
+        'scales': [],
+        'history': [],
+        'end_to_end': [],
+    }
+    for scale in scales:
+        print(f"⏱️ Escala {scale} repos...", file=sys.stderr)
+        report['scales'].append(bench_scale(scale, args))
+        report['end_to_end'].append(dict(repos=scale, **bench_end_to_end(scale, args)))
+    for days in histories:
+        print(f"⏱️ Histórico de {days} días...", file=sys.stderr)
+        report['history'].append(bench_history(days, args))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,271 @@
+"""
+Servidor HTTP local que reproduce anthropic.com/research y la API de GitHub
+(REST y GraphQL) a partir de fixtures, con latencia simulada opcional.
+
+Uso independiente:
+    python bench/stub_server.py --repos 300 --port 8765
+"""
+import re
+import sys
+import json
+import time
+import argparse
+import threading
+from collections import Counter
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs, urlencode
+
+from fixtures import research_page, paper_page, github_org, load_dataset
+
+
+def _parse_ts(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+class StubServer:
+    """Servidor stub en un hilo; usable como context manager.
+
+    ``calls`` cuenta las peticiones por ruta para medir cuántas llamadas a la
+    API hace cada backend.
+    """
+
+    def __init__(self, dataset: Dict, research_html: str, latency_ms: float = 0, port: int = 0):
+        self.dataset = dataset
+        self.research_html = research_html.encode('utf-8')
+        self.latency = latency_ms / 1000
+        self.calls: Counter = Counter()
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        # Repos ordenados como los devuelve GitHub con sort=updated
+        self.repos = sorted(dataset['repos'], key=lambda r: r['updated_at'], reverse=True)
+        self.by_pushed = sorted(dataset['repos'], key=lambda r: r['pushed_at'], reverse=True)
+        self.by_name = {r['name']: r for r in self.repos}
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self.httpd.daemon_threads = True
+        # Los clientes que leen en streaming cortan la conexión a mitad de respuesta
+        default_handle_error = self.httpd.handle_error
+        self.httpd.handle_error = lambda request, address: (
+            None if isinstance(sys.exc_info()[1], ConnectionError) else default_handle_error(request, address))
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+
+    def __enter__(self) -> 'StubServer':
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.calls.clear()
+            self.bytes_sent = 0
+
+    # -- respuestas REST -------------------------------------------------
+
+    def _repo_json(self, repo: Dict) -> Dict:
+        org = self.dataset['org']
+        full_name = f"{org}/{repo['name']}"
+        return {
+            'id': abs(hash(full_name)) % 10 ** 9,
+            'name': repo['name'],
+            'full_name': full_name,
+            'url': f"{self.url}/repos/{full_name}",
+            'html_url': f"https://github.com/{full_name}",
+            'description': repo['description'],
+            'stargazers_count': repo['stars'],
+            'language': repo['language'],
+            'updated_at': repo['updated_at'],
+            'pushed_at': repo['pushed_at'],
+            'owner': {'login': org},
+        }
+
+    def _commit_json(self, repo: Dict, commit: Dict) -> Dict:
+        full_name = f"{self.dataset['org']}/{repo['name']}"
+        return {
+            'sha': commit['sha'],
+            'url': f"{self.url}/repos/{full_name}/commits/{commit['sha']}",
+            'html_url': f"https://github.com/{full_name}/commit/{commit['sha']}",
+            'commit': {
+                'message': commit['message'],
+                'author': {'name': commit['author'], 'date': commit['date']},
+                'committer': {'name': commit['author'], 'date': commit['date']},
+            },
+        }
+
+    def _release_json(self, repo: Dict, release: Dict) -> Dict:
+        full_name = f"{self.dataset['org']}/{repo['name']}"
+        return {
+            'id': release['id'],
+            'tag_name': release['tag'],
+            'name': release['name'],
+            'body': release['body'],
+            'html_url': f"https://github.com/{full_name}/releases/tag/{release['tag']}",
+            'created_at': release['created_at'],
+            'published_at': release['created_at'],
+        }
+
+    def _paginate(self, path: str, query: Dict[str, List[str]], items: List) -> tuple:
+        """Página de una lista con la cabecera Link que espera PyGithub."""
+        per_page = int(query.get('per_page', ['30'])[0])
+        page = int(query.get('page', ['1'])[0])
+        last = max(1, -(-len(items) // per_page))
+        headers = {}
+        links = []
+        params = {k: v[0] for k, v in query.items()}
+        if page < last:
+            links.append(f'<{self.url}{path}?{urlencode(dict(params, page=page + 1))}>; rel="next"')
+            links.append(f'<{self.url}{path}?{urlencode(dict(params, page=last))}>; rel="last"')
+        if links:
+            headers['Link'] = ', '.join(links)
+        return items[(page - 1) * per_page:page * per_page], headers
+
+    def route_get(self, path: str, query: Dict[str, List[str]]) -> tuple:
+        org = self.dataset['org']
+        if path == '/research':
+            return 200, {'Content-Type': 'text/html; charset=utf-8'}, self.research_html, 'research'
+        if path.startswith('/research/'):
+            page = paper_page(path[len('/research/'):]).encode('utf-8')
+            return 200, {'Content-Type': 'text/html; charset=utf-8'}, page, 'paper'
+        if path == f'/orgs/{org}':
+            body = {'login': org, 'id': 1, 'url': f"{self.url}/orgs/{org}"}
+            return 200, {}, body, 'org'
+        if path == f'/orgs/{org}/repos':
+            repos = self.by_pushed if query.get('sort', [''])[0] == 'pushed' else self.repos
+            items, headers = self._paginate(path, query, [self._repo_json(r) for r in repos])
+            return 200, headers, items, 'repos'
+        changelog = self.dataset.get('changelog')
+        if changelog:
+            if path == f"/repos/{org}/{changelog['repo']}/commits" and 'path' in query:
+                items, headers = self._paginate(path, query, [
+                    self._commit_json({'name': changelog['repo']}, c) for c in changelog['commits']])
+                return 200, headers, items, 'changelog_commits'
+            if path.startswith(f"/raw/{org}/{changelog['repo']}/"):
+                return 200, {'Content-Type': 'text/plain; charset=utf-8'}, changelog['text'].encode('utf-8'), 'raw'
+        match = re.match(rf'^/repos/{re.escape(org)}/([^/]+)(/commits|/releases)?$', path)
+        if match and match.group(1) in self.by_name:
+            repo = self.by_name[match.group(1)]
+            if match.group(2) is None:
+                return 200, {}, self._repo_json(repo), 'repo'
+            if match.group(2) == '/commits':
+                commits = repo['commits']
+                if 'since' in query:
+                    since = _parse_ts(query['since'][0])
+                    commits = [c for c in commits if _parse_ts(c['date']) >= since]
+                if 'until' in query:
+                    until = _parse_ts(query['until'][0])
+                    commits = [c for c in commits if _parse_ts(c['date']) <= until]
+                items, headers = self._paginate(path, query, [self._commit_json(repo, c) for c in commits])
+                return 200, headers, items, 'commits'
+            items, headers = self._paginate(path, query, [self._release_json(repo, r) for r in repo['releases']])
+            return 200, headers, items, 'releases'
+        return 404, {}, {'message': 'Not Found'}, 'not_found'
+
+    # -- respuestas GraphQL ----------------------------------------------
+
+    def route_graphql(self, payload: Dict) -> tuple:
+        variables = payload.get('variables', {})
+        offset = int(variables.get('cursor') or 0)
+        page_size = variables.get('pageSize', 30)
+        since = _parse_ts(variables['since'])
+        page = self.by_pushed[offset:offset + page_size]
+        nodes = []
+        for repo in page:
+            org = self.dataset['org']
+            history = [c for c in repo['commits'] if _parse_ts(c['date']) >= since][:variables.get('commits', 5)]
+            nodes.append({
+                'name': repo['name'],
+                'url': f"https://github.com/{org}/{repo['name']}",
+                'description': repo['description'],
+                'stargazerCount': repo['stars'],
+                'updatedAt': repo['updated_at'],
+                'pushedAt': repo['pushed_at'],
+                'primaryLanguage': {'name': repo['language']} if repo['language'] else None,
+                'defaultBranchRef': {'target': {'history': {'nodes': [{
+                    'message': c['message'],
+                    'url': f"https://github.com/{org}/{repo['name']}/commit/{c['sha']}",
+                    'author': {'name': c['author'], 'date': c['date']},
+                } for c in history]}}},
+                'releases': {'nodes': [{
+                    'tagName': r['tag'],
+                    'name': r['name'],
+                    'url': f"https://github.com/{org}/{repo['name']}/releases/tag/{r['tag']}",
+                    'description': r['body'],
+                    'createdAt': r['created_at'],
+                } for r in repo['releases'][:variables.get('releases', 2)]]},
+            })
+        end = offset + len(page)
+        body = {'data': {'organization': {'repositories': {
+            'pageInfo': {'hasNextPage': end < len(self.by_pushed), 'endCursor': str(end)},
+            'nodes': nodes,
+        }}}}
+        return 200, {}, body, 'graphql'
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # TCP_NODELAY: cabeceras y cuerpo van en dos escrituras y, sin él,
+            # cada respuesta paga la espera de Nagle/ACK retardado (~40 ms)
+            disable_nagle_algorithm = True
+
+            def _send(self, status: int, headers: Dict, body, route: str) -> None:
+                if server.latency:
+                    time.sleep(server.latency)
+                if not isinstance(body, bytes):
+                    body = json.dumps(body).encode('utf-8')
+                    headers.setdefault('Content-Type', 'application/json; charset=utf-8')
+                with server._lock:
+                    server.calls[route] += 1
+                    server.bytes_sent += len(body)
+                self.send_response(status)
+                headers.setdefault('X-RateLimit-Limit', '5000')
+                headers.setdefault('X-RateLimit-Remaining', '4999')
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                self._send(*server.route_get(parsed.path, parse_qs(parsed.query)))
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length) or b'{}')
+                if urlparse(self.path).path == '/graphql':
+                    self._send(*server.route_graphql(payload))
+                else:
+                    self._send(404, {}, {'message': 'Not Found'}, 'not_found')
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main(argv: Optional[List[str]] = None):
+    arg_parser = argparse.ArgumentParser(description='Servidor stub de research + API de GitHub')
+    arg_parser.add_argument('--repos', type=int, default=30)
+    arg_parser.add_argument('--dataset', help='JSON grabado de la organización (en vez del sintético)')
+    arg_parser.add_argument('--latency-ms', type=float, default=0)
+    arg_parser.add_argument('--port', type=int, default=8765)
+    args = arg_parser.parse_args(argv)
+
+    dataset = load_dataset(args.dataset) if args.dataset else github_org(args.repos)
+    with StubServer(dataset, research_page(), args.latency_ms, args.port) as stub:
+        print(f"Stub escuchando en {stub.url}")
+        print(f"  RESEARCH_URL={stub.url}/research GITHUB_API_URL={stub.url} "
+              f"GITHUB_GRAPHQL_URL={stub.url}/graphql")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,311 @@
+"""
+Artefactos estructurados de cada ejecución (NDJSON, opcionalmente gzip).
+Un fichero por tipo de salida y día en `daily/data/<tipo>/<fecha>.ndjson`
+más un fichero combinado con los últimos días que se puede leer en streaming.
+Las consultas internas (items vistos, recuentos) leen de aquí en lugar de
+volver a parsear el markdown.
+
+Los meses completos se pueden compactar en un zip por mes
+(`daily/data/packs/YYYY-MM.zip`, un miembro `<tipo>/<fecha>.ndjson` por día)
+que se lee con mmap y acceso directo por su directorio central; los lectores
+buscan primero el fichero suelto y después el pack del mes.
+"""
+import os
+import gzip
+import json
+import glob
+import mmap
+import zlib
+import struct
+import zipfile
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import outputs
+from records import Record
+
+DATA_DIR = 'daily/data'
+ROLLING_NAME = 'recent.ndjson'
+ROLLING_DAYS = 90
+PACKS_NAME = 'packs'
+
+
+def _open(path: str, mode: str):
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def _plain(item) -> Dict:
+    return item.to_dict() if isinstance(item, Record) else dict(item)
+
+
+def day_path(kind: str, date: str, data_dir: str = DATA_DIR, compress: bool = False) -> str:
+    return os.path.join(data_dir, kind, f"{date}.ndjson" + ('.gz' if compress else ''))
+
+
+def find_day(kind: str, date: str, data_dir: str = DATA_DIR) -> Optional[str]:
+    """Ruta del fichero de un día (comprimido o no), o None si no existe."""
+    for compress in (False, True):
+        path = day_path(kind, date, data_dir, compress)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _record_line(kind: str, date: str, item) -> str:
+    record = _plain(item)
+    record['kind'] = kind
+    record['day'] = date
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=str) + '\n'
+
+
+def write_day(date: str, sections: Dict[str, List], data_dir: str = DATA_DIR,
+              compress: Optional[bool] = None, rolling: bool = True) -> List[str]:
+    """Escribe el NDJSON de cada sección del día y actualiza el fichero combinado.
+
+    Las secciones sin datos (placeholder de error o de aviso) no se escriben,
+    de modo que "no hay fichero" significa "no hay datos", no "cero items".
+    Las escrituras pasan por `outputs`: un fichero con los mismos datos no se toca.
+    """
+    if compress is None:
+        compress = os.environ.get('DATA_COMPRESS', '') not in ('', '0', 'false')
+    sections = {k: v for k, v in sections.items() if not (v and (v[0].get('error') or v[0].get('info')))}
+    written = []
+    for kind, items in sections.items():
+        path = day_path(kind, date, data_dir, compress)
+        stale = day_path(kind, date, data_dir, not compress)
+        outputs.write_stream(path, (_record_line(kind, date, item) for item in items))
+        if os.path.exists(stale):
+            os.unlink(stale)
+        written.append(path)
+    if rolling:
+        update_rolling(date, sections, data_dir)
+    return written
+
+
+def update_rolling(date: str, sections: Dict[str, List], data_dir: str = DATA_DIR,
+                   days: int = ROLLING_DAYS) -> None:
+    """Sustituye lo de `date` en el fichero combinado y quita lo anterior a la ventana."""
+    update_rolling_days({date: sections}, data_dir, days)
+
+
+def update_rolling_days(updates: Dict[str, Dict[str, List]], data_dir: str = DATA_DIR,
+                        days: int = ROLLING_DAYS, today: Optional[str] = None) -> None:
+    """Reescribe el fichero combinado en streaming con las secciones de varios días.
+
+    La ventana se cuenta desde `today` (por defecto, el día más reciente de
+    `updates`); los días fuera de ella se ignoran. El orden es estable (días
+    ascendentes y, dentro de un día, tipos por nombre), así que volver a
+    escribir un día con los mismos datos deja el fichero idéntico y `outputs`
+    no lo reescribe.
+    """
+    path = os.path.join(data_dir, ROLLING_NAME)
+    reference = datetime.strptime(today or max(updates), '%Y-%m-%d')
+    cutoff = (reference - timedelta(days=days)).strftime('%Y-%m-%d')
+    updates = {day: sections for day, sections in updates.items() if day > cutoff}
+    day_lines: Dict[str, Dict[str, List[str]]] = {
+        day: {kind: [_record_line(kind, day, item) for item in items] for kind, items in sections.items()}
+        for day, sections in updates.items()}
+    pending = sorted(updates)
+
+    def emit(day: str) -> Iterator[str]:
+        for kind in sorted(day_lines[day]):
+            yield from day_lines[day][kind]
+
+    def lines() -> Iterator[str]:
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    # "day" va al final de cada línea: se evita parsear el JSON entero
+                    day = line[line.rfind('"day":"') + 7:][:10]
+                    if day <= cutoff:
+                        continue
+                    while pending and pending[0] < day:
+                        yield from emit(pending.pop(0))
+                    if day in updates:
+                        # Las líneas del día se reúnen y se emiten ordenadas por tipo
+                        kind = json.loads(line)['kind']
+                        if kind not in updates[day]:
+                            day_lines[day].setdefault(kind, []).append(line)
+                        continue
+                    yield line
+        while pending:
+            yield from emit(pending.pop(0))
+
+    if updates:
+        outputs.write_stream(path, lines())
+
+
+# -- packs mensuales --------------------------------------------------------
+
+class MonthPack:
+    """Zip de un mes abierto sobre un mmap: leer un día no recorre el fichero.
+
+    El directorio central del zip hace de tabla de offsets; cada miembro se
+    lee directamente de su rango del mmap.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with zipfile.ZipFile(self._map) as archive:
+            self._entries = {info.filename: info for info in archive.infolist()}
+        self.members = set(self._entries)
+
+    def read(self, name: str) -> bytes:
+        info = self._entries[name]
+        header = self._map[info.header_offset:info.header_offset + 30]
+        if header[:4] != b'PK\x03\x04':
+            raise zipfile.BadZipFile(f"{self.path}: cabecera local inválida para {name}")
+        name_length, extra_length = struct.unpack('<HH', header[26:30])
+        start = info.header_offset + 30 + name_length + extra_length
+        data = self._map[start:start + info.compress_size]
+        if info.compress_type == zipfile.ZIP_DEFLATED:
+            return zlib.decompress(data, -15)
+        return data
+
+    def days(self, kind: str) -> List[str]:
+        prefix = kind + '/'
+        return [name[len(prefix):].split('.', 1)[0] for name in self.members if name.startswith(prefix)]
+
+    def lines(self, kind: str, date: str) -> Optional[List[str]]:
+        name = f"{kind}/{date}.ndjson"
+        if name not in self.members:
+            return None
+        return self.read(name).decode('utf-8').splitlines(keepends=True)
+
+    def close(self) -> None:
+        self._map.close()
+
+
+_packs: Dict[str, Tuple[float, MonthPack]] = {}
+_packs_lock = threading.Lock()
+
+
+def pack_path(month: str, data_dir: str = DATA_DIR) -> str:
+    return os.path.join(data_dir, PACKS_NAME, f"{month}.zip")
+
+
+def _pack(path: str) -> Optional[MonthPack]:
+    """Pack abierto (se reutiliza mientras el fichero no cambie)."""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    with _packs_lock:
+        cached = _packs.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        if cached is not None:
+            cached[1].close()
+        pack = MonthPack(path)
+        _packs[path] = (mtime, pack)
+        return pack
+
+
+def _packed_months(data_dir: str) -> List[str]:
+    return sorted(os.path.basename(p)[:-4] for p in glob.glob(os.path.join(data_dir, PACKS_NAME, '*.zip')))
+
+
+def _file_lines(path: str) -> Iterator[str]:
+    with _open(path, 'r') as f:
+        yield from f
+
+
+def _day_lines(kind: str, date: str, data_dir: str) -> Optional[Iterable[str]]:
+    """Líneas de un día: el fichero suelto (en streaming) o, si no hay, el miembro del pack."""
+    path = find_day(kind, date, data_dir)
+    if path is not None:
+        return _file_lines(path)
+    pack = _pack(pack_path(date[:7], data_dir))
+    return pack.lines(kind, date) if pack is not None else None
+
+
+def compact(data_dir: str = DATA_DIR, before: Optional[str] = None) -> Dict[str, int]:
+    """Empaqueta los días sueltos de los meses anteriores a `before` (YYYY-MM, por defecto el actual).
+
+    Si el mes ya tenía pack, los días sueltos (más recientes, p. ej. de un
+    backfill) sustituyen a los empaquetados. Devuelve los días empaquetados por mes.
+    """
+    before = before or datetime.now().strftime('%Y-%m')
+    loose: Dict[str, Dict[str, str]] = {}
+    for kind in kinds(data_dir):
+        for path in glob.glob(os.path.join(data_dir, kind, '*.ndjson*')):
+            date = os.path.basename(path).split('.', 1)[0]
+            if date[:7] < before:
+                loose.setdefault(date[:7], {})[f"{kind}/{date}.ndjson"] = path
+
+    packed = {}
+    for month, files in sorted(loose.items()):
+        target = pack_path(month, data_dir)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        previous = _pack(target)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix='.tmp-', suffix='.zip')
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+                for name in sorted((previous.members if previous else set()) - set(files)):
+                    archive.writestr(name, previous.read(name))
+                for name, path in sorted(files.items()):
+                    with _open(path, 'r') as f:
+                        archive.writestr(name, f.read())
+            os.replace(tmp_path, target)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        with _packs_lock:
+            stale = _packs.pop(target, None)
+        if stale is not None:
+            stale[1].close()
+        for path in files.values():
+            os.unlink(path)
+        packed[month] = len(files)
+    return packed
+
+
+# -- lectura -----------------------------------------------------------------
+
+def kinds(data_dir: str = DATA_DIR) -> List[str]:
+    """Tipos con artefactos (sueltos o empaquetados)."""
+    names = set()
+    if os.path.isdir(data_dir):
+        names.update(d for d in os.listdir(data_dir)
+                     if d != PACKS_NAME and os.path.isdir(os.path.join(data_dir, d)))
+    for month in _packed_months(data_dir):
+        pack = _pack(pack_path(month, data_dir))
+        names.update(name.split('/', 1)[0] for name in pack.members)
+    return sorted(names)
+
+
+def read_day(kind: str, date: str, data_dir: str = DATA_DIR) -> Optional[List[Dict]]:
+    """Records de un día (None si no hay artefacto para ese día)."""
+    lines = _day_lines(kind, date, data_dir)
+    if lines is None:
+        return None
+    return [json.loads(line) for line in lines if line.strip()]
+
+
+def days_with_data(kind: str, data_dir: str = DATA_DIR) -> List[str]:
+    """Fechas con artefacto de `kind` (sueltas o empaquetadas), ordenadas."""
+    names = (os.path.basename(p) for p in glob.glob(os.path.join(data_dir, kind, '*.ndjson*')))
+    days = {name.split('.', 1)[0] for name in names}
+    for month in _packed_months(data_dir):
+        days.update(_pack(pack_path(month, data_dir)).days(kind))
+    return sorted(days)
+
+
+def iter_records(kind: Optional[str] = None, start: Optional[str] = None, end: Optional[str] = None,
+                 data_dir: str = DATA_DIR) -> Iterator[Dict]:
+    """Recorre en streaming los records de los ficheros diarios (en orden de fecha)."""
+    for each in [kind] if kind else kinds(data_dir):
+        for date in days_with_data(each, data_dir):
+            if (start and date < start) or (end and date > end):
+                continue
+            for line in _day_lines(each, date, data_dir) or ():
+                if line.strip():
+                    yield json.loads(line)
@@ -0,0 +1,220 @@
+"""
+Ingesta incremental del CHANGELOG.md de claude-code.
+Las versiones nuevas se anteponen al principio del fichero, así que basta con
+leerlo en streaming hasta encontrar la versión que ya se procesó; el fichero
+solo se descarga si el último commit que lo modifica ha cambiado.
+"""
+import os
+import re
+import json
+import tempfile
+import threading
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    import requests
+
+DEFAULT_REPO = 'anthropics/claude-code'
+DEFAULT_PATH = 'CHANGELOG.md'
+DEFAULT_STATE_PATH = 'daily/.state/changelog.json'
+DEFAULT_API_URL = 'https://api.github.com'
+DEFAULT_RAW_URL = 'https://raw.githubusercontent.com'
+
+# Versiones que se muestran la primera vez (sin estado previo)
+INITIAL_VERSIONS = 3
+
+# Todos los ingestores comparten el fichero de estado (una clave por CHANGELOG)
+_state_lock = threading.Lock()
+
+_VERSION_RE = re.compile(r'^##\s+\[?v?(\d[\w.\-]*)\]?')
+_ITEM_RE = re.compile(r'^\s*[-*]\s+(.*)')
+
+
+def parse_changelog_lines(lines: Iterable[str], stop_version: Optional[str] = None,
+                          limit: Optional[int] = None, url: str = '') -> List[Dict]:
+    """Parser de líneas en streaming: devuelve las secciones `## versión` del principio.
+
+    Se detiene (sin consumir más líneas) al llegar a `stop_version` o tras
+    `limit` versiones. Las líneas de continuación se unen a la entrada anterior.
+    """
+    entries: List[Dict] = []
+    current: Optional[Dict] = None
+    for line in lines:
+        line = line.rstrip('\r\n')
+        header = _VERSION_RE.match(line)
+        if header:
+            version = header.group(1)
+            if version == stop_version or (limit is not None and len(entries) >= limit):
+                break
+            current = {'version': version, 'changes': [], 'url': url}
+            entries.append(current)
+            continue
+        if current is None or not line.strip():
+            continue
+        item = _ITEM_RE.match(line)
+        if item:
+            current['changes'].append(item.group(1).strip())
+        elif current['changes'] and line.startswith((' ', '\t')):
+            current['changes'][-1] += ' ' + line.strip()
+    return entries
+
+
+def merge_recorded_versions(entries: List[Dict], recorded: Optional[List[Dict]]) -> List[Dict]:
+    """Añade a las versiones nuevas las ya registradas ese día por una lectura anterior.
+
+    `recorded` son los records NDJSON del día; las versiones nuevas van primero
+    y los commits recientes son los de la última lectura.
+    """
+    versions = [e for e in entries if e.get('version')]
+    if not versions or not recorded:
+        return entries
+    seen = {e['version'] for e in versions}
+    earlier = [{k: v for k, v in r.items() if k not in ('kind', 'day')}
+               for r in recorded if r.get('version') and r['version'] not in seen]
+    return versions + earlier + [e for e in entries if not e.get('version')]
+
+
+class ChangelogIngester:
+    """Lee solo las versiones nuevas del CHANGELOG y recuerda dónde se quedó.
+
+    El estado (`daily/.state/changelog.json`, una entrada por repo/fichero)
+    guarda el SHA del último commit que tocó el fichero y la versión más
+    reciente procesada; `ingest` no lo modifica hasta que se llama a `commit`.
+    """
+
+    def __init__(self, session: 'requests.Session', token: Optional[str] = None,
+                 repo: str = DEFAULT_REPO, path: str = DEFAULT_PATH,
+                 state_path: str = DEFAULT_STATE_PATH, api_url: Optional[str] = None,
+                 raw_url: Optional[str] = None, scheduler=None):
+        self.session = session
+        self.token = token
+        self.repo = repo
+        self.path = path
+        self.state_path = state_path
+        self.api_url = (api_url or DEFAULT_API_URL).rstrip('/')
+        self.raw_url = (raw_url or os.environ.get('GITHUB_RAW_URL', DEFAULT_RAW_URL)).rstrip('/')
+        self.scheduler = scheduler
+        # El fichero guarda el estado de cada CHANGELOG bajo "repo/path"
+        self.key = f"{repo}/{path}"
+        self.state: Dict = dict(self._load().get(self.key, {}))
+        # Bytes descargados en la última lectura (solo informativo, no se guarda)
+        self.bytes_read = 0
+        # Cursor de la última lectura, pendiente de guardar (ver `commit`)
+        self.pending: Optional[Dict] = None
+
+    def _load(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    @property
+    def file_url(self) -> str:
+        return f"https://github.com/{self.repo}/blob/main/{self.path}"
+
+    def _call(self, fn, description: str):
+        return self.scheduler.call(fn, description) if self.scheduler is not None else fn()
+
+    def recent_commits(self, count: int = 5) -> List[Dict]:
+        """Últimos commits que modificaron el CHANGELOG (una llamada, revalidable por la caché HTTP)."""
+        headers = {'Accept': 'application/vnd.github+json'}
+        if self.token:
+            headers['Authorization'] = f'token {self.token}'
+
+        def fetch():
+            response = self.session.get(f"{self.api_url}/repos/{self.repo}/commits",
+                                        params={'path': self.path, 'per_page': count},
+                                        headers=headers, timeout=30)
+            response.raise_for_status()
+            return response.json()
+
+        return [{
+            'sha': c['sha'][:7],
+            'full_sha': c['sha'],
+            'message': c['commit']['message'].split('\n')[0][:100],
+            'date': c['commit']['author']['date'],
+        } for c in self._call(fetch, 'commits del CHANGELOG')]
+
+    def read_new_versions(self, ref: str) -> List[Dict]:
+        """Descarga el fichero en streaming y para en la última versión ya procesada."""
+        stop_version = self.state.get('top_version')
+        limit = None if stop_version else INITIAL_VERSIONS
+        read = 0
+
+        def lines(response):
+            nonlocal read
+            for raw in response.iter_lines(decode_unicode=False):
+                read += len(raw) + 1
+                yield raw.decode('utf-8', errors='replace')
+
+        def fetch():
+            nonlocal read
+            read = 0
+            # En streaming la caché HTTP no interviene (leería el cuerpo completo)
+            with self.session.get(f"{self.raw_url}/{self.repo}/{ref}/{self.path}",
+                                  stream=True, timeout=30) as response:
+                response.raise_for_status()
+                return parse_changelog_lines(lines(response), stop_version, limit, self.file_url)
+
+        entries = self._call(fetch, 'CHANGELOG')
+        self.bytes_read = read
+        return entries
+
+    def ingest(self) -> List[Dict]:
+        """Entradas para `generate_docs_markdown`: versiones nuevas + commits recientes."""
+        commits = self.recent_commits()
+        if not commits:
+            return [{'info': True, 'message': 'El CHANGELOG no tiene commits'}]
+        head = commits[0]['full_sha']
+        if head == self.state.get('commit_sha'):
+            print("  ⏭️  CHANGELOG sin cambios desde la última ejecución")
+            return [{'info': True, 'message': 'Sin versiones nuevas en el CHANGELOG'}]
+
+        entries = self.read_new_versions(head)
+        print(f"  📚 CHANGELOG: {len(entries)} versiones nuevas "
+              f"({self.bytes_read / 1024:.1f} KB leídos)")
+        # El cursor avanza en `commit`, cuando las salidas del día ya están escritas
+        self.pending = {'commit_sha': head}
+        if entries:
+            self.pending['top_version'] = entries[0]['version']
+        if not entries:
+            # Sin versiones que perder, el cursor puede avanzar ya
+            self.commit()
+            return [{'info': True, 'message': 'Sin versiones nuevas en el CHANGELOG'}]
+        recent = [{k: v for k, v in c.items() if k != 'full_sha'} for c in commits]
+        return entries + [{'recent_commits': recent}]
+
+    def commit(self) -> None:
+        """Avanza y guarda el cursor de la última lectura.
+
+        Se llama tras escribir las salidas: si la escritura falla, la siguiente
+        ejecución vuelve a leer las mismas versiones en lugar de perderlas.
+        """
+        if self.pending is None:
+            return
+        self.state.update(self.pending)
+        self.pending = None
+        self.save()
+
+    def save(self) -> None:
+        """Guarda la entrada de este CHANGELOG sin pisar las de otros ingestores.
+
+        El fichero se relee bajo el cerrojo justo antes de escribir, así que
+        varias fuentes (o un proceso watch de larga duración) no se
+        sobrescriben los cursores con una copia antigua.
+        """
+        directory = os.path.dirname(self.state_path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        with _state_lock:
+            states = self._load()
+            states[self.key] = self.state
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix=os.path.basename(self.state_path))
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(states, f, ensure_ascii=False, sort_keys=True, indent=1)
+                    f.write('\n')
+                os.replace(tmp_path, self.state_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
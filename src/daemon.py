@@ -0,0 +1,140 @@
+"""
+Modo watch: proceso de larga duración con el estado caliente en memoria.
+El scraper (sesión HTTP con su pool de conexiones, clientes de PyGithub,
+caché HTTP), los cursores y el estado de items vistos se crean una sola vez;
+cada fuente se sondea con su propio intervalo y solo se regeneran los
+ficheros del tipo de salida que cambió.
+"""
+import json
+import time
+import hashlib
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set
+
+import artifacts
+from pipeline import SourceTask, run_sources
+from records import to_papers, to_repo_updates
+from sources import KINDS, ResultCache, Source, merge_kind
+from metrics import metrics
+
+# Tipos que se guardan como registros tipados (como en `write_outputs`)
+RECORD_TYPES = {'research': to_papers, 'github': to_repo_updates}
+
+
+def _digest(kind: str, items: List[Dict]) -> str:
+    """Digest de los items tal como quedan en el NDJSON del día."""
+    items = RECORD_TYPES.get(kind, list)(items)
+    data = [item.to_dict() if hasattr(item, 'to_dict') else item for item in items]
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def _placeholder(items: List[Dict]) -> bool:
+    """True si la fuente no trajo datos (error o aviso tipo "sin versiones nuevas")."""
+    return not items or bool(items[0].get('error') or items[0].get('info'))
+
+
+class Watcher:
+    """Sondea las fuentes según su intervalo y avisa de los tipos que cambiaron.
+
+    `on_change(day, results, kinds)` recibe los items de todos los tipos y el
+    conjunto de tipos cuyo contenido cambió desde la última escritura (la de
+    este proceso o, al arrancar, la que ya hay en disco para hoy).
+    """
+
+    def __init__(self, scraper, sources: List[Source], on_change: Callable[[str, Dict, Set[str]], None],
+                 results: Optional[ResultCache] = None, clock: Callable[[], float] = time.monotonic,
+                 data_dir: str = artifacts.DATA_DIR):
+        self.scraper = scraper
+        self.sources = sources
+        self.on_change = on_change
+        self.results = results if results is not None else ResultCache()
+        self.clock = clock
+        self.data_dir = data_dir
+        self.day: Optional[str] = None
+        self.by_source: Dict[str, List[Dict]] = {}
+        self.stored: Dict[str, List[Dict]] = {}
+        self.digests: Dict[str, str] = {}
+        self.next_poll: Dict[str, float] = {s.name: 0.0 for s in sources}
+        self.stop_event = threading.Event()
+        self.polls = 0
+
+    def _start_day(self, day: str) -> None:
+        # Día nuevo: todo se vuelve a consultar y los ficheros de ayer quedan cerrados
+        self.day = day
+        self.by_source = {}
+        self.stored = self._read_day(day)
+        self.digests = {kind: _digest(kind, items) for kind, items in self.stored.items()}
+        self.next_poll = {s.name: 0.0 for s in self.sources}
+
+    def _read_day(self, day: str) -> Dict[str, List[Dict]]:
+        """Items ya escritos hoy (por el run diario o un watch anterior), por tipo.
+
+        Sirven de punto de partida: el primer sondeo solo regenera los tipos
+        cuyo contenido cambió respecto a lo que hay en disco.
+        """
+        stored = {}
+        for kind in KINDS:
+            records = artifacts.read_day(kind, day, self.data_dir)
+            if records:
+                stored[kind] = [{k: v for k, v in record.items() if k not in ('kind', 'day')} for record in records]
+        return stored
+
+    def due(self) -> List[Source]:
+        now = self.clock()
+        return [s for s in self.sources if self.next_poll[s.name] <= now]
+
+    def poll(self, day: Optional[str] = None) -> Set[str]:
+        """Consulta las fuentes que tocan; devuelve los tipos cuyo contenido cambió."""
+        day = day or datetime.now().strftime('%Y-%m-%d')
+        if day != self.day:
+            self._start_day(day)
+        sources = self.due()
+        if not sources:
+            return set()
+
+        tasks = [SourceTask(s.name, lambda cancel, s=s: s.collect(self.scraper, cancel, self.results),
+                            s.timeout) for s in sources]
+        outputs, _ = run_sources(tasks)
+        now = self.clock()
+        for source in sources:
+            self.next_poll[source.name] = now + source.interval
+            items = outputs[source.name]
+            # Un error transitorio o un "sin novedades" no borra lo ya obtenido hoy
+            if _placeholder(items) and source.name in self.by_source:
+                continue
+            self.by_source[source.name] = items
+
+        changed = set()
+        for kind in {s.kind for s in sources}:
+            digest = _digest(kind, self.merged(kind))
+            if self.digests.get(kind) != digest:
+                self.digests[kind] = digest
+                changed.add(kind)
+        self.polls += 1
+        metrics.incr('watch.polls')
+        if changed:
+            self.on_change(day, {kind: self.merged(kind) for kind in KINDS}, changed)
+        return changed
+
+    def merged(self, kind: str) -> List[Dict]:
+        items = merge_kind([self.by_source[s.name] for s in self.sources
+                            if s.kind == kind and s.name in self.by_source])
+        # Sin datos nuevos en este proceso se conserva lo ya escrito hoy
+        if _placeholder(items) and kind in self.stored:
+            return self.stored[kind]
+        return items
+
+    def sleep_time(self) -> float:
+        return max(0.0, min(self.next_poll.values()) - self.clock())
+
+    def run(self, max_polls: Optional[int] = None) -> None:
+        """Bucle principal hasta `stop_event` (o hasta `max_polls` sondeos)."""
+        while not self.stop_event.is_set():
+            changed = self.poll()
+            if changed:
+                print(f"🔄 {self.day}: regenerado {', '.join(sorted(changed))}")
+            if max_polls is not None and self.polls >= max_polls:
+                return
+            # Se despierta como mucho cada minuto para detectar el cambio de día
+            self.stop_event.wait(min(self.sleep_time(), 60))
@@ -0,0 +1,181 @@
+"""
+Backend GraphQL para la actividad de GitHub.
+Obtiene repos, commits y releases de toda una organización en unas pocas
+consultas paginadas, en lugar de 3+ llamadas REST por repo.
+"""
+import os
+from datetime import datetime, timezone
+from typing import List, Dict, Optional, Iterator
+
+DEFAULT_GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Repos ordenados por último push (igual que sort='pushed' en REST); cada
+# nodo trae ya sus últimos commits desde la fecha de corte y sus releases.
+ORG_ACTIVITY_QUERY = """
+query($org: String!, $cursor: String, $since: GitTimestamp!, $pageSize: Int!, $commits: Int!, $releases: Int!) {
+  organization(login: $org) {
+    repositories(first: $pageSize, after: $cursor, privacy: PUBLIC,
+                 orderBy: {field: PUSHED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        url
+        description
+        stargazerCount
+        updatedAt
+        pushedAt
+        primaryLanguage { name }
+        defaultBranchRef {
+          target {
+            ... on Commit {
+              history(first: $commits, since: $since) {
+                nodes {
+                  message
+                  url
+                  author { name date }
+                }
+              }
+            }
+          }
+        }
+        releases(first: $releases, orderBy: {field: CREATED_AT, direction: DESC}) {
+          nodes { tagName name url description createdAt }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+class GraphQLError(Exception):
+    """Error devuelto por la API GraphQL de GitHub."""
+
+
+def _parse_iso(value: Optional[str]) -> Optional[datetime]:
+    """Parsea timestamps ISO de GitHub ('...Z') a datetime aware."""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class GitHubGraphQLClient:
+    """Cliente mínimo de la API GraphQL de GitHub."""
+
+    def __init__(self, token: str, session, api_url: Optional[str] = None, scheduler=None):
+        self.token = token
+        self.session = session
+        # RateLimitScheduler opcional: ritmo y reintentos de cada consulta
+        self.scheduler = scheduler
+        # Configurable para apuntar a un servidor stub con respuestas grabadas
+        self.api_url = api_url or os.environ.get('GITHUB_GRAPHQL_URL', DEFAULT_GRAPHQL_URL)
+
+    def query(self, query: str, variables: Dict) -> Dict:
+        """Ejecuta una consulta y devuelve el campo `data`."""
+        if self.scheduler is not None:
+            return self.scheduler.call(lambda: self._query(query, variables), 'consulta GraphQL')
+        return self._query(query, variables)
+
+    def _query(self, query: str, variables: Dict) -> Dict:
+        response = self.session.post(
+            self.api_url,
+            json={'query': query, 'variables': variables},
+            headers={'Authorization': f'bearer {self.token}'},
+            timeout=30,
+        )
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get('errors'):
+            messages = '; '.join(e.get('message', str(e)) for e in payload['errors'])
+            raise GraphQLError(messages)
+        return payload['data']
+
+    def iter_org_repos(self, org_name: str, since: datetime, page_size: int = 30,
+                       commits: int = 5, releases: int = 2) -> Iterator[Dict]:
+        """Itera los nodos de repos de la organización, página a página."""
+        cursor = None
+        while True:
+            data = self.query(ORG_ACTIVITY_QUERY, {
+                'org': org_name,
+                'cursor': cursor,
+                'since': since.isoformat(),
+                'pageSize': page_size,
+                'commits': commits,
+                'releases': releases,
+            })
+            organization = data.get('organization')
+            if organization is None:
+                raise GraphQLError(f"Organización no encontrada: {org_name}")
+            repositories = organization['repositories']
+            yield from repositories['nodes']
+            page_info = repositories['pageInfo']
+            if not page_info['hasNextPage']:
+                return
+            cursor = page_info['endCursor']
+
+    def get_org_activity(self, org_name: str, since: datetime, page_size: int = 30) -> List[Dict]:
+        """Devuelve los `update_info` de los repos con actividad desde `since`.
+
+        Reproduce el resultado del backend REST: mismos repos candidatos (todos
+        los que tienen pushes desde `since`), mismos campos y orden.
+        """
+        updates = []
+        for node in self.iter_org_repos(org_name, since, page_size=page_size):
+            pushed_at = _parse_iso(node.get('pushedAt'))
+            if pushed_at is None:
+                continue
+            if pushed_at < since:
+                # Orden descendente por push: el resto de repos tampoco tiene actividad
+                break
+            repo_updated = _parse_iso(node.get('updatedAt')) or pushed_at
+
+            update_info = self.node_to_update(node, repo_updated, since)
+            if update_info:
+                updates.append(update_info)
+                print(f"      ✅ {update_info['name']}: {len(update_info['commits'])} commits, "
+                      f"{len(update_info['releases'])} releases")
+        return updates
+
+    @staticmethod
+    def node_to_update(node: Dict, repo_updated: datetime, since: datetime) -> Optional[Dict]:
+        """Mapea un nodo de repo GraphQL al dict `update_info` (None si no hay actividad)."""
+        recent_commits = []
+        target = (node.get('defaultBranchRef') or {}).get('target') or {}
+        for commit in (target.get('history') or {}).get('nodes', [])[:5]:
+            author = commit.get('author') or {}
+            commit_date = _parse_iso(author.get('date'))
+            recent_commits.append({
+                'message': (commit.get('message') or '').split('\n')[0][:100],
+                'url': commit['url'],
+                'author': author.get('name'),
+                'date': commit_date.isoformat() if commit_date else ''
+            })
+
+        recent_releases = []
+        for release in (node.get('releases') or {}).get('nodes', [])[:2]:
+            release_date = _parse_iso(release.get('createdAt'))
+            if release_date and release_date > since:
+                body = release.get('description')
+                recent_releases.append({
+                    'tag': release['tagName'],
+                    'name': release.get('name'),
+                    'url': release['url'],
+                    'body': (body[:500] + "...") if body and len(body) > 500 else (body or "")
+                })
+
+        if not (recent_commits or recent_releases):
+            return None
+
+        return {
+            'name': node['name'],
+            'url': node['url'],
+            'description': node.get('description') or "No description",
+            'stars': node.get('stargazerCount', 0),
+            'language': (node.get('primaryLanguage') or {}).get('name') or "Unknown",
+            'updated_at': repo_updated.isoformat(),
+            'commits': recent_commits,
+            'releases': recent_releases
+        }
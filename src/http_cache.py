@@ -0,0 +1,274 @@
+"""
+Caché HTTP persistente en disco con peticiones condicionales.
+Guarda cada cuerpo junto a su ETag/Last-Modified, revalida con
+If-None-Match/If-Modified-Since y sirve las respuestas 304 desde disco.
+"""
+import os
+import json
+import hashlib
+import tempfile
+import threading
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+DEFAULT_CACHE_DIR = '.cache/http'
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Segundos durante los que una entrada se sirve sin tocar la red, por prefijo
+# de URL (gana el prefijo más largo). 0 = revalidar siempre. Los listados se
+# revalidan en cada consulta para que el modo watch vea los papers nuevos en
+# cada sondeo; las páginas de cada paper apenas cambian.
+DEFAULT_TTLS = {
+    'https://www.anthropic.com/': 0,
+    'https://www.anthropic.com/research/': 6 * 3600,
+    'https://api.github.com/': 0,
+}
+
+# Cabeceras que no tienen sentido al reconstruir una respuesta desde disco
+_DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+
+class HTTPCache:
+    """Caché en disco con expulsión LRU acotada por tamaño y TTL por fuente.
+
+    Cada entrada es un fichero: una línea JSON con los metadatos (URL,
+    cabeceras, fecha de guardado) seguida del cuerpo en bruto. El orden LRU
+    se mantiene con el mtime de los ficheros, así que varias ejecuciones
+    pueden compartir el directorio sin un índice aparte.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 ttls: Optional[Dict[str, int]] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttls = DEFAULT_TTLS if ttls is None else ttls
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._sizes = {}
+        for entry in os.scandir(directory):
+            if entry.is_file() and entry.name.endswith('.entry'):
+                self._sizes[entry.name] = entry.stat().st_size
+        self._total = sum(self._sizes.values())
+
+    @staticmethod
+    def key_for(url: str, vary: str = '') -> str:
+        """Clave de la entrada: URL más lo que distingue la respuesta (p. ej. el token)."""
+        return hashlib.sha256(f"{url}\n{vary}".encode('utf-8')).hexdigest() + '.entry'
+
+    def count(self, counter: str) -> None:
+        """Incrementa `hits`, `revalidated` o `misses` (se llama desde varios hilos)."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def ttl_for(self, url: str) -> int:
+        """TTL aplicable a la URL según el prefijo más largo configurado."""
+        best, ttl = -1, 0
+        for prefix, seconds in self.ttls.items():
+            if url.startswith(prefix) and len(prefix) > best:
+                best, ttl = len(prefix), seconds
+        return ttl
+
+    def get(self, key: str) -> Optional[Tuple[Dict, bytes]]:
+        """Devuelve (metadatos, cuerpo) o None; marca la entrada como usada."""
+        path = os.path.join(self.directory, key)
+        try:
+            with open(path, 'rb') as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return meta, body
+
+    def put(self, key: str, meta: Dict, body: bytes) -> None:
+        """Guarda una entrada de forma atómica y expulsa las menos usadas si hace falta."""
+        data = json.dumps(meta).encode('utf-8') + b'\n' + body
+        if len(data) > self.max_bytes:
+            return
+        path = os.path.join(self.directory, key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return
+        with self._lock:
+            self._total += len(data) - self._sizes.get(key, 0)
+            self._sizes[key] = len(data)
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def touch(self, key: str, meta: Dict) -> None:
+        """Actualiza los metadatos de una entrada revalidada (304)."""
+        entry = self.get(key)
+        if entry:
+            self.put(key, meta, entry[1])
+
+    def _evict(self) -> None:
+        """Borra las entradas con mtime más antiguo hasta bajar del límite."""
+        entries = []
+        for name in self._sizes:
+            try:
+                entries.append((os.path.getmtime(os.path.join(self.directory, name)), name))
+            except OSError:
+                entries.append((0, name))
+        for _, name in sorted(entries):
+            if self._total <= self.max_bytes:
+                break
+            try:
+                os.unlink(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            self._total -= self._sizes.pop(name)
+
+
+def _build_response(request, meta: Dict, body: bytes, headers: Optional[Dict] = None) -> requests.Response:
+    """Reconstruye un `requests.Response` 200 a partir de una entrada de caché."""
+    response = requests.Response()
+    response.status_code = meta.get('status', 200)
+    response.reason = 'OK'
+    response.headers = CaseInsensitiveDict(meta.get('headers', {}))
+    if headers:
+        response.headers.update(headers)
+    response.encoding = get_encoding_from_headers(response.headers)
+    response._content = body
+    response.url = request.url
+    response.request = request
+    response.from_cache = True
+    return response
+
+
+class CachingAdapter(HTTPAdapter):
+    """Adaptador de `requests` que resuelve los GET a través de un `HTTPCache`."""
+
+    def __init__(self, cache: HTTPCache, **kwargs):
+        self.cache = cache
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        # Las descargas en streaming no se cachean: guardarlas leería el cuerpo completo
+        if request.method != 'GET' or kwargs.get('stream'):
+            return super().send(request, **kwargs)
+
+        cache = self.cache
+        key = cache.key_for(request.url, request.headers.get('Authorization', ''))
+        entry = cache.get(key)
+
+        if entry:
+            meta, body = entry
+            ttl = cache.ttl_for(request.url)
+            if ttl and time.time() - meta.get('stored_at', 0) < ttl:
+                cache.count('hits')
+                return _build_response(request, meta, body)
+            if meta.get('etag'):
+                request.headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                request.headers['If-Modified-Since'] = meta['last_modified']
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and entry:
+            meta, body = entry
+            cache.count('revalidated')
+            # El 304 trae cabeceras frescas (p. ej. X-RateLimit-*)
+            fresh = {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS}
+            meta['headers'].update(fresh)
+            meta['stored_at'] = time.time()
+            cache.touch(key, meta)
+            response.close()
+            return _build_response(request, meta, body)
+
+        cache.count('misses')
+        if response.status_code == 200:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified or cache.ttl_for(request.url):
+                cache.put(key, {
+                    'url': request.url,
+                    'status': 200,
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'stored_at': time.time(),
+                    'headers': {k: v for k, v in response.headers.items()
+                                if k.lower() not in _DROPPED_HEADERS},
+                }, response.content)
+        response.from_cache = False
+        return response
+
+
+def mount_cache(session: requests.Session, cache: HTTPCache, **adapter_kwargs) -> requests.Session:
+    """Monta el adaptador con caché en una sesión para http y https."""
+    adapter = CachingAdapter(cache, **adapter_kwargs)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def install_github_transport(cache: Optional[HTTPCache] = None, response_hooks: Sequence = ()) -> None:
+    """Hace que PyGithub use sesiones compartidas (con caché y hooks opcionales).
+
+    PyGithub crea su propio `requests.Session` por conexión; inyectamos clases
+    de conexión que reutilizan una sesión por host, con el adaptador de caché
+    y los hooks de respuesta montados. También sirve de pool keep-alive
+    compartido entre los hilos de `get_github_updates`.
+    """
+    from github.Requester import (
+        Requester, HTTPRequestsConnectionClass, HTTPSRequestsConnectionClass
+    )
+
+    sessions = {}
+    sessions_lock = threading.Lock()
+
+    def shared_session(protocol: str, host: str, port, connection) -> requests.Session:
+        with sessions_lock:
+            session = sessions.get((protocol, host, port))
+            if session is None:
+                session = requests.Session()
+                session.auth = Requester.noopAuth
+                adapter_kwargs = dict(max_retries=connection.retry,
+                                      pool_connections=connection.pool_size,
+                                      pool_maxsize=max(connection.pool_size, 32))
+                if cache is not None:
+                    mount_cache(session, cache, **adapter_kwargs)
+                else:
+                    adapter = HTTPAdapter(**adapter_kwargs)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                session.hooks['response'].extend(response_hooks)
+                sessions[(protocol, host, port)] = session
+            return session
+
+    class SharedHTTPSConnection(HTTPSRequestsConnectionClass):
+        def __init__(self, host, port=None, strict=False, timeout=None, retry=None, pool_size=None, **kwargs):
+            super().__init__(host, port, strict, timeout, retry, pool_size, **kwargs)
+            self.session.close()
+            self.session = shared_session(self.protocol, self.host, self.port, self)
+
+        def close(self) -> None:
+            # La sesión es compartida: no se cierra con cada conexión
+            pass
+
+    class SharedHTTPConnection(HTTPRequestsConnectionClass):
+        def __init__(self, host, port=None, strict=False, timeout=None, retry=None, pool_size=None, **kwargs):
+            super().__init__(host, port, strict, timeout, retry, pool_size, **kwargs)
+            self.session.close()
+            self.session = shared_session(self.protocol, self.host, self.port, self)
+
+        def close(self) -> None:
+            pass
+
+    # Las conexiones inyectadas no se persisten en el Requester, de modo que
+    # cada petición obtiene su propio objeto conexión (thread-safe) sobre la
+    # sesión compartida.
+    Requester.injectConnectionClasses(SharedHTTPConnection, SharedHTTPSConnection)
@@ -0,0 +1,154 @@
+"""
+Instrumentación de la ejecución: spans de tiempo, contadores y métricas por run.
+Desactivada por defecto; en ese modo `span()` devuelve un objeto no-op
+compartido y los contadores retornan de inmediato.
+"""
+import os
+import json
+import time
+import threading
+from typing import Dict, Optional
+
+
+class _NoopSpan:
+    """Span vacío reutilizable para el modo desactivado."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    def __init__(self, metrics: 'Metrics', name: str, attrs: Dict):
+        self.metrics = metrics
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics._close_span(self, time.perf_counter() - self.start, exc is not None)
+        return False
+
+
+class Metrics:
+    """Colector de métricas de un run (thread-safe)."""
+
+    def __init__(self, enabled: bool = False, trace: bool = False):
+        self.enabled = enabled or trace
+        self.trace = trace
+        self.reset()
+
+    def reset(self) -> None:
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.spans: Dict[str, Dict] = {}
+        self.counters: Dict[str, float] = {}
+        self.gauges: Dict[str, float] = {}
+        self.events = []
+
+    def span(self, name: str, **attrs):
+        """Context manager que mide la duración de un paso."""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _Span(self, name, attrs)
+
+    def _close_span(self, span: _Span, seconds: float, failed: bool) -> None:
+        ms = seconds * 1000
+        with self._lock:
+            stats = self.spans.get(span.name)
+            if stats is None:
+                stats = self.spans[span.name] = {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'errors': 0}
+            stats['count'] += 1
+            stats['total_ms'] += ms
+            stats['max_ms'] = max(stats['max_ms'], ms)
+            if failed:
+                stats['errors'] += 1
+            if self.trace:
+                self.events.append({
+                    'span': span.name,
+                    'start_ms': round((span.start - self._t0) * 1000, 3),
+                    'duration_ms': round(ms, 3),
+                    **span.attrs,
+                })
+        if self.trace:
+            attrs = ' '.join(f"{k}={v}" for k, v in span.attrs.items())
+            print(f"    ⏱️ {span.name} {ms:.1f}ms {attrs}".rstrip())
+
+    def incr(self, name: str, value: float = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def gauge(self, name: str, value: float, keep_min: bool = False) -> None:
+        """Fija un valor; con `keep_min` conserva el mínimo observado."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if keep_min and name in self.gauges:
+                value = min(self.gauges[name], value)
+            self.gauges[name] = value
+
+    def response_hook(self, response, *args, **kwargs):
+        """Hook de `requests` que cuenta peticiones, bytes, caché y rate limit."""
+        host = response.url.split('/')[2] if response.url else 'unknown'
+        from_cache = getattr(response, 'from_cache', False)
+        self.incr('http.requests')
+        self.incr(f'http.requests.{host}')
+        if from_cache:
+            self.incr('http.cache_hits')
+        else:
+            # Bytes según Content-Length: leer `.content` consumiría las respuestas en streaming
+            length = response.headers.get('Content-Length')
+            if length is not None and length.isdigit():
+                self.incr('http.bytes', int(length))
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        if remaining is not None and remaining.isdigit():
+            self.gauge('github.rate_limit_remaining', int(remaining), keep_min=True)
+        return response
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            data = {
+                'started_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(self.started_at)),
+                'duration_ms': round((time.perf_counter() - self._t0) * 1000, 3),
+                'spans': {name: {k: round(v, 3) if isinstance(v, float) else v for k, v in stats.items()}
+                          for name, stats in sorted(self.spans.items())},
+                'counters': dict(sorted(self.counters.items())),
+                'gauges': dict(sorted(self.gauges.items())),
+            }
+            if self.trace:
+                data['trace'] = list(self.events)
+        return data
+
+    def write(self, path: str) -> None:
+        """Escribe las métricas del run como JSON."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+            f.write('\n')
+
+
+# Colector global del proceso; `configure` lo activa
+metrics = Metrics()
+
+
+def configure(enabled: Optional[bool] = None, trace: Optional[bool] = None) -> Metrics:
+    """Activa la instrumentación (por defecto según SCRAPER_METRICS / SCRAPER_TRACE)."""
+    if trace is None:
+        trace = os.environ.get('SCRAPER_TRACE', '') not in ('', '0')
+    if enabled is None:
+        enabled = os.environ.get('SCRAPER_METRICS', '') not in ('', '0')
+    metrics.enabled = enabled or trace
+    metrics.trace = trace
+    metrics.reset()
+    return metrics
@@ -0,0 +1,187 @@
+"""
+Escritura de salidas direccionada por contenido.
+Cada documento se hashea normalizado (sin las marcas de tiempo de generación)
+mientras se escribe en un búfer; si el digest coincide con el guardado del
+fichero, no se toca el disco y el fichero conserva su fecha original. Así una
+re-ejecución o un sondeo del modo watch sin datos nuevos no escribe nada ni
+produce commits.
+
+Los ficheros `.gz` (artefactos NDJSON comprimidos) se comparan por su
+contenido descomprimido y se escriben sin fecha en la cabecera gzip.
+
+Sin `configure()` (p. ej. en los procesos hijos del backfill) se escribe
+siempre, como antes; el digest guardado lleva el tamaño y mtime del fichero,
+de modo que una escritura hecha por otro proceso se detecta y se rehashea.
+"""
+import io
+import os
+import re
+import gzip
+import json
+import shutil
+import hashlib
+import tempfile
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from metrics import metrics
+
+DEFAULT_DIGESTS_PATH = 'daily/.state/digests.json'
+
+# Documentos de hasta este tamaño no tocan el disco hasta saber si cambiaron
+SPOOL_BYTES = 1 << 20
+
+# Marcas volátiles que no cuentan como cambio: la fecha de generación de la
+# cabecera markdown/HTML, `generated_at` del JSON y las fechas del RSS. Cada
+# renderer las emite dentro de un mismo fragmento, así que se pueden quitar
+# fragmento a fragmento.
+VOLATILE_RE = re.compile(
+    r'(?:\*\*)?Fecha(?: de generación)?(?:\*\*)?: \d{4}-\d{2}-\d{2} \d{2}:\d{2} UTC'
+    r'|"generated_at": "[^"]*"'
+    r'|<(lastBuildDate|pubDate)>[^<]*</\1>')
+
+
+def normalize(chunk: str) -> str:
+    return VOLATILE_RE.sub('', chunk)
+
+
+def file_digest(path: str) -> Optional[str]:
+    """Digest normalizado de un fichero en disco (None si no existe)."""
+    hasher = hashlib.sha256()
+    try:
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8', newline='') as f:
+            for line in f:
+                hasher.update(normalize(line).encode('utf-8'))
+    except (OSError, UnicodeDecodeError):
+        return None
+    return hasher.hexdigest()
+
+
+class DigestStore:
+    """Digest del contenido normalizado de cada salida, con el stat del fichero.
+
+    Si el tamaño o el mtime del fichero no coinciden con lo guardado (checkout
+    nuevo, backfill, edición a mano) se vuelve a hashear el fichero de disco.
+    Solo se marca para guardar cuando cambia un digest, no cuando cambia el
+    stat, para que el fichero de estado no genere commits por sí solo.
+    """
+
+    def __init__(self, path: str = DEFAULT_DIGESTS_PATH):
+        self.path = path
+        self.files: Dict[str, Dict] = {}
+        self.dirty = False
+        self.written: List[str] = []
+        self.skipped: List[str] = []
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.files = json.load(f)
+
+    def current(self, path: str) -> Optional[str]:
+        """Digest del contenido que hay ahora en `path` (None si no existe)."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        with self._lock:
+            entry = self.files.get(path)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['digest']
+        digest = file_digest(path)
+        if digest is not None:
+            self._remember(path, digest, dirty=entry is None or entry['digest'] != digest)
+        return digest
+
+    def record(self, path: str, digest: str) -> None:
+        self._remember(path, digest, dirty=True)
+        with self._lock:
+            self.written.append(path)
+
+    def skip(self, path: str) -> None:
+        with self._lock:
+            self.skipped.append(path)
+
+    def _remember(self, path: str, digest: str, dirty: bool) -> None:
+        stat = os.stat(path)
+        with self._lock:
+            self.files[path] = {'digest': digest, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+            self.dirty = self.dirty or dirty
+
+    def flush(self) -> None:
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.files, f, sort_keys=True, indent=1)
+                f.write('\n')
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+
+
+# Almacén del proceso; `configure` lo activa
+digests: Optional[DigestStore] = None
+
+
+def configure(path: Optional[str] = None) -> DigestStore:
+    """Activa la escritura condicional (ruta por defecto según OUTPUT_DIGESTS_PATH)."""
+    global digests
+    digests = DigestStore(path or os.environ.get('OUTPUT_DIGESTS_PATH', DEFAULT_DIGESTS_PATH))
+    return digests
+
+
+def write_stream(path: str, chunks: Iterable[str]) -> int:
+    """Escribe los fragmentos en `path` de forma atómica si el contenido cambió.
+
+    Devuelve los caracteres escritos, o 0 si el fichero ya tenía ese contenido
+    (sin contar las marcas de tiempo) y no se tocó.
+    """
+    store = digests
+    hasher = hashlib.sha256()
+    written = 0
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES, mode='w+', encoding='utf-8') as spool:
+        for chunk in chunks:
+            spool.write(chunk)
+            hasher.update(normalize(chunk).encode('utf-8'))
+            written += len(chunk)
+        digest = hasher.hexdigest()
+        if store is not None and store.current(path) == digest:
+            store.skip(path)
+            metrics.incr('outputs.skipped')
+            return 0
+
+        spool.seek(0)
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix=os.path.basename(path))
+        try:
+            with os.fdopen(fd, 'wb') as raw:
+                if path.endswith('.gz'):
+                    with gzip.GzipFile(filename='', mode='wb', fileobj=raw, mtime=0) as compressed:
+                        with io.TextIOWrapper(compressed, encoding='utf-8') as f:
+                            shutil.copyfileobj(spool, f)
+                else:
+                    with io.TextIOWrapper(raw, encoding='utf-8') as f:
+                        shutil.copyfileobj(spool, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+    if store is not None:
+        store.record(path, digest)
+    metrics.incr('outputs.written')
+    return written
+
+
+def report() -> None:
+    """Resume las escrituras del run (hechas y evitadas) y guarda los digests."""
+    if digests is None:
+        return
+    written, skipped = digests.written, digests.skipped
+    if written or skipped:
+        print(f"  💾 Salidas: {len(written)} escritas, {len(skipped)} sin cambios (no reescritas)")
+    digests.written, digests.skipped = [], []
+    digests.flush()
@@ -0,0 +1,78 @@
+"""
+Ejecución concurrente de las fuentes con deadline y cancelación por fuente.
+Una fuente lenta o colgada se degrada a su placeholder de error en vez de
+bloquear toda la ejecución.
+"""
+import time
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from metrics import metrics
+
+
+class SourceTask:
+    """Una fuente a ejecutar: `fn(cancel_event)` devuelve su lista de items."""
+
+    def __init__(self, name: str, fn: Callable[[threading.Event], List[Dict]], timeout: float,
+                 label: Optional[str] = None):
+        self.name = name
+        self.fn = fn
+        self.timeout = timeout
+        self.label = label or name
+        self.cancel_event = threading.Event()
+        self.result: Optional[List[Dict]] = None
+        self.latency: Optional[float] = None
+        self._done = threading.Event()
+
+    def _run(self) -> None:
+        start = time.perf_counter()
+        try:
+            with metrics.span(f"source.{self.name}"):
+                self.result = self.fn(self.cancel_event)
+        except Exception as e:
+            print(f"❌ Error en fuente {self.label}: {e}")
+            self.result = [{
+                'error': True,
+                'message': f'Error obteniendo {self.label}: {str(e)}'
+            }]
+        finally:
+            self.latency = time.perf_counter() - start
+            self._done.set()
+
+
+def run_sources(tasks: List[SourceTask]) -> Tuple[Dict[str, List[Dict]], Dict[str, float]]:
+    """Ejecuta todas las fuentes a la vez y espera a cada una hasta su deadline.
+
+    Devuelve ``(resultados, latencias)`` indexados por nombre de fuente. Las
+    fuentes que no terminan a tiempo reciben la señal de cancelación y su
+    resultado es ``[{'error': True, 'message': ...}]``. Los hilos son daemon
+    para que una fuente colgada no impida terminar el proceso.
+    """
+    start = time.perf_counter()
+    for task in tasks:
+        threading.Thread(target=task._run, name=f"source-{task.name}", daemon=True).start()
+
+    results: Dict[str, List[Dict]] = {}
+    latencies: Dict[str, float] = {}
+    for task in tasks:
+        remaining = task.timeout - (time.perf_counter() - start)
+        if task._done.wait(max(remaining, 0)):
+            results[task.name] = task.result
+            latencies[task.name] = task.latency
+        else:
+            task.cancel_event.set()
+            print(f"⏱️ {task.label}: sin respuesta tras {task.timeout:g}s, se cancela")
+            results[task.name] = [{
+                'error': True,
+                'message': f'Tiempo de espera agotado ({task.timeout:g}s) obteniendo {task.label}'
+            }]
+            latencies[task.name] = time.perf_counter() - start
+
+    return results, latencies
+
+
+def print_latencies(latencies: Dict[str, float]) -> None:
+    """Imprime la latencia de cada fuente."""
+    print("⏱️ Latencia por fuente:")
+    for name, seconds in latencies.items():
+        print(f"  - {name}: {seconds:.2f}s")
@@ -0,0 +1,169 @@
+"""
+Planificador de llamadas a GitHub consciente del rate limit.
+Sigue X-RateLimit-Remaining/Reset y Retry-After, espacia las peticiones para
+no agotar el presupuesto y reintenta fallos transitorios con backoff
+exponencial con jitter.
+"""
+import time
+import random
+import threading
+from typing import Callable, Optional, Tuple, TypeVar
+
+import requests
+
+from metrics import metrics
+
+T = TypeVar('T')
+
+# Códigos que merece la pena reintentar (403 solo si es por rate limit)
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class RateLimitScheduler:
+    """Controla el ritmo y los reintentos de las llamadas a la API de GitHub.
+
+    El estado (restante, límite, reset, bloqueo por Retry-After) se alimenta
+    con `response_hook` desde las sesiones HTTP, así que refleja todas las
+    peticiones del proceso, incluidas las de PyGithub.
+    """
+
+    def __init__(self, reserve: int = 50, max_retries: int = 4, base_delay: float = 1.0,
+                 max_delay: float = 60.0, max_wait: float = 900.0,
+                 sleep: Callable[[float], None] = time.sleep, clock: Callable[[], float] = time.time):
+        # Peticiones que se dejan sin gastar para otros procesos con el mismo token
+        self.reserve = reserve
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        # Espera máxima aceptable antes de rendirse (p. ej. reset en una hora)
+        self.max_wait = max_wait
+        self.sleep = sleep
+        self.clock = clock
+        self.remaining: Optional[int] = None
+        self.limit: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.blocked_until = 0.0
+        # Turno reservado por la última llamada (ver `acquire`)
+        self._next_allowed = 0.0
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    # -- estado ----------------------------------------------------------
+
+    def observe(self, headers, status: Optional[int] = None) -> None:
+        """Actualiza el estado a partir de las cabeceras de una respuesta."""
+        remaining = headers.get('X-RateLimit-Remaining')
+        if remaining is None:
+            return
+        with self._lock:
+            try:
+                self.remaining = int(remaining)
+                self.limit = int(headers.get('X-RateLimit-Limit', self.limit or 0)) or self.limit
+                reset = headers.get('X-RateLimit-Reset')
+                if reset:
+                    self.reset_at = float(reset)
+            except ValueError:
+                return
+            retry_after = headers.get('Retry-After')
+            if retry_after and status in (403, 429):
+                try:
+                    self.blocked_until = max(self.blocked_until, self.clock() + float(retry_after))
+                except ValueError:
+                    pass
+
+    def response_hook(self, response, *args, **kwargs):
+        """Hook de `requests` para alimentar el planificador."""
+        self.observe(response.headers, response.status_code)
+        return response
+
+    def budget(self) -> Optional[int]:
+        """Peticiones disponibles antes de la reserva (None si aún no se sabe)."""
+        if self.remaining is None:
+            return None
+        return max(self.remaining - self.reserve, 0)
+
+    # -- ritmo -----------------------------------------------------------
+
+    def _pacing(self, now: float) -> Tuple[float, float]:
+        """(primer instante permitido, separación hasta la siguiente llamada); con el lock tomado."""
+        if self.blocked_until > now:
+            return self.blocked_until, 0.0
+        if self.remaining is None or self.reset_at is None:
+            return now, 0.0
+        window = max(self.reset_at - now, 0.0)
+        if self.remaining <= self.reserve:
+            # Presupuesto agotado: esperar al reset
+            return now + (window + 1 if window else 0.0), 0.0
+        if self.limit and self.remaining < self.limit * 0.1:
+            # Quedan pocas: repartirlas de forma uniforme hasta el reset
+            return now, window / (self.remaining - self.reserve)
+        return now, 0.0
+
+    def acquire(self) -> None:
+        """Espera lo necesario antes de lanzar la siguiente llamada.
+
+        Cada llamada reserva su turno bajo el lock, de modo que los hilos del
+        pool quedan escalonados en lugar de despertar todos a la vez.
+        """
+        with self._lock:
+            now = self.clock()
+            earliest, interval = self._pacing(now)
+            slot = max(earliest, self._next_allowed)
+            delay = slot - now
+            if delay > self.max_wait:
+                raise RuntimeError(f"Rate limit de GitHub agotado; reset en {delay:.0f}s")
+            self._next_allowed = slot + interval
+        if delay > 0:
+            self.sleep(delay)
+
+    # -- reintentos ------------------------------------------------------
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Espera antes de reintentar `error`, o None si no es transitorio."""
+        status = getattr(error, 'status', None)
+        headers = getattr(error, 'headers', None) or {}
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            status = 'network'
+        elif isinstance(error, requests.HTTPError) and error.response is not None:
+            status = error.response.status_code
+            headers = error.response.headers
+
+        lowered = {str(k).lower(): v for k, v in headers.items()}
+        rate_limited = (
+            status in (403, 429) and (
+                lowered.get('x-ratelimit-remaining') == '0'
+                or 'retry-after' in lowered
+                or 'rate limit' in str(error).lower()
+            )
+        )
+        if not (rate_limited or status == 'network' or status in RETRYABLE_STATUS):
+            return None
+
+        if 'retry-after' in lowered:
+            try:
+                return float(lowered['retry-after'])
+            except ValueError:
+                pass
+        if lowered.get('x-ratelimit-remaining') == '0' and lowered.get('x-ratelimit-reset'):
+            return max(float(lowered['x-ratelimit-reset']) - self.clock(), 0) + 1
+        # Backoff exponencial con jitter ("equal jitter")
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def call(self, fn: Callable[[], T], description: str = '') -> T:
+        """Ejecuta `fn` respetando el rate limit y reintentando fallos transitorios."""
+        attempt = 0
+        while True:
+            self.acquire()
+            try:
+                return fn()
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None or attempt >= self.max_retries or delay > self.max_wait:
+                    raise
+                attempt += 1
+                with self._lock:
+                    self.retries += 1
+                metrics.incr('github.retries')
+                print(f"      🔁 Reintento {attempt}/{self.max_retries} {description} en {delay:.1f}s ({e})")
+                self.sleep(delay)
@@ -0,0 +1,266 @@
+"""
+Mantenimiento incremental del índice histórico (README y archivo mensual).
+Un manifiesto pequeño guarda qué artefactos existen de cada fecha; cada
+ejecución solo inserta la fila nueva y reescribe los ficheros de forma atómica.
+"""
+import os
+import re
+import json
+from typing import Dict, List, Optional
+
+import outputs
+
+DEFAULT_MANIFEST_PATH = 'daily/.index/manifest.json'
+ARCHIVE_DIR = 'daily/archive'
+README_PATHS = ('README.md', 'README.es.md')
+README_ROWS = 30
+
+# Artefactos de cada día y su ruta relativa a la raíz del repo
+ARTIFACTS = {
+    'research': 'daily/research/{date}.md',
+    'docs': 'daily/docs/{date}.md',
+    'github': 'daily/github/{date}.md',
+    'summary': 'daily/{date}.md',
+}
+
+# Cabeceras de sección reconocidas y nombre de columna -> artefacto
+SECTION_HEADINGS = ('## 📅 Histórico', '## 📅 Historical Archive')
+COLUMN_ARTIFACTS = {
+    'Research': 'research',
+    'Docs': 'docs',
+    'GitHub': 'github',
+    'Resumen': 'summary',
+    'Summary': 'summary',
+}
+DEFAULT_COLUMNS = ['Fecha', 'Research', 'Docs', 'GitHub', 'Resumen']
+ARCHIVE_LINK = {
+    'README.md': '➡️ [Monthly archive](./daily/archive/README.md)',
+    'README.es.md': '➡️ [Archivo mensual](./daily/archive/README.md)',
+}
+
+_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+def atomic_write(path: str, content: str) -> None:
+    """Escribe `content` de forma atómica (y solo si cambió, ver `outputs`)."""
+    outputs.write_stream(path, [content])
+
+
+def artifacts_on_disk(date: str) -> List[str]:
+    """Artefactos que existen para `date` (cuatro stat, coste constante)."""
+    return [name for name, pattern in ARTIFACTS.items() if os.path.exists(pattern.format(date=date))]
+
+
+class IndexManifest:
+    """Manifiesto `{fecha: [artefactos]}` del histórico."""
+
+    def __init__(self, path: str = DEFAULT_MANIFEST_PATH):
+        self.path = path
+        self.dates: Dict[str, List[str]] = {}
+        self.dirty = False
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.dates = json.load(f).get('dates', {})
+        else:
+            self.rebuild()
+
+    def rebuild(self) -> None:
+        """Reconstrucción completa (solo la primera vez o a petición)."""
+        dates: Dict[str, List[str]] = {}
+        for name, pattern in ARTIFACTS.items():
+            directory = os.path.dirname(pattern)
+            if not os.path.isdir(directory):
+                continue
+            for filename in os.listdir(directory):
+                date = filename[:-3]
+                if filename.endswith('.md') and _DATE_RE.match(date):
+                    dates.setdefault(date, []).append(name)
+        self.dates = {d: [a for a in ARTIFACTS if a in names] for d, names in dates.items()}
+        self.dirty = True
+
+    def update(self, date: str, artifacts: List[str]) -> bool:
+        """Registra los artefactos de una fecha. Devuelve True si cambió algo."""
+        artifacts = [a for a in ARTIFACTS if a in artifacts]
+        if not artifacts or self.dates.get(date) == artifacts:
+            return False
+        self.dates[date] = artifacts
+        self.dirty = True
+        return True
+
+    def latest(self, count: int) -> List[str]:
+        return sorted(self.dates, reverse=True)[:count]
+
+    def month(self, month: str) -> List[str]:
+        return sorted((d for d in self.dates if d.startswith(month)), reverse=True)
+
+    def months(self) -> List[str]:
+        return sorted({d[:7] for d in self.dates}, reverse=True)
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        atomic_write(self.path, json.dumps({'dates': dict(sorted(self.dates.items()))},
+                                           ensure_ascii=False, separators=(',', ':')) + '\n')
+        self.dirty = False
+
+
+def _cell(column: str, date: str, artifacts: List[str], prefix: str) -> str:
+    artifact = COLUMN_ARTIFACTS.get(column)
+    if artifact is None:
+        return date
+    if artifact not in artifacts:
+        return '—'
+    return f"[{column}]({prefix}{ARTIFACTS[artifact].format(date=date)[len('daily/'):]})"
+
+
+def format_row(columns: List[str], date: str, artifacts: List[str], prefix: str = './daily/') -> str:
+    """Fila de la tabla; enlaza solo los artefactos que existen."""
+    return '| ' + ' | '.join(_cell(c, date, artifacts, prefix) for c in columns) + ' |'
+
+
+def _parse_columns(header_line: str) -> List[str]:
+    return [c.strip() for c in header_line.strip().strip('|').split('|')]
+
+
+def update_readme(path: str, manifest: IndexManifest, dates: List[str], rows: int = README_ROWS) -> bool:
+    """Inserta/reemplaza las filas de `dates` en la sección histórica de un README.
+
+    Solo toca la sección: las filas existentes se conservan (con las columnas
+    que ya tenga la tabla) y se recorta a `rows` entradas. Devuelve True si el
+    fichero cambió.
+    """
+    if not os.path.exists(path):
+        return False
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    index_start = -1
+    for heading in SECTION_HEADINGS:
+        index_start = content.find(heading)
+        if index_start != -1:
+            break
+    if index_start == -1:
+        return False
+    index_end = content.find('\n## ', index_start + 1)
+    index_end = len(content) if index_end == -1 else index_end + 1
+
+    section = content[index_start:index_end].split('\n')
+    heading_line = section[0]
+    table = [line for line in section if line.startswith('|')]
+    columns = _parse_columns(table[0]) if table else DEFAULT_COLUMNS
+
+    archive_link = ARCHIVE_LINK.get(os.path.basename(path), ARCHIVE_LINK['README.es.md'])
+    # Comentarios u otras líneas propias de la sección se mantienen
+    extra = [line for line in section[1:] if line.strip() and not line.startswith('|') and line != archive_link]
+
+    existing = {}
+    for line in table[2:]:
+        cells = _parse_columns(line)
+        if cells and _DATE_RE.match(cells[0]):
+            existing[cells[0]] = line
+    for date in dates:
+        if date in manifest.dates:
+            existing[date] = format_row(columns, date, manifest.dates[date])
+
+    body = [existing[d] for d in sorted(existing, reverse=True)[:rows]]
+    new_section = [
+        heading_line,
+        '',
+        '| ' + ' | '.join(columns) + ' |',
+        '|' + '|'.join('-' * (len(c) + 2) for c in columns) + '|',
+        *body,
+        *extra,
+        '',
+        archive_link,
+        '',
+        '',
+    ]
+    new_content = content[:index_start] + '\n'.join(new_section) + content[index_end:].lstrip('\n')
+    if new_content == content:
+        return False
+    atomic_write(path, new_content)
+    return True
+
+
+def write_month_page(manifest: IndexManifest, month: str, archive_dir: str = ARCHIVE_DIR) -> str:
+    """Página de archivo de un mes, con navegación al mes anterior y siguiente."""
+    months = manifest.months()
+    position = months.index(month)
+    newer = months[position - 1] if position > 0 else None
+    older = months[position + 1] if position + 1 < len(months) else None
+
+    lines = [f"# Histórico - {month}", ""]
+    nav = []
+    if older:
+        nav.append(f"[← {older}](./{older}.md)")
+    nav.append("[Índice](./README.md)")
+    if newer:
+        nav.append(f"[{newer} →](./{newer}.md)")
+    lines.extend([' | '.join(nav), "", "| " + " | ".join(DEFAULT_COLUMNS) + " |",
+                  "|" + "|".join('-' * (len(c) + 2) for c in DEFAULT_COLUMNS) + "|"])
+    for date in manifest.month(month):
+        lines.append(format_row(DEFAULT_COLUMNS, date, manifest.dates[date], prefix='../'))
+    lines.extend(["", "*Generado automáticamente*", ""])
+    path = os.path.join(archive_dir, f"{month}.md")
+    atomic_write(path, '\n'.join(lines))
+    return path
+
+
+def write_archive_index(manifest: IndexManifest, archive_dir: str = ARCHIVE_DIR, per_page: int = 24) -> None:
+    """Índice de meses del archivo, paginado de `per_page` meses por página."""
+    months = manifest.months()
+    pages = [months[i:i + per_page] for i in range(0, len(months), per_page)] or [[]]
+    for number, page in enumerate(pages, start=1):
+        name = 'README.md' if number == 1 else f"page-{number}.md"
+        lines = ["# Archivo mensual", ""]
+        for month in page:
+            lines.append(f"- [{month}](./{month}.md) ({len(manifest.month(month))} días)")
+        nav = []
+        if number > 1:
+            nav.append(f"[← Más recientes](./{'README.md' if number == 2 else f'page-{number - 1}.md'})")
+        if number < len(pages):
+            nav.append(f"[Anteriores →](./page-{number + 1}.md)")
+        if nav:
+            lines.extend(["", ' | '.join(nav)])
+        lines.extend(["", "*Generado automáticamente*", ""])
+        atomic_write(os.path.join(archive_dir, name), '\n'.join(lines))
+
+
+def update_history_index(date: Optional[str] = None, manifest_path: str = DEFAULT_MANIFEST_PATH,
+                         readme_paths=README_PATHS) -> Optional[str]:
+    """Actualiza manifiesto, READMEs y página del mes para `date` (por defecto la última fecha).
+
+    El trabajo por ejecución es constante: una fila por README, la página del
+    mes afectado y, solo si aparece un mes nuevo, el índice de meses.
+    """
+    manifest = IndexManifest(manifest_path)
+    rebuilt = manifest.dirty
+    if date is None:
+        latest = manifest.latest(1)
+        if not latest:
+            return None
+        date = latest[0]
+    known_months = set(manifest.months())
+    manifest.update(date, artifacts_on_disk(date))
+    if date not in manifest.dates:
+        return None
+
+    for path in readme_paths:
+        update_readme(path, manifest, manifest.latest(README_ROWS) if rebuilt else [date])
+
+    month = date[:7]
+    if rebuilt:
+        for each in manifest.months():
+            write_month_page(manifest, each)
+        write_archive_index(manifest)
+    else:
+        write_month_page(manifest, month)
+        if month not in known_months:
+            # Cambia la navegación del mes anterior y el índice de meses
+            months = manifest.months()
+            position = months.index(month)
+            if position + 1 < len(months):
+                write_month_page(manifest, months[position + 1])
+            write_archive_index(manifest)
+    manifest.save()
+    return date
@@ -0,0 +1,207 @@
+"""
+Registros tipados de los items del pipeline (papers, repos, commits, releases).
+Las fechas se parsean una vez al crearlos y la utilidad de cada repo se
+calcula al ingerirlo; los renderers los usan igual que los dicts de antes
+(`item['campo']`, `item.get('campo')`), así que ambos formatos funcionan.
+"""
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+IMPORTANT_KEYWORDS = ('feat', 'feature', 'add', 'implement', 'breaking', 'major')
+POPULAR_LANGUAGES = ('python', 'javascript', 'typescript')
+
+
+def parse_date(value: Optional[str]) -> Optional[datetime]:
+    """Parsea una fecha en cualquier formato razonable (None si no se puede)."""
+    if not value:
+        return None
+    # dateutil solo se importa al parsear la primera fecha
+    from dateutil import parser as date_parser
+    try:
+        return date_parser.parse(value)
+    except (ValueError, OverflowError, TypeError):
+        return None
+
+
+class Record:
+    """Base de los registros: acceso tipo dict para los renderers."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def __contains__(self, key: str) -> bool:
+        return hasattr(self, key)
+
+    def to_dict(self) -> Dict:
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.name != 'sort_date'}
+
+
+@dataclass(slots=True)
+class Paper(Record):
+    title: str
+    url: str
+    description: str = ''
+    date: str = ''
+    category: str = ''
+    source: str = ''
+    # Detalles de la página del paper (ver `research.enrich_papers`)
+    abstract: str = ''
+    authors: List[str] = field(default_factory=list)
+    published: str = ''
+    # Fecha parseada para ordenar (datetime.min si no hay)
+    sort_date: datetime = field(default=datetime.min, repr=False, compare=False)
+
+    @classmethod
+    def from_dict(cls, item: Dict) -> 'Paper':
+        date = item.get('date') or ''
+        published = item.get('published') or ''
+        parsed = parse_date(date) or parse_date(published)
+        return cls(title=item.get('title', ''), url=item.get('url', ''),
+                   description=item.get('description') or '', date=date,
+                   category=item.get('category') or '', source=item.get('source') or '',
+                   abstract=item.get('abstract') or '', authors=list(item.get('authors') or []),
+                   published=published,
+                   sort_date=parsed.replace(tzinfo=None) if parsed else datetime.min)
+
+
+@dataclass(slots=True)
+class Commit(Record):
+    message: str
+    url: str
+    author: Optional[str] = 'Unknown'
+    date: str = ''
+    parsed_date: Optional[datetime] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_dict(cls, item: Dict) -> 'Commit':
+        date = item.get('date') or ''
+        return cls(message=item.get('message', ''), url=item['url'], author=item.get('author', 'Unknown'),
+                   date=date, parsed_date=parse_date(date))
+
+
+@dataclass(slots=True)
+class Release(Record):
+    tag: str
+    url: str
+    name: Optional[str] = None
+    body: Optional[str] = ''
+
+    @classmethod
+    def from_dict(cls, item: Dict) -> 'Release':
+        return cls(tag=item['tag'], url=item['url'], name=item.get('name'), body=item.get('body', ''))
+
+
+@dataclass(slots=True)
+class RepoUpdate(Record):
+    name: str
+    url: str
+    description: Optional[str] = None
+    stars: int = 0
+    language: Optional[str] = 'Unknown'
+    updated_at: str = ''
+    commits: List[Commit] = field(default_factory=list)
+    releases: List[Release] = field(default_factory=list)
+    org: Optional[str] = None
+    # Utilidad precalculada al ingerir (ver `calculate_utility`)
+    score: int = 3
+    reasons: List[str] = field(default_factory=list)
+    parsed_updated_at: Optional[datetime] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_dict(cls, item: Dict) -> 'RepoUpdate':
+        record = cls(
+            name=item['name'], url=item['url'],
+            description=item.get('description'),
+            stars=item.get('stars', 0), language=item.get('language', 'Unknown'),
+            updated_at=item.get('updated_at') or '',
+            commits=[Commit.from_dict(c) for c in item.get('commits', [])],
+            releases=[Release.from_dict(r) for r in item.get('releases', [])],
+            org=item.get('org'),
+            parsed_updated_at=parse_date(item.get('updated_at')),
+        )
+        record.score, record.reasons = _compute_utility(record)
+        return record
+
+    @property
+    def utility(self) -> Tuple[int, List[str]]:
+        return self.score, self.reasons
+
+    def to_dict(self) -> Dict:
+        data = {f.name: getattr(self, f.name) for f in fields(self)
+                if f.name not in ('score', 'reasons', 'parsed_updated_at')}
+        data['commits'] = [c.to_dict() for c in self.commits]
+        data['releases'] = [r.to_dict() for r in self.releases]
+        if self.org is None:
+            del data['org']
+        return data
+
+
+def _compute_utility(repo_update) -> Tuple[int, List[str]]:
+    score = 3
+    reasons = []
+
+    stars = repo_update.get('stars', 0)
+    if stars > 10000:
+        score += 1
+        reasons.append("Repo muy popular")
+    elif stars < 100:
+        score -= 1
+        reasons.append("Repo menos conocido")
+
+    release = repo_update.get('release')
+    commits = repo_update.get('commits', [])
+
+    if release:
+        score += 1
+        reasons.append("Nueva release disponible")
+
+        tag = release.get('tag', '')
+        if tag.startswith('v') and ('.0.' in tag or tag.endswith('.0')):
+            score += 1
+            reasons.append("Posible versión mayor")
+
+    if commits:
+        for commit in commits[:2]:
+            msg = commit.get('message', '').lower()
+            if any(kw in msg for kw in IMPORTANT_KEYWORDS):
+                score += 1
+                reasons.append("Nuevas funcionalidades")
+                break
+
+    lang = repo_update.get('language', '').lower()
+    if lang in POPULAR_LANGUAGES:
+        reasons.append("Lenguaje popular")
+
+    score = max(1, min(5, score))
+
+    return score, reasons
+
+
+def calculate_utility(repo_update) -> Tuple[int, List[str]]:
+    """Calcula utilidad del cambio (score 1-5, descripción).
+
+    Con un `RepoUpdate` devuelve el valor precalculado al ingerirlo.
+    """
+    if isinstance(repo_update, RepoUpdate):
+        return repo_update.utility
+    return _compute_utility(repo_update)
+
+
+def to_papers(items: List[Dict]) -> List:
+    """Convierte los papers a `Paper`; los placeholders de error siguen siendo dicts."""
+    return [item if isinstance(item, Record) or item.get('error') else Paper.from_dict(item) for item in items]
+
+
+def to_repo_updates(items: List[Dict]) -> List:
+    """Convierte los repos a `RepoUpdate`; los placeholders de error siguen siendo dicts."""
+    return [item if isinstance(item, Record) or item.get('error') else RepoUpdate.from_dict(item)
+            for item in items]
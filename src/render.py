@@ -0,0 +1,483 @@
+"""
+Motor de renderizado de las salidas diarias.
+Cada tipo de salida es un generador de líneas construido con plantillas
+precompiladas y fragmentos comunes (cabecera y pie); `write_stream` escribe
+las líneas al fichero solo si su contenido cambió (ver `outputs`).
+Además de markdown, los mismos registros se pueden emitir como JSON, HTML o RSS.
+"""
+import re
+import json
+from datetime import datetime, timezone
+from html import escape
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import outputs
+from records import Record, calculate_utility
+
+# Línea de fecha de generación de la cabecera (ver `STAMP`)
+FECHA_RE = re.compile(r'^\*\*Fecha(?: de generación)?\*\*: (\d{4}-\d{2}-\d{2} \d{2}:\d{2}) UTC$', re.MULTILINE)
+
+# -- plantillas precompiladas (métodos format ya enlazados) ---------------
+
+TITLE = "# {title} - {date}".format
+STAMP = "**{label}**: {stamp:%Y-%m-%d %H:%M} UTC".format
+SOURCE = "*Fuente*: {links}".format
+SOURCE_LINK = "[{label}]({url})".format
+ERROR = "⚠️ **Error**: {message}".format
+FOOTER = "*Generado automáticamente*"
+RULE = "---"
+
+PAPERS_HEADING = "## Papers encontrados: {count}".format
+PAPER_TITLE = "### [{title}]({url})".format
+PAPER_DATE = "**Fecha**: {date}".format
+PAPER_AUTHORS = "**Autores**: {authors}".format
+PAPER_ABSTRACT = "> {abstract}".format
+PAPER_LINK = "**Link**: [{url}]({url})".format
+
+DOCS_HEADING = "## Versiones recientes: {count}".format
+DOCS_VERSION = "### v{version}".format
+DOCS_CHANGE = "- {change}".format
+DOCS_LINK = "[Ver en GitHub]({url}#v{anchor})".format
+DOCS_COMMIT = "- `{sha}` {message} ({day})".format
+DOCS_INFO = "ℹ️ {message}".format
+
+REPOS_HEADING = "## Repositorios con actividad reciente: {count}".format
+REPO_TITLE = "### `{name}`".format
+REPO_DESCRIPTION = "*{description}*".format
+REPO_STATS = "⭐ {stars} stars | 📝 {language}".format
+REPO_COMMITS = "**Commits ({count}):**".format
+REPO_COMMIT = "- `{author}`: [{message}]({url})".format
+REPO_RELEASES = "**Releases ({count}):**".format
+REPO_RELEASE = "- [{tag}]({url}) - {name}".format
+REPO_RELEASE_BODY = "  > {body}...".format
+REPO_LEGACY_RELEASE = "**Release**: [{tag}]({url})".format
+REPO_IMPORTANCE = "**Importancia**: {stars} ({score}/5)".format
+REPO_REASONS = "*Por qué: {reasons}*".format
+REPO_LINK = "[Ver en GitHub →]({url})".format
+
+SUMMARY_RESEARCH = "- **🔬 Research**: [{count} papers](./research/{date}.md)".format
+SUMMARY_GITHUB = "- **💻 GitHub**: [{count} repos con actividad](./github/{date}.md)".format
+ROLLUP_PERIOD = "*Periodo*: {start} → {end} ({days} días con datos)".format
+ROLLUP_TOTAL_PAPERS = "- **🔬 Papers nuevos**: {count}".format
+ROLLUP_TOTAL_COMMITS = "- **💻 Commits nuevos**: {count} en {repos} repos".format
+ROLLUP_TOTAL_RELEASES = "- **🏷️ Releases**: {count} en {repos} repos".format
+ROLLUP_ACTIVE = "{rank}. `{repo}` - {commits} commits, {releases} releases".format
+ROLLUP_ROW = "| {name} | {count} |".format
+ROLLUP_CADENCE = "- `{repo}`: {count} releases ({tags})".format
+ROLLUP_CADENCE_EVERY = "- `{repo}`: {count} releases ({tags}), una cada {every:.1f} días".format
+ROLLUP_EMPTY = "Sin datos en este periodo."
+
+SUMMARY_LINKS = (
+    "## 🔗 Links Rápidos",
+    "",
+    "- [Anthropic Research](https://www.anthropic.com/research)",
+    "- [Claude Docs](https://docs.anthropic.com)",
+    "- [Anthropic GitHub](https://github.com/anthropics)",
+    "",
+)
+
+
+# -- fragmentos comunes ----------------------------------------------------
+
+def header(title: str, date_str: str, generated_at: Optional[datetime],
+           label: str = 'Fecha') -> Iterator[str]:
+    yield TITLE(title=title, date=date_str)
+    yield ""
+    yield STAMP(label=label, stamp=generated_at or datetime.now())
+    yield ""
+    yield RULE
+    yield ""
+
+
+def footer(source_label: Optional[str] = None, source_url: Optional[str] = None,
+           sources: Sequence[Tuple[str, str]] = ()) -> Iterator[str]:
+    """Pie con la fuente (o varias fuentes como pares etiqueta/URL)."""
+    if source_label:
+        sources = [(source_label, source_url)]
+    yield RULE
+    yield ""
+    if sources:
+        yield SOURCE(links=', '.join(SOURCE_LINK(label=label, url=url) for label, url in sources))
+        yield ""
+    yield FOOTER
+
+
+def _has_error(items: List) -> bool:
+    return bool(items) and bool(items[0].get('error'))
+
+
+def repo_orgs(repos: List) -> List[str]:
+    """Organizaciones presentes en los repos, en orden de aparición."""
+    return list(dict.fromkeys(repo.get('org') for repo in repos if repo.get('org')))
+
+
+def repo_name(repo, qualified: bool) -> str:
+    """`org/nombre` si hay varias organizaciones (los nombres pueden repetirse), si no el nombre."""
+    return f"{repo['org']}/{repo['name']}" if qualified and repo.get('org') else repo['name']
+
+
+# -- markdown ------------------------------------------------------------
+
+def research_markdown(date_str: str, papers: List, generated_at: Optional[datetime] = None) -> Iterator[str]:
+    yield from header("Research", date_str, generated_at)
+
+    if papers and not _has_error(papers):
+        yield PAPERS_HEADING(count=len(papers))
+        yield ""
+        for paper in papers[:10]:
+            yield PAPER_TITLE(title=paper['title'], url=paper['url'])
+            yield ""
+            if paper.get('date'):
+                yield PAPER_DATE(date=paper['date'])
+                yield ""
+            if paper.get('authors'):
+                yield PAPER_AUTHORS(authors=', '.join(paper['authors']))
+                yield ""
+            if paper.get('description'):
+                yield paper['description']
+                yield ""
+            if paper.get('abstract'):
+                yield PAPER_ABSTRACT(abstract=paper['abstract'])
+                yield ""
+            yield PAPER_LINK(url=paper['url'])
+            yield ""
+            yield RULE
+            yield ""
+    elif papers:
+        yield ERROR(message=papers[0].get('message', 'No disponible'))
+        yield ""
+    else:
+        yield "No se encontraron nuevos papers de research."
+        yield ""
+
+    yield from footer("anthropic.com/research", "https://www.anthropic.com/research")
+
+
+def docs_markdown(date_str: str, docs: List, generated_at: Optional[datetime] = None) -> Iterator[str]:
+    yield from header("Changelog Claude Code", date_str, generated_at)
+
+    # Solo entradas de versión (no metadatos como commits recientes)
+    version_entries = [d for d in docs if d.get('version')]
+    commit_info = next((d for d in docs if d.get('recent_commits')), None)
+
+    if version_entries:
+        yield DOCS_HEADING(count=len(version_entries))
+        yield ""
+        for entry in version_entries:
+            version = entry['version']
+            yield DOCS_VERSION(version=version)
+            yield ""
+            yield "**Cambios:**"
+            yield ""
+            for change in entry.get('changes', [])[:10]:  # Max 10 cambios por versión
+                yield DOCS_CHANGE(change=change)
+            yield ""
+            yield DOCS_LINK(url=entry['url'], anchor=version.replace('.', ''))
+            yield ""
+            yield RULE
+            yield ""
+
+        if commit_info and commit_info.get('recent_commits'):
+            yield "### Commits recientes al CHANGELOG"
+            yield ""
+            for commit in commit_info['recent_commits'][:5]:
+                yield DOCS_COMMIT(sha=commit['sha'], message=commit['message'], day=commit['date'][:10])
+            yield ""
+    elif docs and docs[0].get('info'):
+        yield DOCS_INFO(message=docs[0].get('message', 'Sin novedades'))
+        yield ""
+    elif _has_error(docs):
+        yield ERROR(message=docs[0].get('message', 'No disponible'))
+        yield ""
+    else:
+        yield "No se encontraron actualizaciones de documentación."
+        yield ""
+
+    yield from footer("github.com/anthropics/claude-code/CHANGELOG.md",
+                      "https://github.com/anthropics/claude-code/blob/main/CHANGELOG.md")
+
+
+def _repo_markdown(repo, qualified: bool = False) -> Iterator[str]:
+    yield REPO_TITLE(name=repo_name(repo, qualified))
+    yield ""
+    if repo.get('description'):
+        yield REPO_DESCRIPTION(description=repo['description'])
+        yield ""
+    yield REPO_STATS(stars=repo.get('stars', 0), language=repo.get('language', 'Unknown'))
+    yield ""
+
+    commits = repo.get('commits')
+    if commits:
+        yield REPO_COMMITS(count=len(commits))
+        yield ""
+        for commit in commits[:5]:
+            message = commit.get('message', '')
+            short = message[:80] + "..." if len(message) > 80 else message
+            yield REPO_COMMIT(author=commit.get('author', 'Unknown'), message=short, url=commit['url'])
+        yield ""
+
+    # Releases (puede ser múltiple)
+    releases = repo.get('releases', [])
+    if releases:
+        yield REPO_RELEASES(count=len(releases))
+        yield ""
+        for release in releases[:2]:
+            yield REPO_RELEASE(tag=release['tag'], url=release['url'], name=release['name'])
+            if release.get('body'):
+                yield REPO_RELEASE_BODY(body=release['body'][:150].replace('\n', ' '))
+        yield ""
+    elif repo.get('release'):  # Backward compatibility
+        release = repo['release']
+        yield REPO_LEGACY_RELEASE(tag=release['tag'], url=release['url'])
+        yield ""
+
+    score, reasons = calculate_utility(repo)
+    yield REPO_IMPORTANCE(stars="⭐" * score, score=score)
+    if reasons:
+        yield REPO_REASONS(reasons=', '.join(reasons))
+    yield ""
+
+    yield REPO_LINK(url=repo['url'])
+    yield ""
+    yield RULE
+    yield ""
+
+
+def github_markdown(date_str: str, repos: List, generated_at: Optional[datetime] = None,
+                    orgs: Optional[List[str]] = None) -> Iterator[str]:
+    """Repos con actividad; `orgs` son las organizaciones configuradas (por defecto las de los repos)."""
+    yield from header("GitHub", date_str, generated_at)
+    orgs = list(dict.fromkeys([*(orgs or []), *repo_orgs([r for r in repos if not r.get('error')])]))
+    qualified = len(orgs) > 1
+
+    if repos and not _has_error(repos):
+        yield REPOS_HEADING(count=len(repos))
+        yield ""
+        for repo in repos[:15]:
+            yield from _repo_markdown(repo, qualified)
+    elif repos:
+        yield ERROR(message=repos[0].get('message', 'No disponible'))
+        yield ""
+    else:
+        yield "No se encontró actividad reciente en los repositorios."
+        yield ""
+
+    yield from footer(sources=[(f"github.com/{org}", f"https://github.com/{org}") for org in orgs or ['anthropics']])
+
+
+def summary_markdown(date_str: str, research: List, docs: List, github: List,
+                     generated_at: Optional[datetime] = None) -> Iterator[str]:
+    yield from header("Resumen General", date_str, generated_at, label='Fecha de generación')
+    yield "## 📊 Estadísticas del Día"
+    yield ""
+    yield SUMMARY_RESEARCH(count=sum(1 for r in research if not r.get('error')), date=date_str)
+    yield SUMMARY_GITHUB(count=sum(1 for g in github if not g.get('error')), date=date_str)
+    yield ""
+    yield RULE
+    yield ""
+    yield from SUMMARY_LINKS
+    yield from footer()
+
+
+def rollup_markdown(title: str, period: str, summary: Dict,
+                    generated_at: Optional[datetime] = None) -> Iterator[str]:
+    """Informe de un periodo a partir de `rollups.summarize`."""
+    yield from header(title, period, generated_at, label='Fecha de generación')
+    yield ROLLUP_PERIOD(start=summary['start'], end=summary['end'], days=summary['days'])
+    yield ""
+    yield "## 📊 Totales"
+    yield ""
+    yield ROLLUP_TOTAL_PAPERS(count=sum(count for _, count in summary['papers']))
+    yield ROLLUP_TOTAL_COMMITS(count=sum(count for _, count in summary['commits']), repos=len(summary['commits']))
+    yield ROLLUP_TOTAL_RELEASES(count=sum(len(r['tags']) for r in summary['releases']),
+                                repos=len(summary['releases']))
+    yield ""
+
+    yield "## 🔥 Repos más activos"
+    yield ""
+    for rank, (repo, commits, releases) in enumerate(summary['active'][:10], start=1):
+        yield ROLLUP_ACTIVE(rank=rank, repo=repo, commits=commits, releases=releases)
+    if not summary['active']:
+        yield ROLLUP_EMPTY
+    yield ""
+
+    yield "## 📝 Commits por repo"
+    yield ""
+    if summary['commits']:
+        yield "| Repo | Commits |"
+        yield "|------|---------|"
+        for repo, count in summary['commits']:
+            yield ROLLUP_ROW(name=f"`{repo}`", count=count)
+    else:
+        yield ROLLUP_EMPTY
+    yield ""
+
+    yield "## 🏷️ Cadencia de releases"
+    yield ""
+    for release in summary['releases']:
+        fields = dict(repo=release['repo'], count=len(release['tags']), tags=', '.join(release['tags']))
+        if release['every_days'] is None:
+            yield ROLLUP_CADENCE(**fields)
+        else:
+            yield ROLLUP_CADENCE_EVERY(every=release['every_days'], **fields)
+    if not summary['releases']:
+        yield ROLLUP_EMPTY
+    yield ""
+
+    yield "## 🔬 Papers nuevos por categoría"
+    yield ""
+    if summary['papers']:
+        yield "| Categoría | Papers |"
+        yield "|-----------|--------|"
+        for category, count in summary['papers']:
+            yield ROLLUP_ROW(name=category, count=count)
+    else:
+        yield ROLLUP_EMPTY
+    yield ""
+    yield from footer()
+
+
+# -- otros formatos --------------------------------------------------------
+
+def _plain(item) -> Dict:
+    if isinstance(item, Record):
+        return item.to_dict()
+    return item
+
+
+def json_document(date_str: str, sections: Dict[str, List],
+                  generated_at: Optional[datetime] = None) -> Iterator[str]:
+    """Documento JSON con las secciones del día, emitido item a item."""
+    stamp = (generated_at or datetime.now()).strftime('%Y-%m-%dT%H:%M:%SZ')
+    yield '{"date": ' + json.dumps(date_str) + ', "generated_at": ' + json.dumps(stamp)
+    for name, items in sections.items():
+        yield ', ' + json.dumps(name) + ': ['
+        for index, item in enumerate(items):
+            yield (', ' if index else '') + json.dumps(_plain(item), ensure_ascii=False, default=str)
+        yield ']'
+    yield '}\n'
+
+
+HTML_PAGE_START = ('<!DOCTYPE html>\n<html lang="es">\n<head>\n<meta charset="utf-8">\n'
+                   '<title>Resumen Anthropic - {date}</title>\n</head>\n<body>\n'
+                   '<h1>Resumen Anthropic - {date}</h1>\n<p>Fecha de generación: {stamp:%Y-%m-%d %H:%M} UTC</p>\n').format
+HTML_SECTION = '<h2>{title}</h2>\n<ul>\n'.format
+HTML_LINK_ITEM = '<li><a href="{url}">{text}</a>{extra}</li>\n'.format
+HTML_TEXT_ITEM = '<li>{text}</li>\n'.format
+HTML_SECTION_END = '</ul>\n'
+HTML_PAGE_END = '<p><em>Generado automáticamente</em></p>\n</body>\n</html>\n'
+HTML_TITLES = {'research': 'Research', 'docs': 'Changelog Claude Code', 'github': 'GitHub'}
+
+
+def _html_item(name: str, item, qualified: bool = False) -> str:
+    if item.get('error'):
+        return HTML_TEXT_ITEM(text=escape('⚠️ ' + item.get('message', 'No disponible')))
+    if name == 'research':
+        extra = f" — {escape(item['date'])}" if item.get('date') else ''
+        return HTML_LINK_ITEM(url=escape(item['url']), text=escape(item['title']), extra=extra)
+    if name == 'docs':
+        if not item.get('version'):
+            return ''
+        return HTML_LINK_ITEM(url=escape(item['url']), text=escape('v' + item['version']),
+                              extra=escape(': ' + '; '.join(item.get('changes', [])[:10])))
+    score, _ = calculate_utility(item)
+    extra = escape(f" — {len(item.get('commits', []))} commits, "
+                   f"{len(item.get('releases', []))} releases ({score}/5)")
+    return HTML_LINK_ITEM(url=escape(item['url']), text=escape(repo_name(item, qualified)), extra=extra)
+
+
+def html_document(date_str: str, sections: Dict[str, List],
+                  generated_at: Optional[datetime] = None) -> Iterator[str]:
+    """Página HTML sencilla con una lista por sección."""
+    yield HTML_PAGE_START(date=escape(date_str), stamp=generated_at or datetime.now())
+    for name, items in sections.items():
+        yield HTML_SECTION(title=escape(HTML_TITLES.get(name, name)))
+        qualified = name == 'github' and len(repo_orgs(items)) > 1
+        for item in items:
+            yield _html_item(name, item, qualified)
+        yield HTML_SECTION_END
+    yield HTML_PAGE_END
+
+
+RSS_START = ('<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0">\n<channel>\n'
+             '<title>Anthropic Daily Resume</title>\n<link>{link}</link>\n'
+             '<description>Research, changelog y actividad de GitHub de Anthropic</description>\n'
+             '<lastBuildDate>{built}</lastBuildDate>\n').format
+RSS_ITEM = ('<item>\n<title>{title}</title>\n<link>{link}</link>\n<guid>{link}</guid>\n'
+            '<pubDate>{published}</pubDate>\n<description>{description}</description>\n</item>\n').format
+RSS_END = '</channel>\n</rss>\n'
+
+
+def rss_feed(date_str: str, sections: Dict[str, List], generated_at: Optional[datetime] = None,
+             link: str = 'https://github.com/anthropics') -> Iterator[str]:
+    """Feed RSS 2.0 con los papers, versiones del CHANGELOG y releases/repos del día."""
+    from email.utils import format_datetime
+
+    built = (generated_at or datetime.now()).replace(tzinfo=timezone.utc)
+    published = format_datetime(built)
+    yield RSS_START(link=escape(link), built=published)
+    for name, items in sections.items():
+        qualified = name == 'github' and len(repo_orgs(items)) > 1
+        for item in items:
+            if item.get('error') or (name == 'docs' and not item.get('version')):
+                continue
+            if name == 'research':
+                title, description = item['title'], item.get('abstract') or item.get('description') or ''
+            elif name == 'docs':
+                title = f"Claude Code v{item['version']}"
+                description = '; '.join(item.get('changes', [])[:10])
+            else:
+                releases = item.get('releases', [])
+                repo = repo_name(item, qualified)
+                title = f"{repo}: {releases[0]['tag']}" if releases else repo
+                description = '; '.join(c.get('message', '') for c in item.get('commits', [])[:5])
+            yield RSS_ITEM(title=escape(title), link=escape(item['url']), published=published,
+                           description=escape(description))
+    yield RSS_END
+
+
+FORMATS = {
+    'json': (json_document, 'daily/json/{date}.json'),
+    'html': (html_document, 'daily/html/{date}.html'),
+    'rss': (rss_feed, 'daily/feed.xml'),
+}
+
+
+# -- escritura -------------------------------------------------------------
+
+def join_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Une las líneas con saltos de línea entre ellas (sin salto final)."""
+    first = True
+    for line in lines:
+        if first:
+            first = False
+            yield line
+        else:
+            yield '\n' + line
+
+
+def existing_timestamp(path: str) -> Optional[datetime]:
+    """Fecha de generación de un fichero ya existente (para re-renderizar igual)."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            match = FECHA_RE.search(f.read(512))
+    except OSError:
+        return None
+    return datetime.strptime(match.group(1), '%Y-%m-%d %H:%M') if match else None
+
+
+def write_stream(path: str, chunks: Iterable[str]) -> int:
+    """Escribe los fragmentos en `path` (ver `outputs.write_stream`).
+
+    Devuelve los caracteres escritos, 0 si el contenido no cambió. La memoria
+    no depende del tamaño del documento.
+    """
+    return outputs.write_stream(path, chunks)
+
+
+def write_markdown(path: str, lines: Iterable[str]) -> int:
+    return write_stream(path, join_lines(lines))
+
+
+def render_text(lines: Iterable[str]) -> str:
+    return ''.join(join_lines(lines))
@@ -0,0 +1,177 @@
+"""
+Extracción de la página de listado de Anthropic Research y de los detalles
+(resumen, autores, fecha) de la página de cada paper.
+"""
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from records import parse_date
+
+# lxml es bastante más rápido que html.parser; se usa si está instalado
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Solo interesan los <h2> (cabecera Publications) y los <a> (papers); el resto
+# del árbol no llega a construirse
+RESEARCH_STRAINER = SoupStrainer(['h2', 'a'])
+
+# De la página de un paper bastan los <meta>, el <time> y los párrafos
+DETAILS_STRAINER = SoupStrainer(['meta', 'time', 'p'])
+
+AUTHOR_META = ('author', 'citation_author', 'article:author')
+ABSTRACT_META = ('citation_abstract', 'description', 'og:description')
+DATE_META = ('article:published_time', 'citation_publication_date', 'citation_date')
+MAX_ABSTRACT = 500
+
+
+def parse_research_html(content, limit: int = 5, section: str = 'Publications',
+                        link_prefix: str = '/research/', base_url: str = 'https://www.anthropic.com',
+                        source: str = 'anthropic.com/research') -> Optional[List[Dict]]:
+    """Extrae los papers de la sección Publications del HTML de /research.
+
+    Recorre los enlaces posteriores a la cabecera en orden de documento y se
+    detiene tras examinar `limit` enlaces (los más recientes van primero).
+    Devuelve None si no existe la sección. Los parámetros permiten reutilizarlo
+    con otras páginas de listado con la misma estructura.
+    """
+    soup = BeautifulSoup(content, HTML_PARSER, parse_only=RESEARCH_STRAINER)
+    
+    # Buscar el header "Publications"
+    h2_publications = soup.find('h2', string=lambda x: x and section in x)
+    if not h2_publications:
+        return None
+    
+    papers = []
+    examined = 0
+    # Enlaces DESPUÉS del header Publications: son los artículos de la sección
+    for item in h2_publications.next_elements:
+        if examined >= limit:
+            break
+        if getattr(item, 'name', None) != 'a' or not (item.get('href') or '').startswith(link_prefix):
+            continue
+        examined += 1
+        
+        try:
+            href = item.get('href', '')
+            if not href or href == link_prefix:
+                continue
+            
+            link = f"{base_url}{href}"
+            
+            # El contenido del link tiene la fecha al inicio, luego spans con categoría y título
+            full_text = item.get_text(strip=True)
+            
+            # Extraer fecha del inicio (formato: "Feb 25, 2026")
+            date_match = re.search(r'^(\w{3,}\s+\d{1,2},?\s+\d{4})', full_text)
+            date_str = date_match.group(1) if date_match else ""
+            
+            # Los spans contienen: [0] = categoría, [1] = título
+            spans = item.find_all('span')
+            if len(spans) >= 2:
+                category = spans[0].get_text(strip=True)
+                title = spans[1].get_text(strip=True)
+            else:
+                continue
+            
+            if not title or len(title) < 5:
+                continue
+            
+            # Descripción es la categoría para dar contexto
+            description = f"Category: {category}" if category else ""
+            
+            papers.append({
+                'title': title,
+                'description': description,
+                'url': link,
+                'date': date_str,
+                'category': category,
+                'source': source
+            })
+            
+        except Exception as e:
+            print(f"Error procesando paper: {e}")
+            continue
+    
+    return papers
+
+
+def parse_paper_details(content) -> Dict:
+    """Resumen, autores y fecha de publicación (YYYY-MM-DD) de la página de un paper.
+
+    Usa los metadatos de la página (description, author, article:published_time
+    y sus variantes citation_*); si no hay resumen, el primer párrafo largo.
+    """
+    soup = BeautifulSoup(content, HTML_PARSER, parse_only=DETAILS_STRAINER)
+    meta: Dict[str, str] = {}
+    authors: List[str] = []
+    for tag in soup.find_all('meta'):
+        key = (tag.get('name') or tag.get('property') or '').lower()
+        value = (tag.get('content') or '').strip()
+        if not key or not value:
+            continue
+        if key in AUTHOR_META:
+            # "A, B and C" en una sola etiqueta o una etiqueta por autor
+            for name in re.split(r',\s*|\s+and\s+|\s*&\s*', value):
+                if name and name not in authors:
+                    authors.append(name)
+        else:
+            meta.setdefault(key, value)
+
+    abstract = next((meta[k] for k in ABSTRACT_META if meta.get(k)), '')
+    if not abstract:
+        abstract = next((text for text in (p.get_text(' ', strip=True) for p in soup.find_all('p'))
+                         if len(text) >= 80), '')
+    if len(abstract) > MAX_ABSTRACT:
+        abstract = abstract[:MAX_ABSTRACT].rsplit(' ', 1)[0] + '...'
+
+    published = next((meta[k] for k in DATE_META if meta.get(k)), '')
+    if not published:
+        time_tag = soup.find('time')
+        if time_tag is not None:
+            published = time_tag.get('datetime') or time_tag.get_text(strip=True)
+    parsed = parse_date(published)
+
+    return {
+        'abstract': abstract,
+        'authors': authors,
+        'published': parsed.strftime('%Y-%m-%d') if parsed else '',
+    }
+
+
+def enrich_papers(session, papers: List[Dict], store, max_workers: int = 8,
+                  timeout: float = 30) -> List[Dict]:
+    """Añade a cada paper los detalles de su página (`abstract`, `authors`, `published`).
+
+    Solo se descargan las páginas que no están en `store` (un `PaperDetailsStore`),
+    todas a la vez sobre la misma sesión, así que el coste es como mucho un
+    round-trip por ejecución. Un fallo deja el paper sin detalles y se
+    reintenta en la siguiente ejecución.
+    """
+    missing = list(dict.fromkeys(p['url'] for p in papers if p.get('url') and store.get(p['url']) is None))
+
+    def fetch(url: str) -> Optional[Dict]:
+        try:
+            response = session.get(url, timeout=timeout)
+            response.raise_for_status()
+            return parse_paper_details(response.content)
+        except Exception as e:
+            print(f"    ⚠️ No se pudieron obtener los detalles de {url}: {e}")
+            return None
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as pool:
+            for url, details in zip(missing, pool.map(fetch, missing)):
+                if details is not None:
+                    store.put(url, details)
+        store.flush()
+        print(f"  📄 Detalles de papers: {len(missing)} páginas nuevas, "
+              f"{sum(1 for p in papers if p.get('url')) - len(missing)} desde el estado")
+
+    return [dict(paper, **(store.get(paper['url']) or {})) if paper.get('url') else paper
+            for paper in papers]
@@ -0,0 +1,160 @@
+"""
+Informes semanales y mensuales a partir de agregados diarios.
+Cada ejecución recalcula solo el bucket de su día con los items que el estado
+de vistos da como nuevos ese día (coste proporcional a los items del día); el
+informe de un periodo suma los buckets de sus días, sin releer el markdown ni
+volver a consultar GitHub.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import artifacts
+import render
+from state_store import AggregateStore, SeenStore
+
+UNCATEGORIZED = 'Sin categoría'
+REPORT_PATHS = {
+    'week': 'daily/weekly/{period}.md',
+    'month': 'daily/monthly/{period}.md',
+}
+REPORT_TITLES = {
+    'week': 'Resumen Semanal',
+    'month': 'Resumen Mensual',
+}
+
+
+def _has_data(items: Optional[List]) -> bool:
+    """False para los placeholders de error o de aviso."""
+    return bool(items) and not (items[0].get('error') or items[0].get('info'))
+
+
+# -- agregados del día ------------------------------------------------------
+
+def paper_counts(papers: List, seen: SeenStore, day: str) -> Dict[str, int]:
+    """Papers vistos por primera vez en `day`, por categoría."""
+    counts: Dict[str, int] = {}
+    for paper in papers:
+        url = paper.get('url')
+        if url and seen.is_new(url, day):
+            category = paper.get('category') or UNCATEGORIZED
+            counts[category] = counts.get(category, 0) + 1
+    return counts
+
+
+def repo_key(repo: Dict) -> str:
+    """Clave del repo en los agregados: `org/nombre` (dos organizaciones pueden tener repos homónimos)."""
+    return f"{repo['org']}/{repo['name']}" if repo.get('org') else repo['name']
+
+
+def github_counts(repos: List, seen: SeenStore, day: str) -> Tuple[Dict[str, int], Dict[str, List[str]]]:
+    """Commits nuevos por repo y tags de las releases nuevas por repo (por `org/nombre`)."""
+    commits: Dict[str, int] = {}
+    releases: Dict[str, List[str]] = {}
+    for repo in repos:
+        if repo.get('error'):
+            continue
+        new_commits = sum(1 for c in repo.get('commits', []) if c.get('url') and seen.is_new(c['url'], day))
+        if new_commits:
+            commits[repo_key(repo)] = new_commits
+        tags = [r['tag'] for r in repo.get('releases', []) if r.get('url') and seen.is_new(r['url'], day)]
+        if tags:
+            releases[repo_key(repo)] = tags
+    return commits, releases
+
+
+def update_day(store: AggregateStore, day: str, seen: SeenStore,
+               research: Optional[List] = None, github: Optional[List] = None) -> None:
+    """Recalcula las secciones de `day` de los tipos recibidos (los que no traen datos se conservan).
+
+    Los items deben estar ya registrados en `seen`.
+    """
+    if _has_data(research):
+        store.update(day, 'papers', paper_counts(research, seen, day))
+    if _has_data(github):
+        commits, releases = github_counts(github, seen, day)
+        store.update(day, 'commits', commits)
+        store.update(day, 'releases', releases)
+
+
+def bootstrap(store: AggregateStore, seen: SeenStore, data_dir: str = artifacts.DATA_DIR) -> int:
+    """Migración única: agregados de todos los días con artefactos NDJSON."""
+    days = set()
+    for day in artifacts.days_with_data('research', data_dir):
+        update_day(store, day, seen, research=artifacts.read_day('research', day, data_dir))
+        days.add(day)
+    for day in artifacts.days_with_data('github', data_dir):
+        update_day(store, day, seen, github=artifacts.read_day('github', day, data_dir))
+        days.add(day)
+    return len(days)
+
+
+# -- informes ---------------------------------------------------------------
+
+def period_of(kind: str, day: str) -> Tuple[str, str, str]:
+    """(nombre, primer día, último día) de la semana ISO o del mes de `day`."""
+    date = datetime.strptime(day, '%Y-%m-%d')
+    if kind == 'week':
+        year, week, weekday = date.isocalendar()
+        start = date - timedelta(days=weekday - 1)
+        end = start + timedelta(days=6)
+        name = f"{year}-W{week:02d}"
+    else:
+        start = date.replace(day=1)
+        end = (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        name = start.strftime('%Y-%m')
+    return name, start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+
+
+def summarize(store: AggregateStore, start: str, end: str) -> Dict:
+    """Suma los buckets de los días entre `start` y `end`."""
+    days = store.between(start, end)
+    commits: Dict[str, int] = {}
+    releases: Dict[str, List[Tuple[str, str]]] = {}
+    papers: Dict[str, int] = {}
+    for day in days:
+        bucket = store.get(day)
+        for repo, count in bucket.get('commits', {}).items():
+            commits[repo] = commits.get(repo, 0) + count
+        for repo, tags in bucket.get('releases', {}).items():
+            releases.setdefault(repo, []).extend((day, tag) for tag in tags)
+        for category, count in bucket.get('papers', {}).items():
+            papers[category] = papers.get(category, 0) + count
+
+    activity = [(repo, commits.get(repo, 0), len(releases.get(repo, []))) for repo in set(commits) | set(releases)]
+    cadence = []
+    for repo, items in releases.items():
+        first = datetime.strptime(items[0][0], '%Y-%m-%d')
+        last = datetime.strptime(items[-1][0], '%Y-%m-%d')
+        every = (last - first).days / (len(items) - 1) if len(items) > 1 else None
+        cadence.append({'repo': repo, 'tags': [tag for _, tag in items], 'every_days': every})
+    cadence.sort(key=lambda c: (-len(c['tags']), c['repo']))
+    return {
+        'start': start,
+        'end': end,
+        'days': len(days),
+        'active': sorted(activity, key=lambda item: (-(item[1] + item[2]), item[0])),
+        'commits': sorted(commits.items(), key=lambda item: (-item[1], item[0])),
+        'releases': cadence,
+        'papers': sorted(papers.items(), key=lambda item: (-item[1], item[0])),
+    }
+
+
+def write_reports(store: AggregateStore, day: str, generated_at: Optional[datetime] = None) -> List[Tuple[str, int]]:
+    """Escribe los informes de la semana y el mes de `day`; devuelve (ruta, caracteres escritos)."""
+    return write_period_reports(store, [day], generated_at)
+
+
+def write_period_reports(store: AggregateStore, days: List[str],
+                         generated_at: Optional[datetime] = None) -> List[Tuple[str, int]]:
+    """Escribe una vez cada informe semanal y mensual que contiene alguno de `days`."""
+    periods = {}
+    for day in sorted(days):
+        for kind in ('week', 'month'):
+            period, start, end = period_of(kind, day)
+            periods[(kind, period)] = (start, end)
+    written = []
+    for (kind, period), (start, end) in periods.items():
+        path = REPORT_PATHS[kind].format(period=period)
+        lines = render.rollup_markdown(REPORT_TITLES[kind], period, summarize(store, start, end), generated_at)
+        written.append((path, render.write_markdown(path, lines)))
+    return written
@@ -1,131 +1,192 @@
 """
 Scraper principal para obtener actualizaciones de Anthropic.
 Genera resumen diario en TRES CARPETAS separadas.
+
+Las dependencias pesadas (requests, PyGithub, BeautifulSoup, dateutil) se
+importan solo cuando una fuente las usa, así que los subcomandos que no
+van a la red (`render`, `index`, `search`) arrancan en milisegundos.
 """
 import os
-import re
-import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-import requests
-from bs4 import BeautifulSoup
-from dateutil import parser as date_parser
-from github import Github
+from functools import partial
+from typing import TYPE_CHECKING, Iterator, List, Dict, Optional
+
+import artifacts
+import outputs
+import render
+import rollups
+from records import calculate_utility, parse_date, to_papers, to_repo_updates
+from metrics import metrics, configure as configure_metrics
+from pipeline import print_latencies
+from sources import DEFAULT_CONFIG_PATH, ResultCache, github_orgs, load_sources, collect_sources
+from readme_index import update_history_index
+from search_index import SearchIndex, index_artifacts, index_history
+from state_store import (SeenStore, WatermarkStore, PaperDetailsStore, AggregateStore, DEFAULT_STATE_PATH,
+                         DEFAULT_AGGREGATES_PATH, bootstrap_from_artifacts, seed_github_day, bootstrap_from_markdown, github_item_keys)
+
+if TYPE_CHECKING:
+    from github import Github
+    from changelog import ChangelogIngester
+    from http_cache import HTTPCache
+    from rate_limit import RateLimitScheduler
+
+
+RESEARCH_URL = "https://www.anthropic.com/research"
 
 
 class AnthropicScraper:
     """Scraper para fuentes de Anthropic."""
     
-    def __init__(self, github_token: Optional[str] = None):
+    def __init__(self, github_token: Optional[str] = None, max_workers: int = 8,
+                 github_backend: str = 'rest', http_cache: Optional['HTTPCache'] = None,
+                 research_url: str = RESEARCH_URL, github_api_url: Optional[str] = None,
+                 github_graphql_url: Optional[str] = None,
+                 scheduler: Optional['RateLimitScheduler'] = None,
+                 watermarks: Optional[WatermarkStore] = None,
+                 paper_details: Optional[PaperDetailsStore] = None):
+        import requests
+        from http_cache import mount_cache, install_github_transport
+        from rate_limit import RateLimitScheduler
+
         self.github_token = github_token
-        self.github = Github(github_token) if github_token else None
+        self.http_cache = http_cache
+        # Endpoints configurables (p. ej. para apuntar a un servidor stub)
+        self.research_url = research_url
+        self.github_api_url = github_api_url
+        self.github_graphql_url = github_graphql_url
+        # Ritmo y reintentos de las llamadas a GitHub según su rate limit
+        self.scheduler = scheduler or RateLimitScheduler()
+        # Cursores por repo para pedir solo la actividad nueva (opcional)
+        self.watermarks = watermarks
+        # Detalles de cada paper ya descargados (opcional)
+        self.paper_details = paper_details
+        response_hooks = [self.scheduler.response_hook]
+        if metrics.enabled:
+            response_hooks.append(metrics.response_hook)
+        # Debe instalarse antes de crear cualquier cliente de PyGithub
+        install_github_transport(http_cache, response_hooks)
+        self.github = self._new_github_client() if github_token else None
+        # Límite de repos consultados en paralelo en get_github_updates
+        self.max_workers = max_workers
+        # 'rest' (PyGithub, una consulta por repo) o 'graphql' (consultas por lotes)
+        self.github_backend = github_backend
+        self._local = threading.local()
+        # Ingestores del CHANGELOG por (repo, path): su estado sigue en memoria entre sondeos
+        self._changelogs: Dict[tuple, 'ChangelogIngester'] = {}
         self.session = requests.Session()
+        if http_cache is not None:
+            mount_cache(self.session, http_cache)
+        self.session.hooks['response'].extend(response_hooks)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
     
-    def scrape_research(self) -> List[Dict]:
-        """Obtiene los 5 papers más recientes de la sección Publications de Anthropic Research."""
-        from datetime import datetime
-        
-        url = "https://www.anthropic.com/research"
-        papers = []
+    def scrape_research(self, limit: int = 5) -> List[Dict]:
+        """Obtiene los papers más recientes de la sección Publications de Anthropic Research."""
+        from research import parse_research_html
+
+        url = self.research_url
         
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            with metrics.span('research.fetch'):
+                response = self.session.get(url, timeout=30)
+                response.raise_for_status()
+            with metrics.span('research.parse', bytes=len(response.content)):
+                papers = parse_research_html(response.content, limit=limit)
             
-            # Buscar el header "Publications"
-            h2_publications = soup.find('h2', string=lambda x: x and 'Publications' in x)
-            if not h2_publications:
+            if papers is None:
                 print("  No se encontró la sección Publications")
-                papers.append({
+                return [{
                     'error': True,
                     'message': 'No se encontró la sección Publications en la página'
-                })
-                return papers
-            
-            # Obtener todos los enlaces DESPUÉS del header Publications
-            # Estos son los artículos de la sección Publications
-            all_links_after = h2_publications.find_all_next('a', href=lambda x: x and x.startswith('/research/'))
-            
-            print(f"  Encontrados {len(all_links_after)} papers en Publications")
-            
-            # Procesar máximo 5 papers (los más recientes están primero)
-            for item in all_links_after[:5]:
-                try:
-                    href = item.get('href', '')
-                    if not href or href == '/research/':
-                        continue
-                    
-                    link = f"https://www.anthropic.com{href}"
-                    
-                    # El contenido del link tiene la fecha al inicio, luego spans con categoría y título
-                    full_text = item.get_text(strip=True)
-                    
-                    # Extraer fecha del inicio (formato: "Feb 25, 2026")
-                    date_match = re.search(r'^(\w{3,}\s+\d{1,2},?\s+\d{4})', full_text)
-                    date_str = date_match.group(1) if date_match else ""
-                    
-                    # Los spans contienen: [0] = categoría, [1] = título
-                    spans = item.find_all('span')
-                    if len(spans) >= 2:
-                        category = spans[0].get_text(strip=True)
-                        title = spans[1].get_text(strip=True)
-                    else:
-                        continue
-                    
-                    if not title or len(title) < 5:
-                        continue
-                    
-                    # Descripción es la categoría para dar contexto
-                    description = f"Category: {category}" if category else ""
-                    
-                    papers.append({
-                        'title': title,
-                        'description': description,
-                        'url': link,
-                        'date': date_str,
-                        'category': category,
-                        'source': 'anthropic.com/research'
-                    })
-                    
-                except Exception as e:
-                    print(f"Error procesando paper: {e}")
-                    continue
+                }]
                     
         except Exception as e:
             print(f"Error scrapeando research: {e}")
-            papers.append({
+            return [{
                 'error': True,
                 'message': f'No se pudo obtener research: {str(e)}',
                 'suggestion': 'Visitar https://www.anthropic.com/research manualmente'
-            })
-            return papers
+            }]
         
         print(f"  Papers extraídos: {len(papers)}")
         return papers
     
     def _parse_date(self, date_str: str) -> datetime:
         """Parsea fecha string a datetime para ordenar."""
-        from dateutil import parser as date_parser
-        try:
-            return date_parser.parse(date_str)
-        except:
-            # Si no se puede parsear, devolver fecha muy antigua
-            return datetime.min
+        # Si no se puede parsear, devolver fecha muy antigua
+        return parse_date(date_str) or datetime.min
     
     def _sort_by_date(self, items: List[Dict]) -> List[Dict]:
-        """Ordena items por fecha (más recientes primero)."""
-        return sorted(items, key=lambda x: self._parse_date(x.get('date', '')), reverse=True)
+        """Ordena items por fecha (más recientes primero).
+
+        Los `Paper` ya traen la fecha parseada; los dicts se parsean una vez.
+        """
+        papers = to_papers(items)
+        order = sorted(range(len(items)), key=lambda i: papers[i].get('sort_date') or datetime.min, reverse=True)
+        return [items[i] for i in order]
+    
+    def scrape_docs(self, repo: str = 'anthropics/claude-code', path: str = 'CHANGELOG.md') -> List[Dict]:
+        """Versiones nuevas del CHANGELOG de claude-code (ingesta incremental)."""
+        from changelog import ChangelogIngester
+
+        try:
+            ingester = self._changelogs.get((repo, path))
+            if ingester is None:
+                ingester = ChangelogIngester(self.session, self.github_token, repo=repo, path=path,
+                                             api_url=self.github_api_url, scheduler=self.scheduler)
+                self._changelogs[(repo, path)] = ingester
+            with metrics.span('docs.changelog'):
+                return ingester.ingest()
+        except Exception as e:
+            print(f"Error obteniendo el CHANGELOG: {e}")
+            return [{
+                'error': True,
+                'message': f'No se pudo obtener el CHANGELOG: {str(e)}'
+            }]
+    
+    def commit_changelogs(self) -> None:
+        """Guarda el cursor de los CHANGELOG leídos (una vez escritas las salidas)."""
+        for ingester in self._changelogs.values():
+            ingester.commit()
     
-    def scrape_docs(self) -> List[Dict]:
-        """Docs se obtienen via GitHub (claude-code repo). Esta función ya no se usa."""
-        return []
+    def _new_github_client(self) -> 'Github':
+        """Crea un cliente de PyGithub contra la API configurada.
+
+        Sin reintentos propios de PyGithub: los gestiona `self.scheduler`.
+        """
+        from github import Github
+
+        if self.github_api_url:
+            return Github(self.github_token, base_url=self.github_api_url, retry=None)
+        return Github(self.github_token, retry=None)
     
-    def get_github_updates(self, org_name: str = "anthropics", days_back: int = 2) -> List[Dict]:
-        """Obtiene actualizaciones de repos de Anthropic en GitHub."""
+    def _thread_github(self) -> 'Github':
+        """Devuelve un cliente de GitHub propio del hilo actual.
+
+        El Requester de PyGithub comparte una única conexión que no es
+        thread-safe, así que cada hilo del pool usa su propio cliente.
+        """
+        client = getattr(self._local, 'github', None)
+        if client is None:
+            client = self._new_github_client()
+            self._local.github = client
+        return client
+    
+    def get_github_updates(self, org_name: str = "anthropics", days_back: int = 2,
+                           max_workers: Optional[int] = None,
+                           backend: Optional[str] = None,
+                           cancel_event: Optional[threading.Event] = None) -> List[Dict]:
+        """Obtiene actualizaciones de repos de Anthropic en GitHub.
+
+        Con el backend REST los commits y releases de cada repo candidato se
+        consultan en paralelo (como mucho ``max_workers`` repos a la vez); con
+        el backend GraphQL toda la organización se pide en una o pocas
+        consultas. El resultado mantiene el orden del listado de la organización.
+        Si se activa `cancel_event` no se empiezan repos nuevos.
+        """
         if not self.github:
             return [{
                 'error': True,
@@ -134,84 +195,49 @@ class AnthropicScraper:
         
         from datetime import timezone
         
+        workers = max_workers if max_workers is not None else self.max_workers
+        backend = backend or self.github_backend
         updates = []
         # Crear fecha aware (con timezone) para comparar correctamente
         yesterday = datetime.now(timezone.utc) - timedelta(days=days_back)
         
+        if backend == 'graphql':
+            from github_graphql import GitHubGraphQLClient
+
+            try:
+                print(f"  Consultando {org_name} vía GraphQL...")
+                client = GitHubGraphQLClient(self.github_token, self.session, self.github_graphql_url,
+                                             scheduler=self.scheduler)
+                with metrics.span('github.graphql', org=org_name):
+                    updates = client.get_org_activity(org_name, yesterday)
+            except Exception as e:
+                print(f"❌ Error accediendo a GitHub: {e}")
+                updates = [{
+                    'error': True,
+                    'message': f'Error accediendo a GitHub: {str(e)}'
+                }]
+            print(f"\n  Total repos con actividad: {len(updates)}")
+            return updates
+        
         try:
-            org = self.github.get_organization(org_name)
-            repos = org.get_repos(type='public', sort='updated')
-            
-            print(f"  Revisando {repos.totalCount} repos de {org_name}...")
+            print(f"  Revisando repos de {org_name} con pushes desde {yesterday:%Y-%m-%d %H:%M} UTC...")
+            # Cada candidato se lanza en cuanto llega su página del listado
+            active = self.iter_active_repos(org_name, yesterday, cancel_event)
+            if workers > 1:
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    futures = [
+                        pool.submit(self._fetch_repo_activity, repo, repo_updated, yesterday,
+                                    threaded=True, cancel_event=cancel_event)
+                        for repo, repo_updated in active
+                    ]
+                    results = [future.result() for future in futures]
+            else:
+                results = [self._fetch_repo_activity(repo, repo_updated, yesterday, cancel_event=cancel_event)
+                           for repo, repo_updated in active]
             
-            for repo in repos[:30]:  # Aumentar a 30 repos
-                try:
-                    # Convertir updated_at a aware si es naive
-                    repo_updated = repo.updated_at
-                    if repo_updated.tzinfo is None:
-                        repo_updated = repo_updated.replace(tzinfo=timezone.utc)
-                    
-                    if repo_updated < yesterday:
-                        continue
-                    
-                    print(f"    📁 {repo.name} - revisando actividad...")
-                    
-                    # Obtener commits recientes
-                    recent_commits = []
-                    try:
-                        commits = repo.get_commits(since=yesterday)
-                        for commit in commits[:5]:  # Top 5 commits
-                            commit_date = commit.commit.author.date
-                            if commit_date.tzinfo is None:
-                                commit_date = commit_date.replace(tzinfo=timezone.utc)
-                            
-                            recent_commits.append({
-                                'message': commit.commit.message.split('\n')[0][:100],
-                                'url': commit.html_url,
-                                'author': commit.commit.author.name,
-                                'date': commit_date.isoformat()
-                            })
-                    except Exception as e:
-                        print(f"      Error obteniendo commits: {e}")
-                    
-                    # Obtener releases recientes
-                    recent_releases = []
-                    try:
-                        releases = repo.get_releases()
-                        for release in releases[:2]:  # Top 2 releases
-                            release_date = release.created_at
-                            if release_date and release_date.tzinfo is None:
-                                release_date = release_date.replace(tzinfo=timezone.utc)
-                            
-                            if release_date and release_date > yesterday:
-                                recent_releases.append({
-                                    'tag': release.tag_name,
-                                    'name': release.title,
-                                    'url': release.html_url,
-                                    'body': (release.body[:500] + "...") if release.body and len(release.body) > 500 else (release.body or "")
-                                })
-                    except Exception as e:
-                        print(f"      Error obteniendo releases: {e}")
-                    
-                    # Si hay actividad, agregar al reporte
-                    if recent_commits or recent_releases:
-                        update_info = {
-                            'name': repo.name,
-                            'url': repo.html_url,
-                            'description': repo.description or "No description",
-                            'stars': repo.stargazers_count,
-                            'language': repo.language or "Unknown",
-                            'updated_at': repo_updated.isoformat(),
-                            'commits': recent_commits,
-                            'releases': recent_releases
-                        }
-                        
-                        updates.append(update_info)
-                        print(f"      ✅ {len(recent_commits)} commits, {len(recent_releases)} releases")
-                        
-                except Exception as e:
-                    print(f"    ⚠️ Error procesando repo {repo.name}: {e}")
-                    continue
+            updates.extend(r for r in results if r)
+            if self.watermarks is not None:
+                self.watermarks.flush()
                     
         except Exception as e:
             print(f"❌ Error accediendo a GitHub: {e}")
@@ -223,312 +249,272 @@ class AnthropicScraper:
         print(f"\n  Total repos con actividad: {len(updates)}")
         return updates
     
-    def calculate_utility(self, repo_update: Dict) -> tuple:
-        """Calcula utilidad del cambio (score 1-5, descripción)."""
-        score = 3
-        reasons = []
+    def iter_active_repos(self, org_name: str, since: datetime,
+                          cancel_event: Optional[threading.Event] = None) -> Iterator[tuple]:
+        """Repos públicos de `org_name` con pushes desde `since`, página a página: `(repo, updated_at)`.
+
+        El listado va ordenado por último push y se detiene en el primer repo
+        fuera de la ventana, así que el número de páginas pedidas depende de
+        los repos activos, no del tamaño de la organización. Con poco
+        presupuesto de API se queda con los más recientes (~2 llamadas por
+        repo: commits y releases). Lo usan la ejecución diaria y el backfill.
+        """
+        from datetime import timezone
         
-        stars = repo_update.get('stars', 0)
-        if stars > 10000:
-            score += 1
-            reasons.append("Repo muy popular")
-        elif stars < 100:
-            score -= 1
-            reasons.append("Repo menos conocido")
+        with metrics.span('github.listing', org=org_name):
+            org = self.scheduler.call(lambda: self.github.get_organization(org_name), 'organización')
+            repos = org.get_repos(type='public', sort='pushed', direction='desc')
+        budget = self.scheduler.budget()
+        limit = None if budget is None else budget // 2
+        count = 0
+        page = 0
+        while True:
+            batch = self.scheduler.call(lambda: repos.get_page(page), 'listado')
+            for repo in batch:
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                pushed_at = repo.pushed_at
+                if pushed_at is None:
+                    continue
+                if pushed_at.tzinfo is None:
+                    pushed_at = pushed_at.replace(tzinfo=timezone.utc)
+                if pushed_at < since:
+                    return
+                if limit is not None and count >= limit:
+                    print(f"  ⚠️ Presupuesto de API ajustado ({budget} llamadas): "
+                          f"se revisan los {count} repos con pushes más recientes")
+                    return
+                repo_updated = repo.updated_at
+                if repo_updated.tzinfo is None:
+                    repo_updated = repo_updated.replace(tzinfo=timezone.utc)
+                count += 1
+                yield repo, repo_updated
+            if len(batch) < self.github.per_page:
+                return
+            page += 1
+    
+    def _fetch_repo_activity(self, repo, repo_updated: datetime, yesterday: datetime,
+                             threaded: bool = False,
+                             cancel_event: Optional[threading.Event] = None) -> Optional[Dict]:
+        """Obtiene commits y releases recientes de un repo (None si no hay actividad)."""
+        if cancel_event is not None and cancel_event.is_set():
+            return None
         
-        release = repo_update.get('release')
-        commits = repo_update.get('commits', [])
+        with metrics.span('github.repo', repo=repo.name):
+            return self._collect_repo_activity(repo, repo_updated, yesterday, threaded)
+    
+    def _collect_repo_activity(self, repo, repo_updated: datetime, yesterday: datetime,
+                               threaded: bool) -> Optional[Dict]:
+        """Cuerpo de `_fetch_repo_activity` (medido como span github.repo)."""
+        from datetime import timezone
         
-        if release:
-            score += 1
-            reasons.append("Nueva release disponible")
+        try:
+            print(f"    📁 {repo.name} - revisando actividad...")
+            
+            # En modo concurrente las llamadas van por el cliente del hilo;
+            # lazy=True evita volver a pedir el repo a la API
+            source = self._thread_github().get_repo(repo.full_name, lazy=True) if threaded else repo
+            
+            # Cursor del repo: si no ha habido pushes desde la última ejecución
+            # no se piden commits ni releases, y si los hubo solo el delta
+            mark = self.watermarks.get(repo.full_name) if self.watermarks is not None else None
+            pushed_at = repo.pushed_at
+            if pushed_at is not None and pushed_at.tzinfo is None:
+                pushed_at = pushed_at.replace(tzinfo=timezone.utc)
+            pushed_at = pushed_at.isoformat() if pushed_at else None
+            
+            if mark and pushed_at and mark['pushed_at'] == pushed_at:
+                print(f"      ⏭️  {repo.name}: sin pushes nuevos, se usa el cursor")
+                metrics.incr('github.repos_unchanged')
+                latest_commits, latest_releases = mark['commits'], mark['releases']
+            else:
+                latest_commits = self._fetch_commits(source, repo, yesterday, mark)
+                latest_releases = self._fetch_releases(source, repo, mark)
+                if self.watermarks is not None and latest_commits is not None and latest_releases is not None:
+                    self.watermarks.update(repo.full_name, pushed_at, latest_commits, latest_releases)
+                # Si una consulta falla, el cursor no avanza
+                if latest_commits is None:
+                    latest_commits = mark['commits'] if mark else []
+                if latest_releases is None:
+                    latest_releases = mark['releases'] if mark else []
+            
+            # Ventana de la ejecución: commits desde `yesterday`, releases posteriores
+            recent_commits = [
+                {k: v for k, v in c.items() if k != 'sha'} for c in latest_commits
+                if datetime.fromisoformat(c['date']) >= yesterday
+            ]
+            recent_releases = [
+                {k: v for k, v in r.items() if k not in ('id', 'created_at')} for r in latest_releases
+                if r['created_at'] and datetime.fromisoformat(r['created_at']) > yesterday
+            ]
             
-            tag = release.get('tag', '')
-            if tag.startswith('v') and ('.0.' in tag or tag.endswith('.0')):
-                score += 1
-                reasons.append("Posible versión mayor")
+            # Si hay actividad, agregar al reporte
+            if recent_commits or recent_releases:
+                print(f"      ✅ {repo.name}: {len(recent_commits)} commits, {len(recent_releases)} releases")
+                return {
+                    'name': repo.name,
+                    'url': repo.html_url,
+                    'description': repo.description or "No description",
+                    'stars': repo.stargazers_count,
+                    'language': repo.language or "Unknown",
+                    'updated_at': repo_updated.isoformat(),
+                    'commits': recent_commits,
+                    'releases': recent_releases
+                }
+                
+        except Exception as e:
+            print(f"    ⚠️ Error procesando repo {repo.name}: {e}")
         
-        if commits:
-            important_keywords = ['feat', 'feature', 'add', 'implement', 'breaking', 'major']
-            for commit in commits[:2]:
-                msg = commit.get('message', '').lower()
-                if any(kw in msg for kw in important_keywords):
-                    score += 1
-                    reasons.append("Nuevas funcionalidades")
-                    break
+        return None
+    
+    def _fetch_commits(self, source, repo, yesterday: datetime,
+                       mark: Optional[Dict] = None) -> Optional[List[Dict]]:
+        """Últimos 5 commits desde `yesterday`, o desde el cursor si es posterior (None si falla)."""
+        from datetime import timezone
         
-        lang = repo_update.get('language', '').lower()
-        if lang in ['python', 'javascript', 'typescript']:
-            reasons.append("Lenguaje popular")
+        since = yesterday
+        if mark and mark.get('commit_date'):
+            since = max(yesterday, datetime.fromisoformat(mark['commit_date']))
         
-        score = max(1, min(5, score))
+        latest = []
+        try:
+            with metrics.span('github.commits', repo=repo.name):
+                commits = self.scheduler.call(
+                    lambda: list(source.get_commits(since=since)[:5]), f"commits de {repo.name}")
+                for commit in commits:  # Top 5 commits
+                    commit_date = commit.commit.author.date
+                    if commit_date.tzinfo is None:
+                        commit_date = commit_date.replace(tzinfo=timezone.utc)
+                
+                    latest.append({
+                        'message': commit.commit.message.split('\n')[0][:100],
+                        'url': commit.html_url,
+                        'author': commit.commit.author.name,
+                        'date': commit_date.isoformat(),
+                        'sha': commit.sha
+                    })
+        except Exception as e:
+            print(f"      Error obteniendo commits: {e}")
+            return None
         
-        return score, reasons
-
-
-def generate_research_markdown(date_str: str, papers: List[Dict]) -> str:
-    """Genera markdown solo para Research."""
-    lines = [
-        f"# Research - {date_str}",
-        "",
-        f"**Fecha**: {datetime.now().strftime('%Y-%m-%d %H:%M UTC')}",
-        "",
-        "---",
-        "",
-    ]
-    
-    if papers and not papers[0].get('error'):
-        lines.append(f"## Papers encontrados: {len(papers)}")
-        lines.append("")
+        if mark:
+            # Delta + commits ya conocidos (el del cursor puede venir repetido)
+            urls = {c['url'] for c in latest}
+            latest.extend(c for c in mark['commits'] if c['url'] not in urls)
+        return latest[:5]
+    
+    def _fetch_releases(self, source, repo, mark: Optional[Dict] = None) -> Optional[List[Dict]]:
+        """Últimas 2 releases; con cursor se deja de paginar al llegar a la ya vista (None si falla)."""
+        from datetime import timezone
         
-        for paper in papers[:10]:
-            lines.extend([
-                f"### [{paper['title']}]({paper['url']})",
-                "",
-            ])
-            if paper.get('date'):
-                lines.append(f"**Fecha**: {paper['date']}")
-                lines.append("")
-            if paper.get('description'):
-                lines.append(paper['description'])
-                lines.append("")
-            lines.append(f"**Link**: [{paper['url']}]({paper['url']})")
-            lines.append("")
-            lines.append("---")
-            lines.append("")
-    elif papers and papers[0].get('error'):
-        lines.append(f"⚠️ **Error**: {papers[0].get('message', 'No disponible')}")
-        lines.append("")
-    else:
-        lines.append("No se encontraron nuevos papers de research.")
-        lines.append("")
-    
-    lines.extend([
-        "---",
-        "",
-        "*Fuente*: [anthropic.com/research](https://www.anthropic.com/research)",
-        "",
-        "*Generado automáticamente*",
-    ])
+        known_id = mark.get('release_id') if mark else None
+        latest = []
+        try:
+            with metrics.span('github.releases', repo=repo.name):
+                def newest_releases():
+                    found = []
+                    for release in source.get_releases():
+                        if release.id == known_id or len(found) == 2:
+                            break
+                        found.append(release)
+                    return found
+                
+                releases = self.scheduler.call(newest_releases, f"releases de {repo.name}")
+                for release in releases:  # Top 2 releases
+                    release_date = release.created_at
+                    if release_date and release_date.tzinfo is None:
+                        release_date = release_date.replace(tzinfo=timezone.utc)
+                
+                    latest.append({
+                        'tag': release.tag_name,
+                        'name': release.title,
+                        'url': release.html_url,
+                        'body': (release.body[:500] + "...") if release.body and len(release.body) > 500 else (release.body or ""),
+                        'id': release.id,
+                        'created_at': release_date.isoformat() if release_date else None
+                    })
+        except Exception as e:
+            print(f"      Error obteniendo releases: {e}")
+            return None
+        
+        if mark:
+            latest.extend(mark['releases'])
+        return latest[:2]
     
-    return '\n'.join(lines)
+    def calculate_utility(self, repo_update: Dict) -> tuple:
+        """Calcula utilidad del cambio (score 1-5, descripción)."""
+        return calculate_utility(repo_update)
+
+def generate_research_markdown(date_str: str, papers: List[Dict],
+                               generated_at: Optional[datetime] = None) -> str:
+    """Genera markdown solo para Research."""
+    return render.render_text(render.research_markdown(date_str, papers, generated_at))
 
 
-def generate_docs_markdown(date_str: str, docs: List[Dict]) -> str:
+def generate_docs_markdown(date_str: str, docs: List[Dict],
+                           generated_at: Optional[datetime] = None) -> str:
     """Genera markdown solo para Docs (Changelog de Claude Code)."""
-    lines = [
-        f"# Changelog Claude Code - {date_str}",
-        "",
-        f"**Fecha**: {datetime.now().strftime('%Y-%m-%d %H:%M UTC')}",
-        "",
-        "---",
-        "",
-    ]
-    
-    # Filtrar solo entradas de versión (no metadatos como commits recientes)
-    version_entries = [d for d in docs if d.get('version')]
-    commit_info = next((d for d in docs if d.get('recent_commits')), None)
-    
-    if version_entries:
-        lines.append(f"## Versiones recientes: {len(version_entries)}")
-        lines.append("")
-        
-        for entry in version_entries:
-            version = entry['version']
-            changes = entry.get('changes', [])
-            
-            lines.extend([
-                f"### v{version}",
-                "",
-                "**Cambios:**",
-                "",
-            ])
-            
-            for change in changes[:10]:  # Max 10 cambios por versión
-                lines.append(f"- {change}")
-            
-            lines.append("")
-            lines.append(f"[Ver en GitHub]({entry['url']}#v{version.replace('.', '')})")
-            lines.append("")
-            lines.append("---")
-            lines.append("")
-        
-        # Añadir info de commits recientes si existe
-        if commit_info and commit_info.get('recent_commits'):
-            lines.append("### Commits recientes al CHANGELOG")
-            lines.append("")
-            for commit in commit_info['recent_commits'][:5]:
-                lines.append(f"- `{commit['sha']}` {commit['message']} ({commit['date'][:10]})")
-            lines.append("")
-            
-    elif docs and docs[0].get('info'):
-        lines.append(f"ℹ️ {docs[0].get('message', 'Sin novedades')}")
-        lines.append("")
-    elif docs and docs[0].get('error'):
-        lines.append(f"⚠️ **Error**: {docs[0].get('message', 'No disponible')}")
-        lines.append("")
-    else:
-        lines.append("No se encontraron actualizaciones de documentación.")
-        lines.append("")
-    
-    lines.extend([
-        "---",
-        "",
-        "*Fuente*: [github.com/anthropics/claude-code/CHANGELOG.md](https://github.com/anthropics/claude-code/blob/main/CHANGELOG.md)",
-        "",
-        "*Generado automáticamente*",
-    ])
-    
-    return '\n'.join(lines)
+    return render.render_text(render.docs_markdown(date_str, docs, generated_at))
 
 
-def generate_github_markdown(date_str: str, repos: List[Dict]) -> str:
+def generate_github_markdown(date_str: str, repos: List[Dict],
+                             generated_at: Optional[datetime] = None) -> str:
     """Genera markdown solo para GitHub."""
-    lines = [
-        f"# GitHub - {date_str}",
-        "",
-        f"**Fecha**: {datetime.now().strftime('%Y-%m-%d %H:%M UTC')}",
-        "",
-        "---",
-        "",
-    ]
-    
-    if repos and not repos[0].get('error'):
-        lines.append(f"## Repositorios con actividad reciente: {len(repos)}")
-        lines.append("")
-        
-        scraper = AnthropicScraper()
-        
-        for repo in repos[:15]:
-            lines.extend([
-                f"### `{repo['name']}`",
-                "",
-            ])
-            
-            if repo.get('description'):
-                lines.append(f"*{repo['description']}*")
-                lines.append("")
-            
-            # Info del repo
-            lines.append(f"⭐ {repo.get('stars', 0)} stars | 📝 {repo.get('language', 'Unknown')}")
-            lines.append("")
-            
-            if repo.get('commits'):
-                lines.append(f"**Commits ({len(repo['commits'])}):**")
-                lines.append("")
-                for commit in repo['commits'][:5]:
-                    msg = commit.get('message', '')[:80]
-                    if len(commit.get('message', '')) > 80:
-                        msg += "..."
-                    author = commit.get('author', 'Unknown')
-                    lines.append(f"- `{author}`: [{msg}]({commit['url']})")
-                lines.append("")
-            
-            # Releases (puede ser múltiple)
-            releases = repo.get('releases', [])
-            if releases:
-                lines.append(f"**Releases ({len(releases)}):**")
-                lines.append("")
-                for release in releases[:2]:
-                    lines.append(f"- [{release['tag']}]({release['url']}) - {release['name']}")
-                    if release.get('body'):
-                        body = release['body'][:150].replace('\n', ' ')
-                        lines.append(f"  > {body}...")
-                lines.append("")
-            elif repo.get('release'):  # Backward compatibility
-                release = repo['release']
-                lines.append(f"**Release**: [{release['tag']}]({release['url']})")
-                lines.append("")
-            
-            score, reasons = scraper.calculate_utility(repo)
-            stars = "⭐" * score
-            lines.append(f"**Importancia**: {stars} ({score}/5)")
-            if reasons:
-                lines.append(f"*Por qué: {', '.join(reasons)}*")
-            lines.append("")
-            
-            lines.append(f"[Ver en GitHub →]({repo['url']})")
-            lines.append("")
-            lines.append("---")
-            lines.append("")
-    elif repos and repos[0].get('error'):
-        lines.append(f"⚠️ **Error**: {repos[0].get('message', 'No disponible')}")
-        lines.append("")
-    else:
-        lines.append("No se encontró actividad reciente en los repositorios.")
-        lines.append("")
-    
-    lines.extend([
-        "---",
-        "",
-        "*Fuente*: [github.com/anthropics](https://github.com/anthropics)",
-        "",
-        "*Generado automáticamente*",
-    ])
-    
-    return '\n'.join(lines)
+    return render.render_text(render.github_markdown(date_str, repos, generated_at))
 
 
-def generate_summary_markdown(date_str: str, research: List[Dict], docs: List[Dict], github: List[Dict]) -> str:
+def generate_summary_markdown(date_str: str, research: List[Dict], docs: List[Dict], github: List[Dict],
+                              generated_at: Optional[datetime] = None) -> str:
     """Genera markdown resumen de todo."""
-    lines = [
-        f"# Resumen General - {date_str}",
-        "",
-        f"**Fecha de generación**: {datetime.now().strftime('%Y-%m-%d %H:%M UTC')}",
-        "",
-        "---",
-        "",
-        "## 📊 Estadísticas del Día",
-        "",
-    ]
-    
-    research_count = len([r for r in research if not r.get('error')])
-    docs_count = len([d for d in docs if not d.get('error')])
-    github_count = len([g for g in github if not g.get('error')])
-    
-    lines.extend([
-        f"- **🔬 Research**: [{research_count} papers](./research/{date_str}.md)",
-        f"- **💻 GitHub**: [{github_count} repos con actividad](./github/{date_str}.md)",
-        "",
-        "---",
-        "",
-        "## 🔗 Links Rápidos",
-        "",
-        "- [Anthropic Research](https://www.anthropic.com/research)",
-        "- [Claude Docs](https://docs.anthropic.com)",
-        "- [Anthropic GitHub](https://github.com/anthropics)",
-        "",
-        "---",
-        "",
-        "*Generado automáticamente*",
-    ])
-    
-    return '\n'.join(lines)
+    return render.render_text(render.summary_markdown(date_str, research, docs, github, generated_at))
 
 
-def main():
-    """Función principal."""
-    today = datetime.now().strftime('%Y-%m-%d')
-    github_token = os.environ.get('GITHUB_TOKEN')
-    
-    print(f"🔍 Generando resumen para {today}...")
-    print("")
-    
-    # Inicializar scraper
-    scraper = AnthropicScraper(github_token)
-    
-    # Obtener datos
-    print("📄 Scrapeando Research...")
-    research = scraper.scrape_research()
-    
-    print("📚 Scrapeando Docs...")
-    docs = scraper.scrape_docs()
-    
-    print("💻 Obteniendo GitHub updates...")
-    github = scraper.get_github_updates()
+def build_scraper():
+    """Crea el scraper con la configuración del entorno; devuelve (scraper, caché HTTP)."""
+    from http_cache import HTTPCache
+
+    max_workers = int(os.environ.get('GITHUB_MAX_WORKERS', '8'))
+    github_backend = os.environ.get('GITHUB_BACKEND', 'rest')
+    # Caché HTTP condicional (HTTP_CACHE_DIR vacío la desactiva)
+    cache_dir = os.environ.get('HTTP_CACHE_DIR', '.cache/http')
+    http_cache = HTTPCache(cache_dir) if cache_dir else None
+    scraper = AnthropicScraper(os.environ.get('GITHUB_TOKEN'), max_workers=max_workers,
+                               github_backend=github_backend, http_cache=http_cache,
+                               research_url=os.environ.get('RESEARCH_URL', RESEARCH_URL),
+                               github_api_url=os.environ.get('GITHUB_API_URL'),
+                               watermarks=WatermarkStore(), paper_details=PaperDetailsStore())
+    return scraper, http_cache
+
+
+def print_written(path: str, written: int, detail: str = '') -> None:
+    """Línea de progreso de un fichero: escrito o sin cambios (no reescrito)."""
+    if written:
+        print(f"  ✅ {path}{detail}")
+    else:
+        print(f"  💤 {path} (sin cambios, no reescrito)")
+
+
+def write_outputs(today: str, results: Dict[str, List[Dict]], seen: SeenStore,
+                  kinds=('research', 'docs', 'github'), orgs: Optional[List[str]] = None):
+    """Escribe los ficheros del día a partir de los items de cada tipo.
+
+    Solo se regeneran los ficheros de `kinds` (más el resumen, los datos y el
+    índice de búsqueda, que dependen de todos); el modo watch lo usa para
+    reescribir únicamente lo que cambió. `orgs` son las organizaciones de
+    GitHub configuradas (pie y nombres del markdown de GitHub).
+    """
+    research, docs, github = results['research'], results['docs'], results['github']
+    if 'docs' in kinds:
+        from changelog import merge_recorded_versions
+
+        # Un segundo sondeo del día no pierde las versiones ya publicadas hoy
+        docs = merge_recorded_versions(docs, artifacts.read_day('docs', today))
+    # Registros tipados: fechas parseadas y utilidad calculada una sola vez
+    research, github = to_papers(research), to_repo_updates(github)
     
     # Crear carpetas
     os.makedirs('daily/research', exist_ok=True)
+    os.makedirs('daily/docs', exist_ok=True)
     os.makedirs('daily/github', exist_ok=True)
     
     # Generar archivos individuales
@@ -536,123 +522,406 @@ def main():
     
     # Research - solo si hay papers nuevos
     research_file = f"daily/research/{today}.md"
-    if research and not research[0].get('error'):
-        if has_new_papers(research, today):
-            research_md = generate_research_markdown(today, research)
-            with open(research_file, 'w', encoding='utf-8') as f:
-                f.write(research_md)
-            print(f"  ✅ daily/research/{today}.md ({len(research)} nuevos papers)")
+    if 'research' in kinds:
+        if research and not research[0].get('error'):
+            if has_new_papers(research, today, seen):
+                with metrics.span('render.research'):
+                    written = render.write_markdown(research_file, render.research_markdown(today, research))
+                print_written(research_file, written, f" ({len(research)} nuevos papers)")
+            else:
+                print(f"  ⏭️  daily/research/{today}.md (sin papers nuevos, no generado)")
         else:
-            print(f"  ⏭️  daily/research/{today}.md (sin papers nuevos, no generado)")
-    else:
-        print(f"  ⚠️  daily/research/{today}.md (error al obtener datos)")
+            print(f"  ⚠️  daily/research/{today}.md (error al obtener datos)")
+    
+    # Docs - solo si el CHANGELOG tiene versiones nuevas
+    if 'docs' in kinds:
+        if any(d.get('version') for d in docs):
+            with metrics.span('render.docs'):
+                written = render.write_markdown(f"daily/docs/{today}.md", render.docs_markdown(today, docs))
+            print_written(f"daily/docs/{today}.md", written,
+                          f" ({len([d for d in docs if d.get('version')])} versiones nuevas)")
+        elif docs and docs[0].get('error'):
+            print(f"  ⚠️  daily/docs/{today}.md (error al obtener datos)")
+        else:
+            print(f"  ⏭️  daily/docs/{today}.md (sin versiones nuevas, no generado)")
     
     # GitHub
-    github_md = generate_github_markdown(today, github)
-    with open(f"daily/github/{today}.md", 'w', encoding='utf-8') as f:
-        f.write(github_md)
-    print(f"  ✅ daily/github/{today}.md")
+    if 'github' in kinds:
+        with metrics.span('render.github'):
+            written = render.write_markdown(f"daily/github/{today}.md",
+                                           render.github_markdown(today, github, orgs=orgs))
+        print_written(f"daily/github/{today}.md", written)
     
     # Resumen general
-    summary_md = generate_summary_markdown(today, research, docs, github)
-    with open(f"daily/{today}.md", 'w', encoding='utf-8') as f:
-        f.write(summary_md)
-    print(f"  ✅ daily/{today}.md (resumen)")
+    with metrics.span('render.summary'):
+        written = render.write_markdown(f"daily/{today}.md", render.summary_markdown(today, research, docs, github))
+    print_written(f"daily/{today}.md", written, " (resumen)")
+    
+    # Datos estructurados del día (NDJSON por tipo + fichero combinado)
+    sections = {'research': research, 'docs': docs, 'github': github}
+    changed = {kind: sections[kind] for kind in kinds}
+    with metrics.span('write.data'):
+        data_files = artifacts.write_day(today, changed)
+    print(f"  ✅ {artifacts.DATA_DIR}/ ({len(data_files)} ficheros NDJSON)")
+    
+    # Índice de búsqueda: solo los items de hoy que aún no estaban
+    with metrics.span('write.search'):
+        with open_search_index() as index:
+            indexed = index.index_day(today, changed)
+    print(f"  🔎 Índice de búsqueda: {indexed} items nuevos")
+    
+    # Otros formatos opcionales (OUTPUT_FORMATS=json,html,rss)
+    for fmt in [f.strip() for f in os.environ.get('OUTPUT_FORMATS', '').split(',') if f.strip()]:
+        if fmt not in render.FORMATS:
+            print(f"  ⚠️  Formato desconocido: {fmt}")
+            continue
+        document, pattern = render.FORMATS[fmt]
+        path = pattern.format(date=today)
+        with metrics.span(f'render.{fmt}'):
+            written = render.write_stream(path, document(today, sections))
+        print_written(path, written)
+    
+    # Registrar lo visto hoy
+    if 'research' in kinds and research and not research[0].get('error'):
+        seen.mark_many((p['url'] for p in research if p.get('url')), 'paper', today)
+    if 'github' in kinds:
+        github_keys = github_item_keys(github)
+        new_commits = seen.mark_many(github_keys['commit'], 'commit', today)
+        new_releases = seen.mark_many(github_keys['release'], 'release', today)
+        print(f"  🗂️  GitHub: {new_commits} commits y {new_releases} releases no vistos antes")
+    
+    # Agregados del día (solo items nuevos) e informes de la semana y el mes en curso
+    with metrics.span('write.rollups'):
+        aggregates = open_aggregates(seen)
+        rollups.update_day(aggregates, today, seen,
+                           research=research if 'research' in kinds else None,
+                           github=github if 'github' in kinds else None)
+        aggregates.flush()
+        reports = rollups.write_reports(aggregates, today)
+    for path, written in reports:
+        print_written(path, written)
+    with metrics.span('state.flush'):
+        seen.flush()
+
+
+def main():
+    """Función principal."""
+    today = datetime.now().strftime('%Y-%m-%d')
+    
+    print(f"🔍 Generando resumen para {today}...")
+    print("")
+    
+    # Instrumentación opcional (SCRAPER_METRICS=1, SCRAPER_TRACE=1 para traza detallada)
+    configure_metrics()
+    # Solo se reescriben las salidas cuyo contenido cambió
+    outputs.configure()
+    
+    # Inicializar scraper
+    scraper, http_cache = build_scraper()
+    
+    # Obtener datos: las fuentes van a hosts independientes, se lanzan a la vez
+    sources = load_sources(os.environ.get('SOURCES_CONFIG', DEFAULT_CONFIG_PATH))
+    print(f"📄📚💻 Consultando {len(sources)} fuentes en paralelo...")
+    results, latencies = collect_sources(sources, scraper, ResultCache())
+    print_latencies(latencies)
+    print("")
+    
+    # Estado de items vistos (papers, commits, releases)
+    with metrics.span('state.load'):
+        seen = open_seen_store()
+    
+    write_outputs(today, results, seen, orgs=github_orgs(sources))
+    scraper.commit_changelogs()
     
     print("")
     print("✅ Todos los archivos generados")
+    if http_cache is not None:
+        print(f"  💾 Caché HTTP: {http_cache.hits} hits, {http_cache.revalidated} revalidadas (304), "
+              f"{http_cache.misses} descargas")
     
     # Actualizar índice
-    update_index()
+    with metrics.span('write.index'):
+        update_index(today)
+    outputs.report()
+    
+    if metrics.enabled:
+        if http_cache is not None:
+            metrics.incr('http.cache_revalidated', http_cache.revalidated)
+        metrics_file = f"daily/metrics/{today}.json"
+        metrics.write(metrics_file)
+        print(f"📈 Métricas del run en {metrics_file}")
 
 
-def has_new_papers(current_papers: List[Dict], today: str) -> bool:
-    """Comprueba si hay papers nuevos comparando con el día anterior."""
-    import glob
-    
-    # Buscar archivo de research del día anterior
-    research_files = sorted(glob.glob('daily/research/*.md'), reverse=True)
+def has_new_papers(current_papers: List[Dict], today: str, store: Optional[SeenStore] = None) -> bool:
+    """Comprueba si hay papers que no se habían visto nunca antes de hoy."""
+    if store is None:
+        store = open_seen_store()
     
-    if not research_files:
-        return True  # No hay archivos previos, todo es nuevo
+    current_urls = [paper['url'] for paper in current_papers if paper.get('url')]
+    new_urls = store.new_keys(current_urls, today)
     
-    # Leer el archivo más reciente que NO sea el de hoy
-    previous_file = None
-    for f in research_files:
-        if today not in f:
-            previous_file = f
-            break
-    
-    if not previous_file:
-        return True  # No hay archivo previo
+    if new_urls:
+        print(f"    📄 {len(new_urls)} papers nuevos encontrados")
+        return True
     
+    print("    📄 Sin papers nuevos (todos vistos en días anteriores)")
+    return False
+
+
+def open_seen_store(path: str = DEFAULT_STATE_PATH) -> SeenStore:
+    """Abre el estado de items vistos, sembrándolo desde el histórico la primera vez."""
+    store = SeenStore(path)
+    if not store.exists:
+        # Los artefactos NDJSON mandan; el markdown solo cubre los días anteriores a ellos
+        seeded = bootstrap_from_artifacts(store)
+        seeded += bootstrap_from_markdown(store, skip_dates=artifacts.days_with_data('research'))
+        store.flush()
+        print(f"    🗂️  Estado inicializado con {seeded} papers del histórico")
+    return store
+
+
+def open_aggregates(seen: SeenStore, path: str = DEFAULT_AGGREGATES_PATH) -> AggregateStore:
+    """Abre los agregados diarios, calculándolos desde los artefactos NDJSON la primera vez."""
+    store = AggregateStore(path)
+    if not store.exists:
+        days = rollups.bootstrap(store, seen)
+        store.flush()
+        print(f"    📊 Agregados inicializados con {days} días del histórico")
+    return store
+
+
+def open_search_index() -> SearchIndex:
+    """Abre el índice de búsqueda, construyéndolo desde el histórico la primera vez."""
+    index = SearchIndex()
+    if index.created:
+        # Igual que el estado de vistos: NDJSON primero, markdown para los días anteriores
+        added = index_artifacts(index)
+        added += index_history(index, skip_dates=artifacts.days_with_data('github'))
+        print(f"    🔎 Índice de búsqueda inicializado con {added} items del histórico")
+    return index
+
+
+def run_search(query: str, start: Optional[str] = None, end: Optional[str] = None,
+               repo: Optional[str] = None, kind: Optional[str] = None, limit: int = 20):
+    """Busca en el histórico e imprime fecha, fuente, título y URL."""
+    import time
+
+    with open_search_index() as index:
+        started = time.perf_counter()
+        results = index.search(query, start=start, end=end, repo=repo, kind=kind, limit=limit)
+        elapsed = (time.perf_counter() - started) * 1000
+    for item in results:
+        source = f"{item['source']}:{item['repo']}" if item['repo'] else item['source']
+        print(f"{item['date']}  {source:<40}  {item['title'][:80]}\n            {item['url']}")
+    print(f"🔎 {len(results)} resultados en {elapsed:.1f} ms")
+
+
+def run_watch(max_polls: Optional[int] = None):
+    """Modo watch: sondea cada fuente en su intervalo y regenera solo lo que cambia."""
+    from daemon import Watcher
+
+    configure_metrics()
+    outputs.configure()
+    scraper, http_cache = build_scraper()
+    sources = load_sources(os.environ.get('SOURCES_CONFIG', DEFAULT_CONFIG_PATH))
+    seen = open_seen_store()
+
+    def on_change(day: str, results: Dict[str, List[Dict]], kinds):
+        write_outputs(day, results, seen, kinds, orgs=github_orgs(sources))
+        scraper.commit_changelogs()
+        update_index(day)
+        outputs.report()
+
+    intervals = ', '.join(f"{s.name} cada {s.interval:g}s" for s in sources)
+    print(f"👀 Modo watch: {intervals} (Ctrl+C para salir)")
+    watcher = Watcher(scraper, sources, on_change)
     try:
-        with open(previous_file, 'r', encoding='utf-8') as f:
-            previous_content = f.read()
-        
-        # Extraer URLs de papers del archivo anterior
-        import re
-        previous_urls = set(re.findall(r'https://www\.anthropic\.com/research/[^\s\)\]]+', previous_content))
-        
-        # Comprobar si algún paper actual es nuevo
-        current_urls = {paper['url'] for paper in current_papers if paper.get('url')}
-        
-        new_urls = current_urls - previous_urls
-        
-        if new_urls:
-            print(f"    📄 {len(new_urls)} papers nuevos encontrados")
-            return True
-        else:
-            print(f"    📄 Sin papers nuevos (todos ya estaban en {os.path.basename(previous_file)})")
-            return False
-            
-    except Exception as e:
-        print(f"    ⚠️ Error comparando con archivo anterior: {e}")
-        return True  # En caso de error, generar de todos modos
+        watcher.run(max_polls)
+    except KeyboardInterrupt:
+        print("")
+    finally:
+        seen.flush()
+        if scraper.watermarks is not None:
+            scraper.watermarks.flush()
+    print(f"👋 Modo watch detenido tras {watcher.polls} sondeos")
+    if http_cache is not None:
+        print(f"  💾 Caché HTTP: {http_cache.hits} hits, {http_cache.revalidated} revalidadas (304), "
+              f"{http_cache.misses} descargas")
+
+
+def run_render(date: Optional[str] = None):
+    """Regenera el markdown de un día desde sus artefactos NDJSON, sin ir a la red.
+
+    Se conserva la fecha de generación de los ficheros existentes, de modo que
+    re-renderizar con los mismos datos deja los ficheros idénticos.
+    """
+    date = date or next(iter(sorted(artifacts.days_with_data('github'), reverse=True)), None)
+    sections = {kind: artifacts.read_day(kind, date) for kind in ('research', 'docs', 'github')} if date else {}
+    if not any(items is not None for items in sections.values()):
+        raise SystemExit(f"❌ No hay artefactos NDJSON para {date or 'ningún día'}")
+    research, docs = to_papers(sections['research'] or []), sections['docs'] or []
+    github = to_repo_updates(sections['github'] or [])
+    
+    print(f"📝 Renderizando {date} desde {artifacts.DATA_DIR}/...")
+    outputs.configure()
+    targets = []
+    if sections['research'] is not None and os.path.exists(f"daily/research/{date}.md"):
+        targets.append((f"daily/research/{date}.md", render.research_markdown, research))
+    if any(d.get('version') for d in docs):
+        targets.append((f"daily/docs/{date}.md", render.docs_markdown, docs))
+    if sections['github'] is not None:
+        orgs = github_orgs(load_sources(os.environ.get('SOURCES_CONFIG', DEFAULT_CONFIG_PATH)))
+        targets.append((f"daily/github/{date}.md", partial(render.github_markdown, orgs=orgs), github))
+    for path, renderer, items in targets:
+        print_written(path, render.write_markdown(path, renderer(date, items, render.existing_timestamp(path))))
+    summary = f"daily/{date}.md"
+    written = render.write_markdown(summary, render.summary_markdown(date, research, docs, github,
+                                                                     render.existing_timestamp(summary)))
+    print_written(summary, written, " (resumen)")
+    outputs.report()
+
+
+def run_index(date: Optional[str] = None):
+    """Actualiza el índice del README/archivo y el de búsqueda con lo que hay en disco."""
+    outputs.configure()
+    update_index(date)
+    outputs.report()
+    with open_search_index() as index:
+        added = index_artifacts(index, [date] if date else None)
+        total = index.count()
+    print(f"🔎 Índice de búsqueda: {added} items nuevos ({total} en total)")
+
 
+def run_rollup(date: Optional[str] = None):
+    """Regenera los informes semanal y mensual de `date` desde los agregados, sin ir a la red."""
+    date = date or datetime.now().strftime('%Y-%m-%d')
+    outputs.configure()
+    aggregates = open_aggregates(open_seen_store())
+    print(f"📊 Informes de {date} desde {aggregates.path}...")
+    for path, written in rollups.write_reports(aggregates, date):
+        print_written(path, written)
+    outputs.report()
 
-def update_index():
-    """Actualiza el README con índice."""
+
+def run_compact(before: Optional[str] = None):
+    """Empaqueta en un zip por mes los artefactos NDJSON de los meses ya cerrados."""
+    packed = artifacts.compact(before=before)
+    for month, days in packed.items():
+        print(f"  📦 {artifacts.pack_path(month)} ({days} ficheros)")
+    print(f"✅ {sum(packed.values())} ficheros empaquetados en {len(packed)} meses")
+
+
+def update_index(date: Optional[str] = None):
+    """Actualiza el índice del README y el archivo mensual con la fila de `date`."""
     try:
-        research_files = sorted([f for f in os.listdir('daily/research') if f.endswith('.md')], reverse=True)
-        
-        with open('README.md', 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        index_start = content.find('## 📅 Histórico')
-        if index_start == -1:
-            return
-        
-        index_end = content.find('## ', index_start + 1)
-        if index_end == -1:
-            index_end = len(content)
-        
-        new_index = [
-            "## 📅 Histórico",
-            "",
-            "| Fecha | Research | Docs | GitHub | Resumen |",
-            "|-------|----------|------|--------|---------|"
-        ]
-        
-        for filename in research_files[:30]:
-            date = filename.replace('.md', '')
-            new_index.append(
-                f"| {date} | "
-                f"[Research](./daily/research/{filename}) | "
-                f"[Docs](./daily/docs/{filename}) | "
-                f"[GitHub](./daily/github/{filename}) | "
-                f"[Resumen](./daily/{filename}) |"
-            )
-        
-        new_content = content[:index_start] + '\n'.join(new_index) + '\n\n' + content[index_end:]
-        
-        with open('README.md', 'w', encoding='utf-8') as f:
-            f.write(new_content)
-        
-        print("✅ Índice actualizado")
+        updated = update_history_index(date)
+        if updated:
+            print(f"✅ Índice actualizado ({updated})")
     except Exception as e:
         print(f"⚠️ Error actualizando índice: {e}")
 
 
+def record_backfilled_days(days: List[str]):
+    """Lleva al estado los días regenerados: vistos, agregados e informes y fichero combinado."""
+    sections = {day: artifacts.read_day('github', day) or [] for day in days}
+    seen = open_seen_store()
+    moved = set()
+    for day in sorted(sections):
+        moved |= seed_github_day(seen, day, sections[day])
+    seen.flush()
+
+    # Los días cuyos items aparecen ahora antes también cambian de agregados
+    aggregates = open_aggregates(seen)
+    recompute = sorted(set(sections) | moved)
+    for day in recompute:
+        records = sections[day] if day in sections else artifacts.read_day('github', day)
+        rollups.update_day(aggregates, day, seen, github=records)
+    aggregates.flush()
+    for path, written in rollups.write_period_reports(aggregates, recompute):
+        print_written(path, written)
+
+    artifacts.update_rolling_days({day: {'github': records} for day, records in sections.items() if records},
+                                  today=datetime.now().strftime('%Y-%m-%d'))
+    print(f"  🗂️  Estado actualizado con {len(days)} días ({len(moved)} días anteriores recalculados)")
+
+
+def run_backfill(start: str, end: str, processes: Optional[int] = None):
+    """Regenera GitHub y resumen de los días entre `start` y `end` (ambos incluidos).
+
+    Después actualiza el estado que deriva de esos días: items vistos,
+    agregados e informes semanales/mensuales, fichero combinado e índices.
+    """
+    from backfill import backfill
+
+    start_date = datetime.strptime(start, '%Y-%m-%d').date()
+    end_date = datetime.strptime(end, '%Y-%m-%d').date()
+    if end_date < start_date:
+        raise SystemExit("❌ --to debe ser posterior o igual a --from")
+    configure_metrics()
+    scraper = AnthropicScraper(os.environ.get('GITHUB_TOKEN'),
+                               max_workers=int(os.environ.get('GITHUB_MAX_WORKERS', '8')),
+                               github_api_url=os.environ.get('GITHUB_API_URL'))
+    sources = load_sources(os.environ.get('SOURCES_CONFIG', DEFAULT_CONFIG_PATH))
+    days = backfill(scraper, sources, start_date, end_date, processes=processes)
+    outputs.configure()
+    record_backfilled_days(days)
+    for day in days:
+        update_index(day)
+    outputs.report()
+    with open_search_index() as index:
+        added = index_artifacts(index, days)
+    print(f"  🔎 Índice de búsqueda: {added} items nuevos")
+
+
+def parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Resumen diario de Anthropic (sin subcomando: run)")
+    commands = parser.add_subparsers(dest='command')
+    commands.add_parser('run', help="Ejecución diaria: consulta las fuentes y escribe los ficheros del día")
+    render_parser = commands.add_parser('render', help="Regenera el markdown de un día desde sus artefactos NDJSON")
+    render_parser.add_argument('--date', help="Día (YYYY-MM-DD); por defecto el último con datos")
+    index_parser = commands.add_parser('index', help="Actualiza el índice del README, el archivo y la búsqueda")
+    index_parser.add_argument('--date', help="Día (YYYY-MM-DD); por defecto el más reciente / todos")
+    backfill_parser = commands.add_parser('backfill', help="Regenera los días de un rango de fechas")
+    backfill_parser.add_argument('--from', dest='start', required=True, help="Primer día (YYYY-MM-DD)")
+    backfill_parser.add_argument('--to', dest='end', required=True, help="Último día (YYYY-MM-DD)")
+    backfill_parser.add_argument('--processes', type=int, default=None,
+                                 help="Procesos para renderizar (por defecto, uno por CPU)")
+    rollup_parser = commands.add_parser('rollup', help="Regenera los informes semanal y mensual desde los agregados")
+    rollup_parser.add_argument('--date', help="Día (YYYY-MM-DD) de la semana y el mes; por defecto hoy")
+    compact_parser = commands.add_parser('compact', help="Empaqueta los artefactos NDJSON de los meses cerrados")
+    compact_parser.add_argument('--before', help="Solo meses anteriores a este (YYYY-MM); por defecto el actual")
+    watch_parser = commands.add_parser('watch', help="Proceso continuo que sondea cada fuente en su intervalo")
+    watch_parser.add_argument('--max-polls', type=int, default=None,
+                              help="Termina tras este número de sondeos (por defecto, nunca)")
+    search_parser = commands.add_parser('search', help="Busca en el histórico (fecha, fuente, título y URL)")
+    search_parser.add_argument('query', help="Términos a buscar (todos deben aparecer)")
+    search_parser.add_argument('--from', dest='start', help="Desde este día (YYYY-MM-DD)")
+    search_parser.add_argument('--to', dest='end', help="Hasta este día (YYYY-MM-DD)")
+    search_parser.add_argument('--repo', help="Solo items de este repo (p. ej. claude-code)")
+    search_parser.add_argument('--source', dest='kind',
+                               choices=('research', 'docs', 'repo', 'commit', 'release'),
+                               help="Solo items de esta fuente")
+    search_parser.add_argument('--limit', type=int, default=20, help="Máximo de resultados")
+    return parser.parse_args(argv)
+
+
 if __name__ == '__main__':
-    main()
+    args = parse_args()
+    if args.command == 'render':
+        run_render(args.date)
+    elif args.command == 'index':
+        run_index(args.date)
+    elif args.command == 'backfill':
+        run_backfill(args.start, args.end, args.processes)
+    elif args.command == 'rollup':
+        run_rollup(args.date)
+    elif args.command == 'compact':
+        run_compact(args.before)
+    elif args.command == 'watch':
+        run_watch(args.max_polls)
+    elif args.command == 'search':
+        run_search(args.query, args.start, args.end, args.repo, args.kind, args.limit)
+    else:
+        main()
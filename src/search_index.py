@@ -0,0 +1,198 @@
+"""
+Índice de búsqueda de texto completo sobre el histórico (SQLite FTS5).
+Cada ejecución añade solo los items que escribe; una tabla de claves ya
+indexadas hace que volver a indexar un día no duplique nada. El índice no se
+versiona: si falta, se reconstruye desde los artefactos y el markdown.
+"""
+import os
+import re
+import glob
+import sqlite3
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import artifacts
+from records import Record
+
+DEFAULT_INDEX_PATH = '.cache/search.sqlite'
+
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS items USING fts5(
+    title, body,
+    url UNINDEXED, day UNINDEXED, kind UNINDEXED, repo UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS indexed (key TEXT PRIMARY KEY, day TEXT NOT NULL);
+"""
+
+# Documento indexable: (clave, kind, repo, título, cuerpo, url)
+Document = Tuple[str, str, Optional[str], str, str, str]
+
+
+def _get(item, key: str, default=None):
+    return item.get(key, default) if isinstance(item, (dict, Record)) else default
+
+
+def _release_title(repo: str, tag: str, name: Optional[str]) -> str:
+    return f"{repo} {tag}" if not name or name == tag else f"{repo} {tag} {name}"
+
+
+def documents(sections: Dict[str, List]) -> Iterator[Document]:
+    """Documentos a indexar a partir de las secciones de un día (records o dicts)."""
+    for paper in sections.get('research', []):
+        if _get(paper, 'error') or not _get(paper, 'url'):
+            continue
+        body = [paper.get('description') or '', paper.get('abstract') or '', ', '.join(paper.get('authors') or [])]
+        yield (f"paper:{paper['url']}", 'research', None, paper.get('title') or '',
+               '\n'.join(part for part in body if part), paper['url'])
+
+    for entry in sections.get('docs', []):
+        if not _get(entry, 'version'):
+            continue
+        url = f"{entry['url']}#v{entry['version'].replace('.', '')}"
+        yield (f"version:{url}", 'docs', None, f"Claude Code v{entry['version']}",
+               '\n'.join(entry.get('changes', [])), url)
+
+    for repo in sections.get('github', []):
+        if _get(repo, 'error'):
+            continue
+        name = repo['name']
+        yield (f"repo:{repo['url']}", 'repo', name, name, repo.get('description') or '', repo['url'])
+        for commit in repo.get('commits', []):
+            yield (f"commit:{commit['url']}", 'commit', name, commit.get('message') or '',
+                   commit.get('author') or '', commit['url'])
+        for release in repo.get('releases', []):
+            yield (f"release:{release['url']}", 'release', name,
+                   _release_title(name, release['tag'], release.get('name')),
+                   release.get('body') or '', release['url'])
+
+
+def fts_query(text: str) -> str:
+    """Convierte texto libre en una consulta FTS5 segura (términos entre comillas, AND)."""
+    terms = re.findall(r'[\w][\w.\-/]*', text, flags=re.UNICODE)
+    return ' '.join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+class SearchIndex:
+    """Índice FTS5 en disco."""
+
+    def __init__(self, path: Optional[str] = None):
+        path = path or os.environ.get('SEARCH_INDEX_PATH', DEFAULT_INDEX_PATH)
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.created = not os.path.exists(path)
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> 'SearchIndex':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def add(self, day: str, docs: Iterator[Document]) -> int:
+        """Indexa los documentos que aún no estén; devuelve cuántos se añadieron."""
+        added = 0
+        with self.db:
+            for key, kind, repo, title, body, url in docs:
+                inserted = self.db.execute(
+                    "INSERT OR IGNORE INTO indexed (key, day) VALUES (?, ?)", (key, day)).rowcount
+                if inserted:
+                    self.db.execute(
+                        "INSERT INTO items (title, body, url, day, kind, repo) VALUES (?, ?, ?, ?, ?, ?)",
+                        (title, body, url, day, kind, repo))
+                    added += 1
+        return added
+
+    def index_day(self, day: str, sections: Dict[str, List]) -> int:
+        return self.add(day, documents(sections))
+
+    def search(self, text: str, start: Optional[str] = None, end: Optional[str] = None,
+               repo: Optional[str] = None, kind: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """Busca `text`; resultados por relevancia y, a igualdad, los más recientes primero."""
+        query = fts_query(text)
+        if not query:
+            return []
+        sql = ["SELECT day, kind, repo, title, url FROM items WHERE items MATCH ?"]
+        params: list = [query]
+        for clause, value in (("day >= ?", start), ("day <= ?", end), ("repo = ?", repo), ("kind = ?", kind)):
+            if value:
+                sql.append("AND " + clause)
+                params.append(value)
+        sql.append("ORDER BY bm25(items, 10.0, 1.0), day DESC LIMIT ?")
+        params.append(limit)
+        rows = self.db.execute(' '.join(sql), params).fetchall()
+        return [{'date': d, 'source': k, 'repo': r, 'title': t, 'url': u} for d, k, r, t, u in rows]
+
+    def count(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM indexed").fetchone()[0]
+
+
+def index_artifacts(index: SearchIndex, days: Optional[List[str]] = None,
+                    data_dir: str = artifacts.DATA_DIR) -> int:
+    """Indexa los artefactos NDJSON de `days` (todos los días con datos si es None)."""
+    added = 0
+    for kind in ('research', 'docs', 'github'):
+        for day in (days if days is not None else artifacts.days_with_data(kind, data_dir)):
+            records = artifacts.read_day(kind, day, data_dir)
+            if records:
+                added += index.index_day(day, {kind: records})
+    return added
+
+
+# -- migración del histórico en markdown -----------------------------------
+
+_MD_PAPER = re.compile(r'^### \[(.+)\]\((\S+)\)$', re.MULTILINE)
+_MD_REPO = re.compile(r'^### `(.+)`$')
+_MD_COMMIT = re.compile(r'^- `(.*)`: \[(.*)\]\((\S+)\)$')
+_MD_RELEASE = re.compile(r'^- \[(.+)\]\((\S+)\) - (.*)$')
+_MD_REPO_LINK = re.compile(r'^\[Ver en GitHub →\]\((\S+)\)$')
+
+
+def markdown_documents(day: str, daily_dir: str = 'daily') -> Iterator[Document]:
+    """Documentos de un día anterior a los artefactos NDJSON, leídos del markdown."""
+    research = os.path.join(daily_dir, 'research', f"{day}.md")
+    if os.path.exists(research):
+        with open(research, 'r', encoding='utf-8') as f:
+            for title, url in _MD_PAPER.findall(f.read()):
+                yield (f"paper:{url}", 'research', None, title, '', url)
+
+    github = os.path.join(daily_dir, 'github', f"{day}.md")
+    if not os.path.exists(github):
+        return
+    repo, pending = None, []
+    with open(github, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            match = _MD_REPO.match(line)
+            if match:
+                repo, pending = match.group(1), []
+                continue
+            if repo is None:
+                continue
+            match = _MD_COMMIT.match(line)
+            if match:
+                author, message, url = match.groups()
+                pending.append((f"commit:{url}", 'commit', repo, message, author, url))
+                continue
+            match = _MD_RELEASE.match(line)
+            if match:
+                tag, url, name = match.groups()
+                pending.append((f"release:{url}", 'release', repo, _release_title(repo, tag, name), '', url))
+                continue
+            match = _MD_REPO_LINK.match(line)
+            if match:
+                url = match.group(1)
+                yield (f"repo:{url}", 'repo', repo, repo, '', url)
+                yield from pending
+                repo, pending = None, []
+
+
+def index_history(index: SearchIndex, daily_dir: str = 'daily', skip_dates=()) -> int:
+    """Indexa una sola vez los días en markdown que no tienen artefactos NDJSON."""
+    skip = set(skip_dates)
+    days = sorted({os.path.basename(p)[:-3] for pattern in ('research/*.md', 'github/*.md')
+                   for p in glob.glob(os.path.join(daily_dir, pattern))})
+    return sum(index.add(day, markdown_documents(day, daily_dir)) for day in days if day not in skip)
@@ -0,0 +1,282 @@
+"""
+Registro de fuentes configurable.
+Cada fuente (org de GitHub, página HTML de listado, CHANGELOG) es un plugin
+con la misma interfaz fetch/parse/normalize; el registro se construye desde
+un fichero de configuración y se ejecuta con el pipeline concurrente.
+"""
+import os
+import json
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from metrics import metrics
+from pipeline import SourceTask, run_sources
+
+DEFAULT_CONFIG_PATH = 'config/sources.json'
+DEFAULT_RESULTS_DIR = '.cache/sources'
+
+# Salida diaria a la que va cada tipo de item
+KINDS = ('research', 'docs', 'github')
+
+# Deadline por defecto de cada tipo de salida, en segundos
+# (sobrescribible con SOURCE_TIMEOUT_<TIPO>)
+DEFAULT_TIMEOUTS = {
+    kind: float(os.environ.get(f'SOURCE_TIMEOUT_{kind.upper()}', default))
+    for kind, default in (('research', 90), ('docs', 90), ('github', 900))
+}
+
+# Intervalo de sondeo por defecto de cada tipo en el modo watch, en segundos
+# (sobrescribible con SOURCE_INTERVAL_<TIPO> o con "interval" en la fuente)
+DEFAULT_INTERVALS = {
+    kind: float(os.environ.get(f'SOURCE_INTERVAL_{kind.upper()}', default))
+    for kind, default in (('research', 3600), ('docs', 900), ('github', 600))
+}
+
+SOURCE_TYPES: Dict[str, type] = {}
+
+
+def register(type_name: str):
+    """Decorador que registra una clase de fuente bajo `type_name`."""
+    def decorator(cls):
+        cls.type_name = type_name
+        SOURCE_TYPES[type_name] = cls
+        return cls
+    return decorator
+
+
+class Source:
+    """Fuente base: `collect` = normalize(parse(fetch())).
+
+    `fingerprint` identifica el contenido descargado; si coincide con el de la
+    última ejecución se reutilizan los items ya parseados (ver `ResultCache`),
+    así que el trabajo crece con las fuentes que cambian, no con su número.
+    """
+
+    type_name = ''
+    default_kind = 'research'
+
+    def __init__(self, name: str, kind: Optional[str] = None, timeout: Optional[float] = None,
+                 interval: Optional[float] = None, **options: Any):
+        self.name = name
+        self.kind = kind or self.default_kind
+        if self.kind not in KINDS:
+            raise ValueError(f"Fuente {name}: kind desconocido '{self.kind}'")
+        self.timeout = timeout or DEFAULT_TIMEOUTS[self.kind]
+        self.interval = interval or DEFAULT_INTERVALS[self.kind]
+        self.options = options
+
+    def fetch(self, scraper, cancel: threading.Event) -> Any:
+        raise NotImplementedError
+
+    def fingerprint(self, raw: Any) -> Optional[str]:
+        return None
+
+    def parse(self, raw: Any) -> List[Dict]:
+        return raw
+
+    def normalize(self, items: List[Dict]) -> List[Dict]:
+        return items
+
+    def collect(self, scraper, cancel: threading.Event, results: Optional['ResultCache'] = None) -> List[Dict]:
+        with metrics.span(f"{self.name}.fetch"):
+            raw = self.fetch(scraper, cancel)
+        fingerprint = self.fingerprint(raw)
+        items = results.get(self.name, fingerprint) if results is not None and fingerprint else None
+        if items is not None:
+            print(f"  ♻️  {self.name}: sin cambios, se reutiliza el resultado anterior")
+            metrics.incr('sources.unchanged')
+        else:
+            with metrics.span(f"{self.name}.parse"):
+                items = self.normalize(self.parse(raw))
+            if results is not None and fingerprint and not any(i.get('error') for i in items):
+                results.put(self.name, fingerprint, items)
+        if any(i.get('error') for i in items):
+            return items
+        with metrics.span(f"{self.name}.enrich"):
+            return self.enrich(scraper, items)
+
+    def enrich(self, scraper, items: List[Dict]) -> List[Dict]:
+        """Completa los items con datos de otras peticiones (tras la caché de resultados)."""
+        return items
+
+
+@register('html_listing')
+class HTMLListingSource(Source):
+    """Página HTML con una sección de enlaces (p. ej. anthropic.com/research).
+
+    Opciones: url (por defecto la de research del scraper), section, link_prefix,
+    base_url, limit, details (descargar resumen/autores/fecha de cada paper;
+    por defecto true).
+    """
+
+    default_kind = 'research'
+
+    def _url(self, scraper) -> str:
+        return self.options.get('url') or scraper.research_url
+
+    def fetch(self, scraper, cancel) -> Tuple[str, bytes]:
+        # La URL viaja con el contenido: la instancia se comparte entre ejecuciones
+        url = self._url(scraper)
+        response = scraper.session.get(url, timeout=30)
+        response.raise_for_status()
+        return url, response.content
+
+    def fingerprint(self, raw) -> Optional[str]:
+        return hashlib.sha256(raw[1]).hexdigest()
+
+    def parse(self, raw) -> List[Dict]:
+        from research import parse_research_html
+
+        url, content = raw
+        section = self.options.get('section', 'Publications')
+        host_url = '/'.join(url.split('/')[:3])
+        papers = parse_research_html(
+            content,
+            limit=self.options.get('limit', 5),
+            section=section,
+            link_prefix=self.options.get('link_prefix', '/research/'),
+            base_url=self.options.get('base_url', host_url),
+            source=self.options.get('source') or url.split('://', 1)[-1].removeprefix('www.').rstrip('/'),
+        )
+        if papers is None:
+            print(f"  No se encontró la sección {section} en {url}")
+            return [{
+                'error': True,
+                'message': f'No se encontró la sección {section} en la página'
+            }]
+        print(f"  Papers extraídos de {self.name}: {len(papers)}")
+        return papers
+
+    def enrich(self, scraper, items: List[Dict]) -> List[Dict]:
+        store = getattr(scraper, 'paper_details', None)
+        if not self.options.get('details', True) or store is None:
+            return items
+        from research import enrich_papers
+
+        return enrich_papers(scraper.session, items, store)
+
+
+@register('github_org')
+class GitHubOrgSource(Source):
+    """Actividad reciente de una organización de GitHub. Opciones: org, days_back."""
+
+    default_kind = 'github'
+
+    @property
+    def org(self) -> str:
+        return self.options.get('org', self.name)
+
+    def fetch(self, scraper, cancel):
+        return scraper.get_github_updates(
+            org_name=self.org,
+            days_back=self.options.get('days_back', 2),
+            cancel_event=cancel,
+        )
+
+    def normalize(self, items: List[Dict]) -> List[Dict]:
+        return [item if item.get('error') else dict(item, org=self.org) for item in items]
+
+
+def github_orgs(sources: List[Source]) -> List[str]:
+    """Organizaciones de las fuentes de GitHub configuradas, en orden."""
+    return list(dict.fromkeys(s.org for s in sources if isinstance(s, GitHubOrgSource)))
+
+
+@register('changelog')
+class ChangelogSource(Source):
+    """CHANGELOG de un repo (por defecto anthropics/claude-code). Opciones: repo, path."""
+
+    default_kind = 'docs'
+
+    def fetch(self, scraper, cancel):
+        return scraper.scrape_docs(repo=self.options.get('repo', 'anthropics/claude-code'),
+                                   path=self.options.get('path', 'CHANGELOG.md'))
+
+
+class ResultCache:
+    """Items parseados de cada fuente, indexados por la huella de su contenido."""
+
+    def __init__(self, directory: str = DEFAULT_RESULTS_DIR):
+        self.directory = directory
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.json")
+
+    def get(self, name: str, fingerprint: str) -> Optional[List[Dict]]:
+        try:
+            with open(self._path(name), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return data['items'] if data.get('fingerprint') == fingerprint else None
+
+    def put(self, name: str, fingerprint: str, items: List[Dict]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self._path(name) + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': fingerprint, 'items': items}, f, ensure_ascii=False)
+        os.replace(tmp_path, self._path(name))
+
+
+def default_sources() -> List[Source]:
+    """Fuentes históricas del proyecto, por si no hay fichero de configuración."""
+    return [
+        HTMLListingSource('anthropic-research'),
+        ChangelogSource('claude-code-changelog'),
+        GitHubOrgSource('anthropics', org='anthropics'),
+    ]
+
+
+def load_sources(path: str = DEFAULT_CONFIG_PATH) -> List[Source]:
+    """Construye las fuentes declaradas en el fichero JSON de configuración."""
+    if not os.path.exists(path):
+        return default_sources()
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    sources = []
+    names = set()
+    for entry in config.get('sources', []):
+        entry = dict(entry)
+        if entry.pop('enabled', True) is False:
+            continue
+        type_name = entry.pop('type')
+        if type_name not in SOURCE_TYPES:
+            raise ValueError(f"Tipo de fuente desconocido: {type_name}")
+        name = entry.pop('name')
+        if name in names:
+            raise ValueError(f"Fuente duplicada: {name}")
+        names.add(name)
+        sources.append(SOURCE_TYPES[type_name](name, **entry))
+    return sources
+
+
+def merge_kind(outputs: List[List[Dict]]) -> List[Dict]:
+    """Une los items de varias fuentes del mismo tipo.
+
+    Los placeholders de error solo se conservan si ninguna fuente del tipo
+    devolvió datos, para que los renderers sigan mostrando el error.
+    """
+    items = [item for output in outputs for item in output if not item.get('error')]
+    if items:
+        return items
+    errors = [item for output in outputs for item in output if item.get('error')]
+    if errors:
+        return errors[:1]
+    return [item for output in outputs for item in output]
+
+
+def collect_sources(sources: List[Source], scraper,
+                    results: Optional[ResultCache] = None) -> Tuple[Dict[str, List[Dict]], Dict[str, float]]:
+    """Ejecuta todas las fuentes en paralelo y agrupa los items por tipo de salida."""
+    tasks = [
+        SourceTask(source.name, lambda cancel, source=source: source.collect(scraper, cancel, results),
+                   source.timeout)
+        for source in sources
+    ]
+    by_name, latencies = run_sources(tasks)
+    by_kind = {
+        kind: merge_kind([by_name[s.name] for s in sources if s.kind == kind])
+        for kind in KINDS
+    }
+    return by_kind, latencies
@@ -0,0 +1,311 @@
+"""
+Estado persistente de items ya vistos (papers, commits, releases).
+Índice JSONL de solo-añadir con fechas de primera y última aparición, y
+cursores por repo para pedir a GitHub solo la actividad nueva, detalles
+de cada paper para descargar su página una sola vez y agregados diarios
+para los informes semanales y mensuales.
+"""
+import os
+import re
+import glob
+import json
+import threading
+from typing import List, Dict, Iterable, Optional, Set
+
+from artifacts import DATA_DIR, iter_records
+
+DEFAULT_STATE_PATH = 'daily/.state/seen.jsonl'
+DEFAULT_WATERMARKS_PATH = 'daily/.state/watermarks.json'
+DEFAULT_PAPER_DETAILS_PATH = 'daily/.state/paper_details.json'
+DEFAULT_AGGREGATES_PATH = 'daily/.state/aggregates.json'
+
+
+class SeenStore:
+    """Índice de items vistos, cargado en memoria para consultas O(1).
+
+    Cada línea del fichero es un registro ``{key, kind, first_seen, last_seen}``;
+    la última línea de una clave es la vigente. Solo se añaden líneas cuando un
+    item es nuevo o cambia su ``last_seen``, y el fichero se compacta cuando
+    las líneas obsoletas superan a las vigentes.
+    """
+
+    def __init__(self, path: str = DEFAULT_STATE_PATH):
+        self.path = path
+        self.items: Dict[str, Dict] = {}
+        self._lines = 0
+        self._pending: List[Dict] = []
+        self.exists = os.path.exists(path)
+        if self.exists:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    record = json.loads(line)
+                    self.items[record['key']] = record
+                    self._lines += 1
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.items
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self.items.get(key)
+
+    def is_new(self, key: str, today: str) -> bool:
+        """True si el item no se había visto antes de `today`."""
+        record = self.items.get(key)
+        return record is None or record['first_seen'] >= today
+
+    def new_keys(self, keys: Iterable[str], today: str) -> List[str]:
+        """Filtra las claves que son nuevas a fecha `today`."""
+        return [k for k in keys if self.is_new(k, today)]
+
+    def mark(self, key: str, kind: str, today: str) -> bool:
+        """Registra que el item se vio en `today`. Devuelve True si es nuevo."""
+        record = self.items.get(key)
+        if record is None:
+            record = {'key': key, 'kind': kind, 'first_seen': today, 'last_seen': today}
+        elif record['last_seen'] < today:
+            record = dict(record, last_seen=today)
+        else:
+            return False
+        is_new = key not in self.items
+        self.items[key] = record
+        self._pending.append(record)
+        return is_new
+
+    def mark_many(self, keys: Iterable[str], kind: str, today: str) -> int:
+        """Registra varios items; devuelve cuántos eran nuevos."""
+        return sum(1 for k in keys if self.mark(k, kind, today))
+
+    def flush(self) -> None:
+        """Persiste los cambios pendientes (añadiendo o compactando)."""
+        if not self._pending:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        if self._lines + len(self._pending) > 2 * len(self.items):
+            self._compact()
+        else:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                for record in self._pending:
+                    f.write(json.dumps(record, ensure_ascii=False, sort_keys=True) + '\n')
+            self._lines += len(self._pending)
+        self._pending = []
+        self.exists = True
+
+    def _compact(self) -> None:
+        """Reescribe el fichero con una línea por clave (ordenado, estable en git)."""
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for key in sorted(self.items):
+                f.write(json.dumps(self.items[key], ensure_ascii=False, sort_keys=True) + '\n')
+        os.replace(tmp_path, self.path)
+        self._lines = len(self.items)
+
+
+class WatermarkStore:
+    """Cursor de cada repo: `pushed_at`, último commit y última release vistos.
+
+    Además guarda los últimos commits (5) y releases (2) del repo, con su
+    fecha, para reconstruir la ventana de la ejecución diaria sin volver a
+    pedirlos. Un fichero JSON pequeño (una entrada por repo activo).
+    """
+
+    def __init__(self, path: str = DEFAULT_WATERMARKS_PATH):
+        self.path = path
+        self.repos: Dict[str, Dict] = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.repos = json.load(f)
+
+    def get(self, full_name: str) -> Optional[Dict]:
+        with self._lock:
+            return self.repos.get(full_name)
+
+    def update(self, full_name: str, pushed_at: Optional[str], commits: List[Dict], releases: List[Dict]) -> None:
+        """Guarda el cursor del repo a partir de sus commits/releases más recientes."""
+        mark = {
+            'pushed_at': pushed_at,
+            'commit_sha': commits[0].get('sha') if commits else None,
+            'commit_date': commits[0]['date'] if commits else None,
+            'release_id': releases[0].get('id') if releases else None,
+            'commits': commits,
+            'releases': releases,
+        }
+        with self._lock:
+            if self.repos.get(full_name) != mark:
+                self.repos[full_name] = mark
+                self.dirty = True
+
+    def flush(self) -> None:
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.repos, f, ensure_ascii=False, sort_keys=True, indent=1)
+                f.write('\n')
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+
+
+class PaperDetailsStore:
+    """Detalles de cada paper (resumen, autores, fecha normalizada) por URL.
+
+    Una página de detalle se descarga una sola vez en la vida del paper: las
+    siguientes ejecuciones leen el resultado de aquí.
+    """
+
+    def __init__(self, path: str = DEFAULT_PAPER_DETAILS_PATH):
+        self.path = path
+        self.papers: Dict[str, Dict] = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.papers = json.load(f)
+
+    def get(self, url: str) -> Optional[Dict]:
+        with self._lock:
+            return self.papers.get(url)
+
+    def put(self, url: str, details: Dict) -> None:
+        with self._lock:
+            self.papers[url] = details
+            self.dirty = True
+
+    def flush(self) -> None:
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.papers, f, ensure_ascii=False, sort_keys=True, indent=1)
+                f.write('\n')
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+
+
+class AggregateStore:
+    """Agregados de cada día con lo que apareció por primera vez ese día.
+
+    Por día: commits nuevos por repo, tags de las releases nuevas por repo y
+    papers nuevos por categoría. Un informe de semana o de mes suma unos pocos
+    buckets pequeños en lugar de releer el markdown o volver a GitHub.
+    """
+
+    SECTIONS = ('commits', 'releases', 'papers')
+
+    def __init__(self, path: str = DEFAULT_AGGREGATES_PATH):
+        self.path = path
+        self.days: Dict[str, Dict] = {}
+        self.dirty = False
+        self.exists = os.path.exists(path)
+        if self.exists:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.days = json.load(f)
+
+    def get(self, day: str) -> Dict:
+        return self.days.get(day, {})
+
+    def update(self, day: str, section: str, values: Dict) -> None:
+        """Sustituye una sección del día (recalcularla es idempotente)."""
+        bucket = self.days.setdefault(day, {})
+        if bucket.get(section) != values:
+            bucket[section] = values
+            self.dirty = True
+
+    def between(self, start: str, end: str) -> List[str]:
+        """Días con agregados entre `start` y `end` (ambos incluidos), ordenados."""
+        return sorted(day for day in self.days if start <= day <= end)
+
+    def flush(self) -> None:
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.days, f, ensure_ascii=False, sort_keys=True, indent=1)
+            f.write('\n')
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+        self.exists = True
+
+
+def _seed(store: SeenStore, key: str, kind: str, date: str) -> bool:
+    """Siembra un item visto en `date` (los días pueden llegar desordenados)."""
+    record = store.items.get(key)
+    if record is None:
+        store.items[key] = record = {'key': key, 'kind': kind, 'first_seen': date, 'last_seen': date}
+        store._pending.append(record)
+        return True
+    if record['first_seen'] > date or record['last_seen'] < date:
+        record = dict(record, first_seen=min(record['first_seen'], date), last_seen=max(record['last_seen'], date))
+        store.items[key] = record
+        store._pending.append(record)
+    return False
+
+
+def bootstrap_from_artifacts(store: SeenStore, data_dir: str = DATA_DIR) -> int:
+    """Siembra el estado con los papers, commits y releases de los NDJSON diarios."""
+    count = 0
+    for record in iter_records('research', data_dir=data_dir):
+        if record.get('url'):
+            count += _seed(store, record['url'], 'paper', record['day'])
+    for record in iter_records('github', data_dir=data_dir):
+        for commit in record.get('commits', []):
+            _seed(store, commit['url'], 'commit', record['day'])
+        for release in record.get('releases', []):
+            _seed(store, release['url'], 'release', record['day'])
+    return count
+
+
+def seed_github_day(store: SeenStore, date: str, repos: List[Dict]) -> Set[str]:
+    """Siembra los commits y releases de un día reconstruido (p. ej. por el backfill).
+
+    Devuelve los días que dejan de ser la primera aparición de algún item,
+    cuyos agregados hay que recalcular.
+    """
+    moved = set()
+    keys = github_item_keys(repos)
+    for kind in ('commit', 'release'):
+        for key in keys[kind]:
+            record = store.get(key)
+            if record is not None and record['first_seen'] > date:
+                moved.add(record['first_seen'])
+            _seed(store, key, kind, date)
+    return moved
+
+
+def bootstrap_from_markdown(store: SeenStore, research_dir: str = 'daily/research',
+                            skip_dates: Iterable[str] = ()) -> int:
+    """Migración única: siembra el estado con los papers de los markdown existentes.
+
+    Solo para los días anteriores a los artefactos NDJSON (`skip_dates`).
+    """
+    skip = set(skip_dates)
+    count = 0
+    for path in sorted(glob.glob(os.path.join(research_dir, '*.md'))):
+        date = os.path.basename(path)[:-3]
+        if date in skip:
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            urls = set(re.findall(r'https://www\.anthropic\.com/research/[^\s\)\]]+', f.read()))
+        for url in sorted(urls):
+            count += _seed(store, url, 'paper', date)
+    return count
+
+
+def github_item_keys(repos: List[Dict]) -> Dict[str, List[str]]:
+    """Claves de los commits y releases de un resultado de get_github_updates."""
+    commits, releases = [], []
+    for repo in repos:
+        if repo.get('error'):
+            continue
+        commits.extend(c['url'] for c in repo.get('commits', []) if c.get('url'))
+        releases.extend(r['url'] for r in repo.get('releases', []) if r.get('url'))
+    return {'commit': commits, 'release': releases}